@@ -0,0 +1,273 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Очередь действий ввода (мышь, клавиатура), выполняемых в отдельном потоке, со склейкой однотипных действий.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import deque
+from concurrent.futures import Future
+from queue import Full
+from threading import Thread, Condition
+from time import perf_counter
+
+from ._SendMod import CompileKeys, RepeatKeys, SendChunkSize
+
+
+#-------------------------------------------------------------------------------
+
+class _Action:
+    """
+        Внутренний класс: действие в очереди.
+
+        * Kind - вид действия: 'MouseMove', 'Send', 'ControlSend' или 'Call'.
+        * Key - с чем можно склеивать: у 'Send' - флаг, у 'ControlSend' - окно, контрол, флаг и текст окна,
+        у прочих - None (не склеиваются).
+        * Parts - список склеенных частей [аргументы, Future, результат части или None - результат вызова].
+        * Size - суммарная длина строк частей (для 'Send' и 'ControlSend').
+    """
+    __slots__ = ('Kind', 'Key', 'Parts', 'Size')
+
+    def __init__(self, Kind, Key, Args, Future, Result=None, Size=0):
+        self.Kind = Kind
+        self.Key = Key
+        self.Parts = [(Args, Future, Result)]
+        self.Size = Size
+
+
+def _Joinable(String, Flag):
+    """
+        Внутренняя функция: можно ли склеивать строку Send с соседними без изменения смысла.
+    """
+    return bool(Flag) or CompileKeys(String).Complete
+
+
+#-------------------------------------------------------------------------------
+
+class ActionQueue:
+    """
+        Очередь действий ввода: методы MouseMove, MouseClick, Send и т.д. не ждут DLL, а ставят действие в
+        очередь и сразу возвращают concurrent.futures.Future с результатом. Действия выполняются по порядку
+        в отдельном потоке.
+
+        Пока действие ждет в очереди, к нему приклеиваются следующие за ним однотипные:
+
+        * подряд идущие MouseMove сливаются в одно перемещение в последнюю точку (с последней скоростью);
+        * подряд идущие Send с одинаковым флагом склеиваются в одну строку (см. AutoItX.SendMany), а ControlSend
+        в один и тот же контрол - в один вызов ControlSend, если строки можно склеивать (не заканчиваются
+        модификатором) и общая длина не больше ChunkSize.
+
+        Future каждого из слитых действий получает свой результат (для MouseMove - True, для Send - число
+        отправок, для ControlSend - результат общего вызова). Отмененные (Future.cancel()) до выполнения части
+        склеенного действия пропускаются.
+
+        Длина очереди (после склейки) ограничена MaxDepth: если очередь полна, постановка ждет освобождения
+        места, но не дольше PutTimeout, после чего вызывает queue.Full. Так поставщик ждет только очередь,
+        а не DLL, и не может уйти далеко вперед от реального ввода.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * MaxDepth=1024 - наибольшее число действий в очереди.
+        * PutTimeout=None - сколько секунд ждать места в очереди, None - без ограничения, 0 - не ждать.
+        * ChunkSize=SendChunkSize - наибольшая длина склеенной строки для Send и ControlSend.
+
+        Свойства:
+
+        * Enqueued - сколько действий поставлено в очередь.
+        * Executed - сколько действий выполнено (склеенные считаются одним).
+
+        Использование:
+            with ActionQueue(Automat) as Queue:
+                for X in range(100, 500, 4):
+                    Queue.MouseMove(X, 300, 0)
+                Queue.MouseClick(500, 300)
+                Done = Queue.Send('Привет{ENTER}')
+            Done.result()
+    """
+
+    def __init__(self, Automat, MaxDepth=1024, PutTimeout=None, ChunkSize=SendChunkSize):
+        self.Automat = Automat
+        self.MaxDepth = MaxDepth
+        self.PutTimeout = PutTimeout
+        self.ChunkSize = ChunkSize
+        self.Enqueued = 0
+        self.Executed = 0
+        self.__Pending__ = deque()
+        #Число действий в очереди и выполняемых прямо сейчас.
+        self.__Unfinished__ = 0
+        self.__Closed__ = False
+        self.__Changed__ = Condition()
+        self.__Worker__ = Thread(target=self.__Run__, name='ActionQueue', daemon=True)
+        self.__Worker__.start()
+
+    #-------------------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *arg):
+        self.Close()
+
+    def __len__(self):
+        return len(self.__Pending__)
+
+    def Close(self, Wait=True):
+        """
+            Закрыть очередь: новые действия не принимаются, поставленные выполняются до конца.
+
+            * Wait=True - дождаться выполнения поставленных действий.
+        """
+        with self.__Changed__:
+            self.__Closed__ = True
+            self.__Changed__.notify_all()
+        if Wait:
+            self.__Worker__.join()
+
+    def Flush(self, Timeout=None):
+        """
+            Дождаться выполнения всех поставленных действий.
+
+            * Timeout=None - сколько секунд ждать, None - без ограничения.
+
+            Возвращает True, если очередь опустела, False - по истечении Timeout.
+        """
+        with self.__Changed__:
+            return self.__Changed__.wait_for(lambda: not self.__Unfinished__, Timeout)
+
+    #-------------------------------------------------------------------------------
+
+    def __Put__(self, Kind, Key, Args, Result=None, Size=0):
+        """
+            Внутренний метод: поставить действие в очередь (или приклеить к последнему ждущему), вернуть Future.
+        """
+        Res = Future()
+        with self.__Changed__:
+            if self.__Closed__:
+                raise RuntimeError('Очередь действий закрыта')
+            self.Enqueued += 1
+            Pending = self.__Pending__
+            Last = Pending[-1] if Pending else None
+            if Last is not None and Key is not None and Last.Kind == Kind and Last.Key == Key and \
+                    (Kind == 'MouseMove' or Last.Size + Size <= self.ChunkSize):
+                Last.Parts.append((Args, Res, Result))
+                Last.Size += Size
+                return Res
+            if len(Pending) >= self.MaxDepth:
+                End = perf_counter() + self.PutTimeout if self.PutTimeout is not None else None
+                while len(Pending) >= self.MaxDepth and not self.__Closed__:
+                    Left = End - perf_counter() if End is not None else None
+                    if Left is not None and Left <= 0:
+                        self.Enqueued -= 1
+                        raise Full('Очередь действий переполнена ({} действий)'.format(len(Pending)))
+                    self.__Changed__.wait(Left)
+                if self.__Closed__:
+                    raise RuntimeError('Очередь действий закрыта')
+            Pending.append(_Action(Kind, Key, Args, Res, Result, Size))
+            self.__Unfinished__ += 1
+            self.__Changed__.notify_all()
+        return Res
+
+    def __Run__(self):
+        """
+            Внутренний метод: цикл рабочего потока.
+        """
+        while True:
+            with self.__Changed__:
+                self.__Changed__.wait_for(lambda: self.__Pending__ or self.__Closed__)
+                if not self.__Pending__:
+                    return
+                Action = self.__Pending__.popleft()
+                #Место в очереди освободилось.
+                self.__Changed__.notify_all()
+            try:
+                self.__Execute__(Action)
+            finally:
+                with self.__Changed__:
+                    self.Executed += 1
+                    self.__Unfinished__ -= 1
+                    self.__Changed__.notify_all()
+
+    def __Execute__(self, Action):
+        """
+            Внутренний метод: выполнить действие и выставить результаты его Future.
+        """
+        Parts = list(Part for Part in Action.Parts if Part[1].set_running_or_notify_cancel())
+        if not Parts:
+            return
+        Automat = self.Automat
+        try:
+            if Action.Kind == 'MouseMove':
+                Res = Automat.MouseMove(*Parts[-1][0])
+            elif Action.Kind == 'Send':
+                Res = Automat.SendMany(list(Args[0] for Args, Fut, Result in Parts), Action.Key, self.ChunkSize)
+            elif Action.Kind == 'ControlSend':
+                Title, Control, Flag, Text = Action.Key
+                Res = Automat.ControlSend(Title, Control, ''.join(Args[0] for Args, Fut, Result in Parts), Flag, Text)
+            else:
+                Func, arg, kwarg = Parts[0][0]
+                Res = Func(*arg, **kwarg)
+        except BaseException as Error:
+            for Args, Fut, Result in Parts:
+                Fut.set_exception(Error)
+            return
+        for Args, Fut, Result in Parts:
+            Fut.set_result(Res if Result is None else Result)
+
+    #-------------------------------------------------------------------------------
+
+    def Call(self, Func, *arg, **kwarg):
+        """
+            Поставить в очередь произвольный вызов Func(*arg, **kwarg), например, метода AutoItX.
+            Такие действия ни с чем не склеиваются. Возвращает Future.
+        """
+        return self.__Put__('Call', None, (Func, arg, kwarg))
+
+    def MouseMove(self, X, Y, Speed=-1):
+        """
+            Передвинуть курсор мыши (см. AutoItX.MouseMove). Возвращает Future.
+        """
+        return self.__Put__('MouseMove', True, (X, Y, Speed))
+
+    def MouseClick(self, X, Y, NumClicks=1, Button='left', Speed=-1):
+        """
+            Клик мышью (см. AutoItX.MouseClick). Возвращает Future.
+        """
+        return self.Call(self.Automat.MouseClick, X, Y, NumClicks, Button, Speed)
+
+    def MouseDown(self, Button='left'):
+        """
+            Нажать кнопку мыши (см. AutoItX.MouseDown). Возвращает Future.
+        """
+        return self.Call(self.Automat.MouseDown, Button)
+
+    def MouseUp(self, Button='left'):
+        """
+            Отпустить кнопку мыши (см. AutoItX.MouseUp). Возвращает Future.
+        """
+        return self.Call(self.Automat.MouseUp, Button)
+
+    def MouseWheel(self, Direction, Clicks=1):
+        """
+            Прокрутить колесико мыши (см. AutoItX.MouseWheel). Возвращает Future.
+        """
+        return self.Call(self.Automat.MouseWheel, Direction, Clicks)
+
+    def Send(self, KeyString, NumSends=1, Flag=0):
+        """
+            Ввод с клавиатуры (см. AutoItX.Send). Возвращает Future с числом отправок строки.
+        """
+        Chunks = RepeatKeys(KeyString, NumSends, Flag, self.ChunkSize) if _Joinable(KeyString, Flag) else None
+        if Chunks is None or len(Chunks) != 1:
+            return self.Call(self.Automat.Send, KeyString, NumSends, Flag)
+        return self.__Put__('Send', Flag, (Chunks[0],), max(NumSends, 0), len(Chunks[0]))
+
+    def ControlSend(self, Title, Control, String, Flag=0, Text=''):
+        """
+            Отправить строку в контрол (см. AutoItX.ControlSend). Возвращает Future.
+        """
+        if not _Joinable(String, Flag):
+            return self.Call(self.Automat.ControlSend, Title, Control, String, Flag, Text)
+        return self.__Put__('ControlSend', (Title, Control, Flag, Text), (String,), None, len(String))
@@ -0,0 +1,209 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Асинхронная (asyncio) обертка над AutoItX.
+"""
+
+# -------------------------------------------------------------------------------
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from ._AutomationMod import AutoItX, WinState
+from ._WaitMod import AllStatesMask
+
+
+#-------------------------------------------------------------------------------
+
+class AsyncAutoItX:
+    """
+        Асинхронный фасад над AutoItX: все методы AutoItX доступны под теми же именами, но возвращают корутины.
+
+        Обычные методы выполняются в ограниченном пуле потоков (MaxWorkers), поэтому цикл событий не блокируется
+        вызовами DLL. Ожидания (WinWait, WinWaitActive, WinWaitClose, WinWaitNotActive, WinWaitActivePing,
+        WinWaitState) не занимают поток на все время ожидания, как это делает DLL, а превращены в асинхронный
+        опрос с адаптивным интервалом: каждая проверка - один короткий вызов DLL в пуле, между проверками -
+        asyncio.sleep. Такие ожидания можно отменять (task.cancel()), а если бэкенд умеет сообщать об изменениях
+        (Subscribe/Unsubscribe, как SimulatedBackend), то ожидание прерывается сразу по событию.
+        Так один цикл событий может вести сотни окон одновременно без отдельного потока на каждое ожидание.
+
+        Параметры конструктора:
+
+        * Automat=None - объект AutoItX, если не задан - создается AutoItX(**kwarg).
+        * MaxWorkers=4 - число потоков в пуле для вызовов DLL.
+        * MinInterval=0.005 - минимальный интервал опроса в ожиданиях, секунд.
+        * MaxInterval=0.25 - максимальный интервал опроса в ожиданиях, секунд.
+        * **kwarg - параметры для AutoItX, если Automat не задан (PathToDLL, Backend и т.д.).
+
+        Использование:
+            async with AsyncAutoItX(Backend=SimulatedBackend()) as Automat:
+                if await Automat.WinWait('[CLASS:Notepad]', 5):
+                    await Automat.WinClose('[CLASS:Notepad]')
+    """
+
+    def __init__(self, Automat=None, MaxWorkers=4, MinInterval=0.005, MaxInterval=0.25, **kwarg):
+        self.Automat = Automat if Automat is not None else AutoItX(**kwarg)
+        self.Executor = ThreadPoolExecutor(MaxWorkers)
+        self.MinInterval = min(MinInterval, MaxInterval)
+        self.MaxInterval = MaxInterval
+        Backend = self.Automat.__AutoItDLL__
+        self.__Notifier__ = Backend if hasattr(Backend, 'Subscribe') else None
+
+    #-------------------------------------------------------------------------------
+
+    def __getattr__(self, Name):
+        """
+            Внутренний метод: асинхронная версия любого метода AutoItX, выполняемая в пуле потоков.
+        """
+        if Name.startswith('__') and Name.endswith('__'):
+            raise AttributeError(Name)
+        Method = getattr(self.Automat, Name)
+        if not callable(Method):
+            return Method
+
+        async def Call(*arg, **kwarg):
+            #Метод берется заново при каждом вызове: профилировщик подменяет методы AutoItX на ходу.
+            return await self.Run(getattr(self.Automat, Name), *arg, **kwarg)
+
+        Call.__name__ = Name
+        Call.__doc__ = Method.__doc__
+        setattr(self, Name, Call)
+        return Call
+
+    #-------------------------------------------------------------------------------
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.Close()
+
+    def Close(self):
+        """
+            Остановить пул потоков.
+        """
+        self.Executor.shutdown(wait=False)
+
+    #-------------------------------------------------------------------------------
+
+    async def Run(self, Func, *arg, **kwarg):
+        """
+            Выполнить Func(*arg, **kwarg) в пуле потоков и вернуть результат.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.Executor, partial(Func, *arg, **kwarg))
+
+    #-------------------------------------------------------------------------------
+
+    async def Poll(self, Check, Timeout, MaxInterval=None):
+        """
+            Асинхронно опрашивать Check() (выполняется в пуле потоков), пока он не вернет истинное значение.
+
+            * Check - функция без параметров.
+            * Timeout - время ожидания в секундах, 0 или меньше - без ограничения (как у WinWait в AutoIt).
+            * MaxInterval=None - максимальный интервал опроса, None - self.MaxInterval.
+
+            Возвращает последний результат Check(): истинный - дождались, ложный - время вышло.
+        """
+        Loop = asyncio.get_running_loop()
+        Wake = asyncio.Event()
+
+        def OnChange():
+            Loop.call_soon_threadsafe(Wake.set)
+
+        MaxInterval = self.MaxInterval if MaxInterval is None else MaxInterval
+        if self.__Notifier__:
+            self.__Notifier__.Subscribe(OnChange)
+        try:
+            Deadline = perf_counter() + Timeout if Timeout > 0 else None
+            Interval = min(self.MinInterval, MaxInterval)
+            while True:
+                Wake.clear()
+                Res = await self.Run(Check)
+                if Res:
+                    return Res
+                Remaining = None if Deadline is None else Deadline - perf_counter()
+                if Remaining is not None and Remaining <= 0:
+                    return Res
+                try:
+                    await asyncio.wait_for(Wake.wait(), Interval if Remaining is None else min(Interval, Remaining))
+                except asyncio.TimeoutError:
+                    Interval = min(Interval * 2, MaxInterval)
+        finally:
+            if self.__Notifier__:
+                self.__Notifier__.Unsubscribe(OnChange)
+
+    #-------------------------------------------------------------------------------
+    # Асинхронные ожидания вместо блокирующих.
+
+    async def WinWait(self, Title, Timeout, Text=''):
+        """
+            Ожидание открытия окна, как AutoItX.WinWait. Timeout 0 - без ограничения.
+            Возвращает True в случае успеха, False в случае неудачи.
+        """
+        DLL = self.Automat.__AutoItDLL__
+        return bool(await self.Poll(lambda: DLL.AU3_WinExists(Title, Text), Timeout))
+
+    async def WinWaitActive(self, Title, Timeout, Text=''):
+        """
+            Ожидание активного (ACTIVE) состояния окна, как AutoItX.WinWaitActive. Timeout 0 - без ограничения.
+            Возвращает True в случае успеха, False в случае неудачи.
+        """
+        DLL = self.Automat.__AutoItDLL__
+        return bool(await self.Poll(lambda: DLL.AU3_WinActive(Title, Text), Timeout))
+
+    async def WinWaitClose(self, Title, Timeout, Text=''):
+        """
+            Ожидание закрытия окна, как AutoItX.WinWaitClose. Timeout 0 - без ограничения.
+            Возвращает True в случае успеха, False в случае неудачи.
+        """
+        DLL = self.Automat.__AutoItDLL__
+        return await self.Poll(lambda: not DLL.AU3_WinExists(Title, Text), Timeout)
+
+    async def WinWaitNotActive(self, Title, Timeout, Text=''):
+        """
+            Ожидание неактивного состояния окна, как AutoItX.WinWaitNotActive. Timeout 0 - без ограничения.
+            Возвращает True в случае успеха, False в случае неудачи.
+        """
+        DLL = self.Automat.__AutoItDLL__
+        return await self.Poll(lambda: not DLL.AU3_WinActive(Title, Text), Timeout)
+
+    async def WinWaitActivePing(self, Title, Timeout, Text=''):
+        """
+            Попытки активировать окно раз в секунду в течение Timeout секунд, как AutoItX.WinWaitActivePing.
+            Возвращает результат последней попытки активации.
+        """
+        DLL = self.Automat.__AutoItDLL__
+        isActive = await self.Run(DLL.AU3_WinActivate, Title, Text)
+        for i in range(Timeout + 1, 0, -1):
+            if isActive:
+                break
+            await asyncio.sleep(1)
+            isActive = await self.Run(DLL.AU3_WinActivate, Title, Text)
+        return isActive
+
+    async def WinWaitState(self, Title, State, Timeout, Interval=0.25, Text='', Mask=AllStatesMask):
+        """
+            Ожидание перехода окна в состояние State, как AutoItX.WinWaitState (Interval - максимальный интервал
+            опроса, Mask - какие признаки состояния сравнивать, см. WinWaiter.Wait).
+
+            Возвращает время, прошедшее с начала ожидания в случае успеха,
+             0 - если не удалось дождаться нужного состояния за заданное время,
+            -1 - если окно не было обнаружено.
+        """
+        Target = (State if isinstance(State, WinState) else WinState(State)).StateNum & Mask
+        DLL = self.Automat.__AutoItDLL__
+        Start = perf_counter()
+        Res = [0, 0]
+
+        def Check():
+            Res[0] = DLL.AU3_WinGetState(Title, Text)
+            Res[1] += 1
+            return not Res[0] or Res[0] & Mask == Target
+
+        Found = await self.Poll(Check, Timeout if Timeout > 0 else 10, min(Interval, self.MaxInterval))
+        if not Res[0]:
+            return -1
+        return perf_counter() - Start if Found and Res[1] > 1 else 0
@@ -9,7 +9,7 @@
 
 # -------------------------------------------------------------------------------
 
-from ctypes import WinDLL, \
+from ctypes import CDLL, \
     DEFAULT_MODE, \
     create_unicode_buffer, \
     byref, \
@@ -23,20 +23,39 @@ from ctypes import WinDLL, \
     c_int, \
     c_uint, \
     c_void_p, \
-    windll
+    c_ubyte, \
+    c_ushort, \
+    Structure, \
+    sizeof
+
+try:
+    from ctypes import WinDLL, windll
+except ImportError:
+    #Не Windows: AutoItX3.dll здесь не загрузить, остается только имитационный бэкенд (SimulatedBackend).
+    WinDLL = CDLL
+    windll = None
 
 from ctypes.wintypes import HWND
 from collections import OrderedDict, namedtuple
 import os
 from functools import wraps
+from inspect import signature
 from time import sleep, perf_counter
+from threading import local
+from concurrent.futures import ThreadPoolExecutor
 from sys import maxsize as sysMaxSize
+
+from ._SendMod import RepeatKeys, JoinKeys, SendChunkSize
+from ._ProfileMod import Profiler
+from ._SpecMod import ParseControlSpec
 # -------------------------------------------------------------------------------
 #Определения
 #: Тип для сохранения координат точки.
 WinPoint = namedtuple('WinPoint', 'X, Y')
 #: Тип для cохранения координат окна.
 WinRect = namedtuple('WinRect', 'X, Y, WIDTH, HEIGHT')
+#: Пустой прямоугольник, общий для всех только что созданных WinParams.
+_EmptyRect = WinRect(0, 0, 0, 0)
 #: Лямбда для преобразования строки, возвращаемой WinGetHandle в формат AutoIt.
 WinHandle = lambda x: '[HANDLE:{}]'.format(x)
 #: Служебный тип для флагов установки состояния окна функцией WinSetState.
@@ -54,6 +73,18 @@ MouseGetCursorValue = (
 #: Служебные типы для работы с PixelSearch.
 PixelSearchRetType = c_int * 2
 PixelSearchRetTypeP = POINTER(PixelSearchRetType)
+
+
+#: Служебный тип BITMAPINFOHEADER для снимков экрана через GetDIBits (DLLBackend.CaptureScreen).
+class _BitmapInfoHeader(Structure):
+    _fields_ = (('biSize', c_uint), ('biWidth', c_long), ('biHeight', c_long), ('biPlanes', c_ushort),
+                ('biBitCount', c_ushort), ('biCompression', c_uint), ('biSizeImage', c_uint),
+                ('biXPelsPerMeter', c_long), ('biYPelsPerMeter', c_long), ('biClrUsed', c_uint),
+                ('biClrImportant', c_uint))
+
+
+#: Код растровой операции "копировать" для BitBlt.
+_SRCCOPY = 0x00CC0020
 #: Служебный тип для интерпретации значений, возвращаемых MsgBox.
 MsgBoxRetType = namedtuple('MsgBoxRetType',
                            'IDOK, IDCANCEL, IDABORT, IDRETRY, IDIGNORE, IDYES, IDNO, IDTRYAGAIN, IDCONTINUE')
@@ -76,8 +107,299 @@ MB_Flags = MsgBoxFlagsType(0, 1, 2, 3, 4, 5, 6, 0x4000,
                            0, 0x1000, 0x2000,
                            0x10000, 0x20000, 0x40000, 0x80000, 0x100000, 0x200000)
 #-------------------------------------------------------------------------------
+#Словарь с описанием параметров функций AutoItX3.DLL
+AutoDLLdict = {
+    'AU3_error': {
+        'ReturnType': c_long,
+        'ArgTypes': ()
+    },
+    'AU3_MouseClick': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_long, c_long, c_long, c_long)
+    },
+    'AU3_MouseClickDrag': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_long, c_long, c_long, c_long, c_long)
+    },
+    'AU3_WinGetHandle': {
+        'ReturnType': HWND,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinGetHandleAsText': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_WinExists': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinGetState': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinGetPos': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, POINTER(c_int * 4))
+    },
+    'AU3_WinGetClientSize': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, POINTER(c_int * 4))
+    },
+    'AU3_WinActivate': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinActive': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinClose': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinGetCaretPos': {
+        'ReturnType': c_int,
+        'ArgTypes': (POINTER(c_int * 2),)
+    },
+    'AU3_WinGetClassList': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_WinGetProcess': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_WinWait': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinWaitActive': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinWaitClose': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinWaitNotActive': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinGetText': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_WinGetTitle': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_WinKill': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinMenuSelectItem': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinMinimizeAll': {
+        'ReturnType': c_void_p,
+        'ArgTypes': ()
+    },
+    'AU3_WinMinimizeAllUndo': {
+        'ReturnType': c_void_p,
+        'ArgTypes': ()
+    },
+    'AU3_WinMove': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long, c_long, c_long, c_long)
+    },
+    'AU3_WinSetOnTop': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinSetState': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_WinSetTitle': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_WinSetTrans': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_ControlClick': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_long, c_long, c_long)
+    },
+    'AU3_ControlGetHandle': {
+        'ReturnType': HWND,
+        'ArgTypes': (HWND, c_wchar_p)
+    },
+    'AU3_ControlGetHandleAsText': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_ControlGetText': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_ControlGetTextByHandle': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (HWND, HWND, c_wchar_p, c_int)
+    },
+    'AU3_ControlCommand': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_Send': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_long)
+    },
+    'AU3_ControlGetPos': {
+        'ReturnType': c_int,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, POINTER(c_int * 4))
+    },
+    'AU3_ControlGetPosByHandle': {
+        'ReturnType': c_int,
+        'ArgTypes': (HWND, HWND, POINTER(c_int * 4))
+    },
+    'AU3_ControlListView': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_ControlDisable': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlEnable': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlFocus': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlGetFocus': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_ControlGetFocusByHandle': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (HWND, c_wchar_p, c_int)
+    },
+    'AU3_ControlHide': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlShow': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlMove': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_long, c_long, c_long, c_long)
+    },
+    'AU3_ControlSend': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_long)
+    },
+    'AU3_ControlSetText': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p)
+    },
+    'AU3_ControlTreeView': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)
+    },
+    'AU3_StatusbarGetText': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_wchar_p, c_long, c_wchar_p, c_int)
+    },
+    'AU3_MouseDown': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p,)
+    },
+    'AU3_MouseUp': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p,)
+    },
+    'AU3_MouseMove': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_long, c_long, c_long)
+    },
+    'AU3_MouseWheel': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_long)
+    },
+    'AU3_MouseGetCursor': {
+        'ReturnType': c_void_p,
+        'ArgTypes': ()
+    },
+    'AU3_MouseGetPos': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (POINTER(c_int * 2),)
+    },
+    'AU3_PixelChecksum': {
+        'ReturnType': c_ulong,
+        'ArgTypes': (c_long, c_long, c_long, c_long, c_long)
+    },
+    'AU3_PixelGetColor': {
+        'ReturnType': c_long,
+        'ArgTypes': (c_long, c_long)
+    },
+    'AU3_PixelSearch': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_long, c_long, c_long, c_long, c_long, c_long, c_long, PixelSearchRetTypeP)
+    },
+    'AU3_ClipGet': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p, c_int)
+    },
+    'AU3_ClipPut': {
+        'ReturnType': c_void_p,
+        'ArgTypes': (c_wchar_p,)
+    },
+    'AU3_IsAdmin': {
+        'ReturnType': c_long,
+        'ArgTypes': ()
+    },
+}
+#-------------------------------------------------------------------------------
 
 
+#: Кэш для CompileProtoDict: {id(ProtoDict): (ProtoDict, скомпилированный словарь)}.
+_CompiledProtos = dict()
+
+
+def CompileProtoDict(ProtoDict):
+    """
+        Преобразовать словарь с параметрами процедур DLL (см. CustomWinDLL) в словарь
+        {'Имя функции': (тип возвр. значения, кортеж типов параметров)}.
+        Типы могут быть заданы как самими типами ctypes, так и строками в старом формате ('c_long', '(c_int,)'),
+        строки вычисляются один раз. Результат кэшируется на весь процесс, поэтому словарь не стоит менять после
+        первого использования.
+    """
+    Cached = _CompiledProtos.get(id(ProtoDict))
+    if Cached is not None and Cached[0] is ProtoDict:
+        return Cached[1]
+    Res = dict()
+    for Name, Proto in ProtoDict.items():
+        ReturnType = Proto['ReturnType']
+        ArgTypes = Proto['ArgTypes']
+        if isinstance(ReturnType, str):
+            ReturnType = eval(ReturnType, globals())
+        if isinstance(ArgTypes, str):
+            ArgTypes = eval(ArgTypes, globals())
+        Res[Name] = (ReturnType, tuple(ArgTypes))
+    #Храним и сам словарь, чтобы его id не мог достаться другому объекту.
+    _CompiledProtos[id(ProtoDict)] = (ProtoDict, Res)
+    return Res
+
+
+#-------------------------------------------------------------------------------
+
 class CustomWinDLL(WinDLL):
     """
         Класс по загрузке и использованию DLL, аналогичен стандартному классу WinDLL (получен наследованием)
@@ -87,33 +409,188 @@ class CustomWinDLL(WinDLL):
         * ProtoDict - основное отличие, словарь с параметрами процедур в DLL, формат такой:
             {
                     'Имя фунции':{
-                                    'ReturnType':строка с именем типа возвр. значения из ctypes, напрмер: 'c_long',
-                                    'ArgTypes':строка со спиком типов входных параметров в скобочках, например:
-                                    '(c_wchar_p, c_long, c_long, c_long, c_long)'
+                                    'ReturnType':тип возвр. значения из ctypes, напрмер: c_long,
+                                    'ArgTypes':кортеж типов входных параметров, например:
+                                    (c_wchar_p, c_long, c_long, c_long, c_long)
                                 },
                     'Имя след. функции':{
-                                            'ReturnType':строка с именем типа возвр. значения из ctypes, напрмер:
-                                            'c_void_p',
-                                            'ArgTypes':строка со спиком типов входных параметров в скобочках, например:
-                                            '(c_ulong, c_int, c_uint)',
-                                                для функций без параметров вписать просто '()'.
+                                            'ReturnType':тип возвр. значения из ctypes, напрмер: c_void_p,
+                                            'ArgTypes':кортеж типов входных параметров, например:
+                                            (c_ulong, c_int, c_uint),
+                                                для функций без параметров вписать просто ().
                                         },
                 и т.д.
             }
+            Старый формат со строками вместо типов ('c_long', '(c_int,)') тоже поддерживается.
         * name - от предка, путь к DLL,
         * mode=DEFAULT_MODE - от предка, режим работы с DLL,
         * handle=None - от предка, DLL handle
         * use_errno=False - от предка,
         * use_last_error=False - от предка.
+
+        Словарь разбирается один раз на процесс (см. CompileProtoDict), DLL загружается один раз на путь и режим,
+        а функции привязываются при первом обращении к ним и дальше используются всеми экземплярами класса
+        с той же DLL и тем же прототипом функции.
+        Вызовы функций учитываются профилировщиком Profiler, когда он включен.
     """
 
+    #: Handle загруженных DLL: {(путь, mode): handle}.
+    __Handles__ = dict()
+    #: Привязанные функции: {(путь, mode, use_errno, use_last_error, имя функции, (restype, argtypes)): функция}.
+    __Functions__ = dict()
+
     def __init__(self, ProtoDict, name, mode=DEFAULT_MODE, handle=None, use_errno=False, use_last_error=False):
+        self.__ProtoDict__ = CompileProtoDict(ProtoDict)
+        if handle is None:
+            handle = CustomWinDLL.__Handles__.get((name, mode))
         super().__init__(name, mode, handle, use_errno, use_last_error)
-        self.__ProtoDict__ = ProtoDict
-        for Proto in self.__ProtoDict__:
-            #print ('{}\n{}'.format(self.__ProtoDict__[Proto]['ReturnType'], self.__ProtoDict__[Proto]['ArgTypes']))
-            exec('self.{}.restype = {}'.format(Proto, self.__ProtoDict__[Proto]['ReturnType']))
-            exec('self.{}.argtypes = {}'.format(Proto, self.__ProtoDict__[Proto]['ArgTypes']))
+        CustomWinDLL.__Handles__.setdefault((name, mode), self._handle)
+        self.__FuncKey__ = (name, mode, use_errno, use_last_error)
+        Profiler.Register(self, tuple(self.__ProtoDict__))
+
+    #-------------------------------------------------------------------------------
+
+    def __getattr__(self, Name):
+        """
+            Внутренний метод: привязка функции DLL при первом обращении к ней.
+        """
+        if Name.startswith('__') and Name.endswith('__'):
+            raise AttributeError(Name)
+        Proto = self.__ProtoDict__.get(Name)
+        if Proto is None:
+            return super().__getattr__(Name)
+        #Прототип входит в ключ: другой словарь прототипов для той же DLL не должен получить чужие argtypes.
+        Key = self.__FuncKey__ + (Name, Proto)
+        Func = CustomWinDLL.__Functions__.get(Key)
+        if Func is None:
+            Func = self[Name]
+            Func.restype, Func.argtypes = Proto
+            Func = CustomWinDLL.__Functions__.setdefault(Key, Func)
+        setattr(self, Name, Func)
+        return Func
+
+
+#-------------------------------------------------------------------------------
+
+class AutoItBackend:
+    """
+        Базовый класс бэкендов AutoItX, т.е. объектов, которые на самом деле выполняют функции AU3_*.
+
+        Бэкенд обязан иметь вызываемые атрибуты со всеми именами из словаря AutoDLLdict и MessageBoxW.
+        Сигнатуры совпадают с функциями из AutoItX3.dll и User32.dll: строки передаются как есть, выходные
+        буферы (create_unicode_buffer) и массивы c_int (через pointer или byref) заполняются на месте,
+        признак ошибки последнего вызова возвращает AU3_error.
+
+        Реализации:
+
+        * DLLBackend - настоящая AutoItX3.dll через ctypes, работает только под Windows.
+        * SimulatedBackend - имитация рабочего стола на чистом Python (окна, контролы, состояния, буфер обмена,
+        пикселы экрана), работает где угодно, подходит для тестов и замеров скорости.
+
+        Необязательные функции (OptionalFunctionNames), без них AutoItX обходится медленнее:
+
+        * CaptureScreen(Left, Top, Right, Bottom) - снимок области экрана (края включительно), возвращает
+        (ширина, высота, байты RGB построчно), пикселы за пределами экрана - черные. Без нее AutoItX.CaptureRegion
+        читает область по пикселу через AU3_PixelGetColor.
+    """
+
+    #: Имена функций, которые должен предоставить бэкенд.
+    FunctionNames = tuple(AutoDLLdict) + ('MessageBoxW',)
+    #: Имена необязательных функций бэкенда.
+    OptionalFunctionNames = ('CaptureScreen',)
+
+    #-------------------------------------------------------------------------------
+
+    @classmethod
+    def CheckBackend(cls, Backend):
+        """
+            Проверить, что объект Backend предоставляет все функции из FunctionNames.
+            Если чего-то не хватает - выбрасывает TypeError со списком недостающих функций.
+        """
+        Missing = list(Name for Name in cls.FunctionNames if not callable(getattr(Backend, Name, None)))
+        if Missing:
+            raise TypeError('Бэкенд "{}" не реализует функции: {}'.format(type(Backend).__name__, ', '.join(Missing)))
+
+
+#-------------------------------------------------------------------------------
+
+class DLLBackend(CustomWinDLL):
+    """
+        Бэкенд AutoItX на настоящей AutoItX3.dll, используется AutoItX по умолчанию.
+
+        Параметры конструктора:
+
+        * PathToDLL=None - Путь к AutoItX3.DLL, если не задан, то AutoItX3.DLL (или AutoItX3_x64.dll для 64-битного
+        Python) ищется в папке side_libs рядом с данным модулем.
+    """
+
+    def __init__(self, PathToDLL=None):
+        if windll is None:
+            raise RuntimeError('AutoItX3.dll работает только под Windows, используйте SimulatedBackend!')
+        dllKa = 'side_libs\\AutoItX3_x64.dll' if sysMaxSize > 2 ** 32 else 'side_libs\\AutoItX3.dll'
+        tmpPath = PathToDLL if PathToDLL is not None else os.path.join(os.path.split(globals()['__file__'])[0], dllKa)
+        super().__init__(AutoDLLdict, tmpPath)
+        #Пробрасываем MessageBoxW из User32.dll
+        self.MessageBoxW = windll.user32.MessageBoxW
+        self.MessageBoxW.restype = c_int
+        self.MessageBoxW.argtypes = (HWND, c_wchar_p, c_wchar_p, c_uint)
+        self.__GDI__ = None
+
+    #-------------------------------------------------------------------------------
+
+    def __LoadGDI__(self):
+        """
+            Внутренний метод: функции User32.dll и Gdi32.dll для снимков экрана, с прототипами (описатели - указатели,
+            иначе под 64-битным Python они обрезаются до int).
+        """
+        User32, GDI32 = windll.user32, windll.gdi32
+        Protos = (
+            (User32.GetDC, c_void_p, (c_void_p,)),
+            (User32.ReleaseDC, c_int, (c_void_p, c_void_p)),
+            (GDI32.CreateCompatibleDC, c_void_p, (c_void_p,)),
+            (GDI32.CreateCompatibleBitmap, c_void_p, (c_void_p, c_int, c_int)),
+            (GDI32.SelectObject, c_void_p, (c_void_p, c_void_p)),
+            (GDI32.BitBlt, c_int, (c_void_p, c_int, c_int, c_int, c_int, c_void_p, c_int, c_int, c_uint)),
+            (GDI32.GetDIBits, c_int, (c_void_p, c_void_p, c_uint, c_uint, c_void_p, c_void_p, c_uint)),
+            (GDI32.DeleteObject, c_int, (c_void_p,)),
+            (GDI32.DeleteDC, c_int, (c_void_p,)),
+        )
+        for Func, Res, Args in Protos:
+            Func.restype = Res
+            Func.argtypes = Args
+        self.__GDI__ = (User32, GDI32)
+        return self.__GDI__
+
+    def CaptureScreen(self, Left, Top, Right, Bottom):
+        """
+            Снимок области экрана через BitBlt и GetDIBits (см. AutoItBackend.OptionalFunctionNames).
+            Возвращает (ширина, высота, байты RGB построчно).
+        """
+        User32, GDI32 = self.__GDI__ or self.__LoadGDI__()
+        Width, Height = Right - Left + 1, Bottom - Top + 1
+        if Width <= 0 or Height <= 0:
+            return 0, 0, b''
+        Info = _BitmapInfoHeader(sizeof(_BitmapInfoHeader), Width, -Height, 1, 32)
+        Buf = (c_ubyte * (Width * Height * 4))()
+        ScreenDC = User32.GetDC(None)
+        MemDC = GDI32.CreateCompatibleDC(ScreenDC)
+        Bitmap = GDI32.CreateCompatibleBitmap(ScreenDC, Width, Height)
+        Old = GDI32.SelectObject(MemDC, Bitmap)
+        try:
+            GDI32.BitBlt(MemDC, 0, 0, Width, Height, ScreenDC, Left, Top, _SRCCOPY)
+            GDI32.GetDIBits(MemDC, Bitmap, 0, Height, Buf, byref(Info), 0)
+        finally:
+            GDI32.SelectObject(MemDC, Old)
+            GDI32.DeleteObject(Bitmap)
+            GDI32.DeleteDC(MemDC)
+            User32.ReleaseDC(None, ScreenDC)
+        #BGRA -> RGB срезами, без цикла по пикселам.
+        Raw = bytes(Buf)
+        Res = bytearray(Width * Height * 3)
+        Res[0::3] = Raw[2::4]
+        Res[1::3] = Raw[1::4]
+        Res[2::3] = Raw[0::4]
+        return Width, Height, bytes(Res)
 
 
 #-------------------------------------------------------------------------------
@@ -145,16 +622,14 @@ class WinState:
         Если напрямую поменять значения логических признаков, то автоматически изменятся значения StateNum
         и StateString.
         Имеются так же методы сравнения двух состояний, что позволяет сопоставлять экземпляры класса, содержащие
-        значения, при помощи операторов "==", "!=", ">=", "<=", ">", "<".
+        значения, при помощи операторов "==", "!=", ">=", "<=", ">", "<". Сравнивать можно и с числом.
+
+        Внутри состояние хранится одним числом, логические признаки и StateString вычисляются из него при обращении,
+        а сравнения сводятся к битовым операциям. Для часто встречающихся значений есть общие неизменяемые
+        экземпляры (см. Shared), их удобно использовать в циклах, где состояния только сравниваются.
     """
-    StateNum = None
-    StateString = None
-    EXISTS = False
-    VISIBLE = False
-    ENABLED = False
-    ACTIVE = False
-    MINIMIZED = False
-    MAXIMIZED = False
+    __slots__ = ('__Num__', '__String__', '__Frozen__')
+
     __StatesDict__ = OrderedDict((
         ('EXISTS', 1),
         ('VISIBLE', 2),
@@ -163,185 +638,206 @@ class WinState:
         ('MINIMIZED', 16),
         ('MAXIMIZED', 32),
     ))
+    #: Маска всех признаков.
+    __Mask__ = 63
+    #: Число установленных признаков для каждого значения маски.
+    __Counts__ = tuple(bin(Num).count('1') for Num in range(64))
+    #: Строки состояний для каждого значения маски (None для 0).
+    __Strings__ = (lambda Items: tuple(','.join(Name for Name, Bit in Items if Num & Bit) or None
+                                       for Num in range(64)))(tuple(__StatesDict__.items()))
+    #: Разобранные строки состояний: {строка: число}.
+    __Parsed__ = dict()
+    #: Общие неизменяемые экземпляры: {число: WinState}.
+    __Shared__ = dict()
 
     #-------------------------------------------------------------------------------
 
     def __init__(self, State):
-        self.SetState(State)
+        self.__Frozen__ = False
+        if type(State) is int:
+            self.__Num__ = State
+            self.__String__ = None
+        else:
+            self.SetState(State)
+
+    #-------------------------------------------------------------------------------
+
+    @classmethod
+    def Shared(cls, State):
+        """
+            Получить общий неизменяемый экземпляр для состояния State (число или строка): повторные вызовы с тем же
+            значением возвращают один и тот же объект. Попытка изменить такой экземпляр вызывает AttributeError.
+        """
+        Num = cls.__StringToState__(State) if isinstance(State, str) else State
+        Res = cls.__Shared__.get(Num)
+        if Res is None:
+            Res = cls(Num)
+            Res.__Frozen__ = True
+            Res = cls.__Shared__.setdefault(Num, Res)
+        return Res
+
+    #-------------------------------------------------------------------------------
+
+    def __CheckFrozen__(self):
+        if self.__Frozen__:
+            raise AttributeError('Общий экземпляр WinState менять нельзя, используйте WinState(...)')
 
     #-------------------------------------------------------------------------------
 
-    def __setattr__(self, Name, Value):
+    @property
+    def StateNum(self):
+        return self.__Num__
+
+    @StateNum.setter
+    def StateNum(self, Value):
+        self.SetState(Value)
+
+    @property
+    def StateString(self):
+        if self.__String__ is not None:
+            return self.__String__
+        return self.__Strings__[self.__Num__ & self.__Mask__]
+
+    @StateString.setter
+    def StateString(self, Value):
+        self.SetState(Value)
+
+    #-------------------------------------------------------------------------------
+
+    def __GetFlag__(Bit):
+        return property(lambda self: self.__Num__ & Bit == Bit, lambda self, Value: self.__SetFlag__(Bit, Value))
+
+    EXISTS = __GetFlag__(1)
+    VISIBLE = __GetFlag__(2)
+    ENABLED = __GetFlag__(4)
+    ACTIVE = __GetFlag__(8)
+    MINIMIZED = __GetFlag__(16)
+    MAXIMIZED = __GetFlag__(32)
+    del __GetFlag__
+
+    def __SetFlag__(self, Bit, Value):
         """
-            Внутренний метод, автоматизирующий обновление значений StateNum и StateString
-            при изменении логических признаков.
+            Внутренний метод, обновляющий состояние при изменении логического признака.
         """
-        super().__setattr__(Name, Value)
-        if self.__StatesDict__ and Name in self.__StatesDict__:
-            self.__UpdateFromBoolean__()
+        self.__CheckFrozen__()
+        Num = (self.__Num__ | Bit if Value else self.__Num__ & ~Bit) & self.__Mask__
+        #Свернутое окно не может быть развернутым.
+        if Num & 48 == 48:
+            Num &= ~32
+        self.__Num__ = Num
+        self.__String__ = None
+
+    #-------------------------------------------------------------------------------
+
+    @staticmethod
+    def __Other__(SecondState):
+        """
+            Внутренний метод: числовое значение второго операнда сравнения.
+        """
+        if isinstance(SecondState, WinState):
+            return SecondState.__Num__ & 63
+        if isinstance(SecondState, int):
+            return SecondState & 63
+        return None
 
     #-------------------------------------------------------------------------------
     #Далее идут методы для операторов "==", "!=", ">=", "<=", ">", "<".
+    #x - число признаков первого состояния, y - второго, z - общих признаков.
 
-    #"<"
+    #"<": у второго признаков больше, чем общих, и больше, чем у первого
     def __lt__(self, SecondState):
-        x = 0
-        y = 0
-        z = 0
-        for Param in self.__StatesDict__:
-
-            if self.__dict__[Param]:
-                x += 1
-            if SecondState.__dict__[Param]:
-                y += 1
-            if self.__dict__[Param] and SecondState.__dict__[Param]:
-                z += 1
-        if y > z and y > x:
-            return True
-        else:
-            return False
-
-    #"<="
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        A = self.__Num__ & 63
+        Y = self.__Counts__[B]
+        return Y > self.__Counts__[A & B] and Y > self.__Counts__[A]
+
+    #"<=": состояния совпадают или "<"
     def __le__(self, SecondState):
-        x = 0
-        y = 0
-        z = 0
-
-        for Param in self.__StatesDict__:
-            if self.__dict__[Param]:
-                x += 1
-            if SecondState.__dict__[Param]:
-                y += 1
-            if self.__dict__[Param] and SecondState.__dict__[Param]:
-                z += 1
-        if z == y == x or (y > z and y > x):
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        A = self.__Num__ & 63
+        if A == B:
             return True
-        else:
-            return False
+        Y = self.__Counts__[B]
+        return Y > self.__Counts__[A & B] and Y > self.__Counts__[A]
 
     #"=="
     def __eq__(self, SecondState):
-        Res = True
-        for Param in self.__StatesDict__:
-            '''
-            if Param=='ACTIVE':
-                continue
-            '''
-            if self.__dict__[Param] != SecondState.__dict__[Param]:
-                print(Param, self.__dict__[Param], SecondState.__dict__[Param])
-                Res = False
-        return Res
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        return self.__Num__ & 63 == B
 
     #"!="
     def __ne__(self, SecondState):
-        Res = False
-        for Param in self.__StatesDict__:
-            '''
-            if Param=='ACTIVE':
-                continue
-            '''
-            if self.__dict__[Param] != SecondState.__dict__[Param]:
-                Res = True
-        return Res
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        return self.__Num__ & 63 != B
 
-    #">="
+    #">=": все признаки второго (хотя бы один) есть у первого
     def __ge__(self, SecondState):
-        x = 0
-        y = 0
-        z = 0
-        for Param in self.__StatesDict__:
-            if self.__dict__[Param]:
-                x += 1
-            if SecondState.__dict__[Param]:
-                y += 1
-            if self.__dict__[Param] and SecondState.__dict__[Param]:
-                z += 1
-        if z > 0 and z == y <= x:
-            return True
-        else:
-            return False
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        return B != 0 and B & ~self.__Num__ == 0
 
-    #">"
+    #">": есть общие признаки и у первого признаков больше, чем у второго
     def __gt__(self, SecondState):
-        x = 0
-        y = 0
-        z = 0
-        for Param in self.__StatesDict__:
-            if self.__dict__[Param]:
-                x += 1
-            if SecondState.__dict__[Param]:
-                y += 1
-            if self.__dict__[Param] and SecondState.__dict__[Param]:
-                z += 1
-        if z > 0 and z <= y < x:
-            return True
-        else:
-            return False
+        B = SecondState.__Num__ & 63 if type(SecondState) is WinState else self.__Other__(SecondState)
+        if B is None:
+            return NotImplemented
+        A = self.__Num__ & 63
+        return A & B != 0 and self.__Counts__[B] < self.__Counts__[A]
 
     #Конец определений методов для операторов "==", "!=", ">=", "<=", ">", "<".
     #-------------------------------------------------------------------------------
 
+    def __hash__(self):
+        return self.__Num__ & 63
+
+    def __int__(self):
+        return self.__Num__
+
+    def __repr__(self):
+        return 'WinState({!r})'.format(self.StateString or 0)
+
+    #-------------------------------------------------------------------------------
+
     def SetState(self, State):
         """
             Метод задания значения состояния окна, принимает число, возвращаемое WinGetState,
             или строку , содержащую список активных признаков, например:
             'EXISTS, VISIBLE, ENABLED, ACTIVE'
         """
+        self.__CheckFrozen__()
         if isinstance(State, str):
-            self.StateString = State
-            self.StateNum = self.__StringToState__(State)
+            self.__Num__ = self.__StringToState__(State)
+            self.__String__ = State
         elif isinstance(State, int):
-            self.StateString = self.__StateToString__(State)
-            self.StateNum = State
+            self.__Num__ = State
+            self.__String__ = None
         else:
             raise TypeError('Состояние окна должно иметь тип "str" или "int", сейчас это "{}"'.format(type(State)))
 
     #-------------------------------------------------------------------------------
 
-    def __StateToString__(self, StateNum):
-        StateList = []
-        for State in self.__StatesDict__.items():
-            if StateNum & State[1] == State[1]:
-                StateList.append(State[0])
-                self.__dict__[State[0]] = True
-            else:
-                self.__dict__[State[0]] = False
-        Res = ','.join(StateList) if len(StateList) > 0 else None
-
+    @classmethod
+    def __StringToState__(cls, StrState):
+        Res = cls.__Parsed__.get(StrState)
+        if Res is None:
+            Res = 0
+            StateList = list(S.strip().upper() for S in str(StrState).split(','))
+            for ST in cls.__StatesDict__:
+                if ST in StateList:
+                    Res |= cls.__StatesDict__[ST]
+            if len(cls.__Parsed__) < 1024:
+                cls.__Parsed__[StrState] = Res
         return Res
 
-    #-------------------------------------------------------------------------------
-
-    def __StringToState__(self, StrState):
-        Res = 0
-        StateList = list(S.strip().upper() for S in str(StrState).split(','))
-        for ST in self.__StatesDict__:
-            if ST in StateList:
-                Res |= self.__StatesDict__[ST]
-                self.__dict__[ST] = True
-            else:
-                self.__dict__[ST] = False
-        return Res
-
-    #-------------------------------------------------------------------------------
-
-    def __UpdateFromBoolean__(self):
-        ResNum = 0
-        ResStrList = []
-        for ParName, ParNum in self.__StatesDict__.items():
-            if self.__dict__[ParName]:
-                if ParName == 'MINIMIZED':
-                    if self.__dict__['MAXIMIZED']:
-                        self.__dict__['MAXIMIZED'] = False
-                elif ParName == 'MAXIMIZED':
-                    if self.__dict__['MINIMIZED']:
-                        self.__dict__['MINIMIZED'] = False
-                ResNum |= ParNum
-                ResStrList.append(ParName)
-
-        self.StateNum = ResNum
-        self.StateString = ','.join(ResStrList)
-
 
 #-------------------------------------------------------------------------------
 
@@ -361,55 +857,99 @@ class WinParams:
             * Rectangle=None - Значение с типом WinRect, содержащее размеры окна.
             * ClientRectangle=None - Значение с типом WinRect, содержащее размеры клиентской области окна.
             * State=None - Значение с типом WinState, содержащее состояние окна.
+            * PID=None - PID процесса окна (заполняется, например, AutoItX.WinQueryMany).
             * StringID=None - только чтение, строка, суммирующая все признаки окна в формате AutoIt (с использованием
             кв. скобок, подронее см. в помощи  AutoIt),
                 может быть использована для передачи функциям AutoIt.
+
+        StringID формируется при первом обращении и хранится до изменения Header, Class или Handle.
+        Объекты можно сравнивать ("==") и использовать как ключи словарей: равны окна с одинаковыми Header, Class,
+        Handle, Text и видом заголовка и класса (REtitle, REclass). Ключевые поля объекта, который уже лежит
+        в словаре, менять не стоит.
     """
 
-    Header = None
-    Class = None
-    Handle = None
-    Rectangle = None
-    ClientRectangle = None
-    State = None
-    StringID = None
-    Text = ''
+    __slots__ = ('__Header__', '__Class__', '__Handle__', '__StringID__', '__HeaderPrefix__', '__ClassPrefix__',
+                 '__State__', 'Rectangle', 'ClientRectangle', 'PID', 'Text')
 
     #-------------------------------------------------------------------------------
 
     def __init__(self, Header, Class=None, Handle=None, REtitle=False, REclass=False, Text=''):
-        #self.SetParams(Header, Class, Handle)
         self.__HeaderPrefix__ = 'REGEXPTITLE' if REtitle else 'TITLE'
         self.__ClassPrefix__ = 'REGEXPCLASS' if REclass else 'CLASS'
-        self.Header = Header
-        self.Class = Class
-        self.Handle = Handle
-        self.Rectangle = WinRect(0, 0, 0, 0)
-        self.ClientRectangle = WinRect(0, 0, 0, 0)
-        self.State = WinState(0)
-        self.StringID = self.__FormStringID__(Header, Class, Handle)
+        self.__Header__ = Header
+        self.__Class__ = Class
+        self.__Handle__ = Handle
+        self.__StringID__ = None
+        self.__State__ = None
+        self.Rectangle = _EmptyRect
+        self.ClientRectangle = _EmptyRect
+        self.PID = None
         self.Text = Text
 
     #-------------------------------------------------------------------------------
 
-    def __setattr__(self, Name, Value):
-        if Name == 'StringID':
-            super().__setattr__(Name, self.__FormStringID__(self.Header, self.Class, self.Handle))
-        elif Name == 'Class' or Name == 'Header' or Name == 'Handle':
-            super().__setattr__(Name, Value)
-            super().__setattr__('StringID', self.__FormStringID__(self.Header, self.Class, self.Handle))
-        else:
-            super().__setattr__(Name, Value)
+    def __KeyField__(Slot):
+        def Get(self):
+            return getattr(self, Slot)
+
+        def Set(self, Value):
+            setattr(self, Slot, Value)
+            self.__StringID__ = None
+
+        return property(Get, Set)
+
+    Header = __KeyField__('__Header__')
+    Class = __KeyField__('__Class__')
+    Handle = __KeyField__('__Handle__')
+    del __KeyField__
+
+    @property
+    def StringID(self):
+        if self.__StringID__ is None:
+            self.__StringID__ = self.__FormStringID__(self.__Header__, self.__Class__, self.__Handle__)
+        return self.__StringID__
+
+    @StringID.setter
+    def StringID(self, Value):
+        #Как и раньше, присвоенное значение игнорируется: StringID всегда соответствует Header, Class и Handle.
+        self.__StringID__ = None
+
+    @property
+    def State(self):
+        if self.__State__ is None:
+            self.__State__ = WinState(0)
+        return self.__State__
+
+    @State.setter
+    def State(self, Value):
+        self.__State__ = Value
+
+    #-------------------------------------------------------------------------------
+
+    def __Key__(self):
+        return (self.__Header__, self.__Class__, self.__Handle__, self.__HeaderPrefix__, self.__ClassPrefix__,
+                self.Text)
+
+    def __eq__(self, Other):
+        if not isinstance(Other, WinParams):
+            return NotImplemented
+        return self.__Key__() == Other.__Key__()
+
+    def __hash__(self):
+        return hash(self.__Key__())
+
+    def __repr__(self):
+        return 'WinParams({!r})'.format(self.StringID)
 
     #-------------------------------------------------------------------------------
     def SetParams(self, Header, Class, Handle):
-        self.Header = Header
-        self.Class = Class
-        self.Handle = Handle
-        self.Rectangle = WinRect(0, 0, 0, 0)
-        self.ClientRectangle = WinRect(0, 0, 0, 0)
-        self.State = WinState(0)
-        self.StringID = self.__FormStringID__(Header, Class, Handle)
+        self.__Header__ = Header
+        self.__Class__ = Class
+        self.__Handle__ = Handle
+        self.__StringID__ = None
+        self.Rectangle = _EmptyRect
+        self.ClientRectangle = _EmptyRect
+        self.__State__ = None
 
     #-------------------------------------------------------------------------------
 
@@ -425,6 +965,10 @@ class WinParams:
         return Res
 
 
+#: Параметры окна, которые умеет получать AutoItX.WinQueryMany.
+WinQueryFields = ('State', 'Rectangle', 'ClientRectangle', 'Header', 'PID')
+
+
 #-------------------------------------------------------------------------------
 
 class ControlParams:
@@ -452,16 +996,19 @@ class ControlParams:
             подронее см. в помощи  AutoIt),
                 может быть использована для передачи функциям AutoIt.
 
+        StringID формируется при первом обращении и хранится до изменения Class, Instance, Name, ID, Text или Handle
+        (если объект создан из строки - до тех пор это сама строка). Строки разбираются через ParseControlSpec:
+        повторный разбор той же строки берется из кэша, а ошибка в строке вызывает SpecError (наследник ValueError).
+        Ключи строки, для которых нет свойств (CLASSNN, REGEXPCLASS, X, Y, W, H), сохраняются вместе с объектом и
+        входят в StringID и после изменения свойств.
+        Объекты можно сравнивать ("==") и использовать как ключи словарей: равны контролы с одинаковыми Class,
+        Instance, Name, ID, Text, Handle и прочими ключами строки. Ключевые поля объекта, который уже лежит
+        в словаре, менять не стоит.
     """
 
-    Class = None
-    Instance = None
-    Name = None
-    ID = None
-    Text = ''
-    Handle = None
-    Rectangle = None
-    StringID = None
+    __slots__ = ('__Class__', '__Instance__', '__Name__', '__ID__', '__Text__', '__Handle__', '__Extra__',
+                 '__StringID__', 'Rectangle')
+
     __Complementary__ = {
         'CLASS': 'Class',
         'INSTANCE': 'Instance',
@@ -470,6 +1017,8 @@ class ControlParams:
         'TEXT': 'Text',
         'HANDLE': 'Handle'
     }
+    #: Ключи описания контрола и соответствующие им слоты.
+    __SpecSlots__ = dict((Param, '__{}__'.format(Name)) for Param, Name in __Complementary__.items())
 
     #-------------------------------------------------------------------------------
 
@@ -484,23 +1033,83 @@ class ControlParams:
 
     #-------------------------------------------------------------------------------
 
+    def __KeyField__(Slot):
+        def Get(self):
+            return getattr(self, Slot)
+
+        def Set(self, Value):
+            setattr(self, Slot, Value)
+            self.__StringID__ = None
+
+        return property(Get, Set)
+
+    Class = __KeyField__('__Class__')
+    Instance = __KeyField__('__Instance__')
+    Name = __KeyField__('__Name__')
+    ID = __KeyField__('__ID__')
+    Text = __KeyField__('__Text__')
+    Handle = __KeyField__('__Handle__')
+    del __KeyField__
+
+    @property
+    def StringID(self):
+        if self.__StringID__ is None:
+            Res = self.__FormStringID__(self.__Class__, self.__Instance__, self.__Name__, self.__ID__,
+                                        self.__Text__, self.__Handle__)
+            if self.__Extra__:
+                Res = Res[:-1] + ''.join('{}:{};'.format(Param, str(Value).replace(';', ';;'))
+                                         for Param, Value in self.__Extra__) + ']'
+            self.__StringID__ = Res
+        return self.__StringID__
+
+    @StringID.setter
+    def StringID(self, Value):
+        self.__StringID__ = Value
+
+    #-------------------------------------------------------------------------------
+
+    def __Key__(self):
+        return (self.__Class__, self.__Instance__, self.__Name__, self.__ID__, self.__Text__, self.__Handle__,
+                self.__Extra__)
+
+    def __eq__(self, Other):
+        if not isinstance(Other, ControlParams):
+            return NotImplemented
+        return self.__Key__() == Other.__Key__()
+
+    def __hash__(self):
+        return hash(self.__Key__())
+
+    def __repr__(self):
+        return 'ControlParams({!r})'.format(self.StringID)
+
+    #-------------------------------------------------------------------------------
+
     def SetParams(self, Class, Instance, Name, ID, Text, Handle, Rectangle):
-        self.Class = Class
-        self.Instance = Instance
-        self.Name = Name
-        self.ID = ID
-        self.Text = Text
-        self.Handle = Handle
-        self.StringID = self.__FormStringID__(Class, Instance, Name, ID, Text, Handle)
+        self.__Class__ = Class
+        self.__Instance__ = Instance
+        self.__Name__ = Name
+        self.__ID__ = ID
+        self.__Text__ = Text
+        self.__Handle__ = Handle
+        self.__Extra__ = ()
+        self.__StringID__ = None
         self.Rectangle = Rectangle
 
     #-------------------------------------------------------------------------------
 
     def SetParamsFromString(self, ControlString, Rectangle):
-        self.StringID = ControlString  # str(ControlString).upper()
-        InDict = self.__TakeFromString__(self.StringID)
-        for Param, Value in InDict.items():
-            self.__dict__[self.__Complementary__[Param]] = Value
+        self.__Class__ = self.__Instance__ = self.__Name__ = self.__ID__ = self.__Handle__ = None
+        self.__Text__ = ''
+        Extra = []
+        for Param, Value in ParseControlSpec(ControlString).Fields:
+            Slot = self.__SpecSlots__.get(Param)
+            if Slot is not None:
+                setattr(self, Slot, Value)
+            else:
+                Extra.append((Param, Value))
+        self.__Extra__ = tuple(Extra)
+        self.__StringID__ = ControlString  # str(ControlString).upper()
         self.Rectangle = Rectangle
 
     #-------------------------------------------------------------------------------
@@ -519,50 +1128,147 @@ class ControlParams:
         Res += ']'
         return Res
 
+
+#-------------------------------------------------------------------------------
+
+class BufferPool(local):
+    """
+        Пул выходных буферов (create_unicode_buffer) для строк, которые возвращают функции DLL.
+        У каждого потока свой набор буферов, на каждый размер - один буфер, который переиспользуется от вызова
+        к вызову, вместо того чтобы выделять, например, 128 КБ на каждый WinGetText.
+
+        Свойства:
+
+        * Buffers - словарь {размер в символах: буфер} текущего потока.
+    """
+
+    def __init__(self):
+        self.Buffers = dict()
+
     #-------------------------------------------------------------------------------
 
-    def __TakeFromString__(self, ControlString):
-        Res = None
-        tmpStr = ControlString.strip('[]')
-        ParList = list(T.strip() for T in tmpStr.split(';'))
-        if len(ParList) > 0:
-            Res = dict()
-            for Record in ParList:
-                RecSplit = list(R.strip() for R in Record.split(':'))
-                ParName = RecSplit[0].upper()
-                Res[ParName] = int(RecSplit[1]) if ParName == 'INSTANCE' else RecSplit[1]
-        return Res
+    def Get(self, Size):
+        """
+            Получить буфер на Size символов (с учетом завершающего нуля) для текущего потока.
+            Содержимое буфера остается от предыдущего использования.
+        """
+        Buf = self.Buffers.get(Size)
+        if Buf is None:
+            Buf = self.Buffers[Size] = create_unicode_buffer(Size)
+            if Profiler.Enabled:
+                Profiler.Buffer(sizeof(Buf))
+        return Buf
+
+    #-------------------------------------------------------------------------------
+
+    def Clear(self):
+        """
+            Освободить все буферы текущего потока.
+        """
+        self.Buffers.clear()
+
+
+#: Общий пул буферов, используется всеми экземплярами AutoItX.
+OutputBuffers = BufferPool()
 
 
 #-------------------------------------------------------------------------------
 # Декоратор для стандартного вызова с разбором параметров на предмет наличия None-значений.
 
-def AutoItCall(Mode):
-    def MainDecorator(AutoFunc):
+#: Режимы обработки результата, поддерживаемые AutoItCall.
+AutoItCallModes = ('VALUE', 'TRUE-FALSE', 'STRING-BUF', 'RAW')
+
+
+def _BadArguments(AutoFunc):
+    print('Неверные значения аргументов функции "{}", функция не выполнена!'.format(AutoFunc.__name__))
 
-        @wraps(AutoFunc)
+
+def _ValueCall(AutoFunc, CheckNone):
+    if CheckNone:
         def wrapper(*arg, **kwarg):
-            Res = None
-            ModeString = Mode.upper()
-            if not None in arg and not None in kwarg.values():
-                Res = AutoFunc(*arg, **kwarg)
-                if ModeString == 'VALUE':
-                    return Res.value
-                elif ModeString == 'TRUE-FALSE':
-                    if Res > 0:
-                        return True
-                    else:
-                        return False
-                elif ModeString == 'STRING-BUF':
-                    if Res.value != '':
-                        return Res.value
-                    else:
-                        return None
-                elif ModeString == 'RAW':
-                    return Res
-            else:
-                print('Неверные значения аргументов функции "{}", функция не выполнена!'.format(AutoFunc.__name__))
+            if None in arg or kwarg and None in kwarg.values():
+                return _BadArguments(AutoFunc)
+            return AutoFunc(*arg, **kwarg).value
+    else:
+        def wrapper(*arg, **kwarg):
+            return AutoFunc(*arg, **kwarg).value
+    return wrapper
+
 
+def _TrueFalseCall(AutoFunc, CheckNone):
+    if CheckNone:
+        def wrapper(*arg, **kwarg):
+            if None in arg or kwarg and None in kwarg.values():
+                return _BadArguments(AutoFunc)
+            return AutoFunc(*arg, **kwarg) > 0
+    else:
+        def wrapper(*arg, **kwarg):
+            return AutoFunc(*arg, **kwarg) > 0
+    return wrapper
+
+
+def _StringBufCall(AutoFunc, CheckNone):
+    if CheckNone:
+        def wrapper(*arg, **kwarg):
+            if None in arg or kwarg and None in kwarg.values():
+                return _BadArguments(AutoFunc)
+            return AutoFunc(*arg, **kwarg).value or None
+    else:
+        def wrapper(*arg, **kwarg):
+            return AutoFunc(*arg, **kwarg).value or None
+    return wrapper
+
+
+def _RawCall(AutoFunc, CheckNone):
+    if CheckNone:
+        def wrapper(*arg, **kwarg):
+            if None in arg or kwarg and None in kwarg.values():
+                return _BadArguments(AutoFunc)
+            return AutoFunc(*arg, **kwarg)
+        return wrapper
+    #Без проверки аргументов обертка не нужна вовсе.
+    return AutoFunc
+
+
+_ModeCalls = {
+    'VALUE': _ValueCall,
+    'TRUE-FALSE': _TrueFalseCall,
+    'STRING-BUF': _StringBufCall,
+    'RAW': _RawCall,
+}
+
+
+def AutoItCall(Mode, CheckNone=True, SetsError=True):
+    """
+        Декоратор методов AutoItX, обрабатывающий результат вызова функции DLL.
+
+        * Mode - режим обработки результата (см. AutoItCallModes):
+            'VALUE' - вернуть Res.value,
+            'TRUE-FALSE' - вернуть True, если Res > 0, иначе False,
+            'STRING-BUF' - вернуть строку из буфера Res, или None, если она пустая,
+            'RAW' - вернуть результат как есть.
+        * CheckNone=True - проверять ли аргументы на None. Если среди аргументов есть None, метод не выполняется,
+        печатается сообщение и возвращается None.
+        * SetsError=True - выставляет ли функция DLL признак ошибки AU3_error. Для методов с SetsError=False
+        (мышь, Send, чтение пикселов) профилировщик не считает ошибки: признак в DLL остался бы от прошлого вызова.
+
+        Обертка под нужный режим выбирается один раз, при объявлении метода. Проверка на None не делается для
+        методов без параметров (кроме self), а метод в режиме 'RAW' без проверки не оборачивается совсем.
+        Методы классов, зарегистрированных в Profiler.AddClass, профилируются, когда профилировщик включен.
+    """
+    ModeString = Mode.upper()
+    if ModeString not in _ModeCalls:
+        raise ValueError('Неизвестный режим AutoItCall: "{}"'.format(Mode))
+    MakeCall = _ModeCalls[ModeString]
+
+    def MainDecorator(AutoFunc):
+        Check = CheckNone and len(signature(AutoFunc).parameters) > 1
+        wrapper = MakeCall(AutoFunc, Check)
+        if wrapper is not AutoFunc:
+            wrapper = wraps(AutoFunc)(wrapper)
+        #Метка для профилировщика (см. CallProfiler).
+        wrapper.__AutoItMode__ = ModeString
+        wrapper.__AutoItSetsError__ = SetsError
         return wrapper
 
     return MainDecorator
@@ -577,295 +1283,101 @@ class AutoItX:
 
         * PathToDLL=None - Путь к AutoItX3.DLL, если не задан, то AutoItX3.DLL ищется в той же папке, где лежит
         данный модуль.
+        * Backend=None - Бэкенд, выполняющий функции AU3_* (см. AutoItBackend). Если не задан, то используется
+        DLLBackend(PathToDLL), например, AutoItX(Backend=SimulatedBackend()) работает без Windows.
+        * GrowBuffers=False - режим наращивания буферов для строк: чтение начинается с буфера на StartBufferSize
+        символов, и только если строка в него не поместилась, повторяется с буфером в 8 раз больше (но не больше
+        штатного размера для данной функции). Выгодно, когда тексты обычно короткие.
+
+        Свойства:
+
+        * GrowBuffers - см. выше, можно менять на ходу.
+        * StartBufferSize=256 - начальный размер буфера в режиме GrowBuffers.
+        * HandleCache=None - подключенный кэш Handle окон (см. WinHandleCache), WinClose и WinKill удаляют из него
+        записи о закрываемых окнах.
+        * LayoutCache=None - подключенный кэш геометрии окон и контролов (см. LayoutCache), его использует
+        ControlMouseClick, а WinMove, WinSetState, WinSetTitle, ControlMove, WinClose, WinKill, WinMinimizeAll и
+        WinMinimizeAllUndo сбрасывают.
+        * PixelCallCost=50e-6, CaptureCallCost=1e-3, CapturePixelCost=10e-9 - оценки стоимости в секундах одного
+        вызова AU3_PixelGetColor, одного снимка экрана и снимка одного пиксела, по ним PixelGetColors выбирает
+        способ чтения. Уточняются для текущего бэкенда методом CalibratePixels.
+
+        Выходные буферы для строк берутся из общего пула OutputBuffers (свой набор буферов у каждого потока) и
+        переиспользуются, поэтому методы, возвращающие сам буфер, использовать из одного потока повторно
+        можно только после чтения значения из него.
     """
 
     __AutoItDLL__ = None
     __Mnemonic__ = 'AutoItX'
     __x64__ = False
+    GrowBuffers = False
+    StartBufferSize = 256
+    HandleCache = None
+    LayoutCache = None
+    PixelCallCost = 50e-6
+    CaptureCallCost = 1e-3
+    CapturePixelCost = 10e-9
 
     #-------------------------------------------------------------------------------
 
-    def __init__(self, PathToDLL=None):
+    def __init__(self, PathToDLL=None, Backend=None, GrowBuffers=False):
 
-        #Словарь с описанием параметров функций AutoItX3.DLL
-        AutoDLLdict = {
-            'AU3_error': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '()'
-            },
-            'AU3_MouseClick': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_long, c_long, c_long, c_long)'
-            },
-            'AU3_MouseClickDrag': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_long, c_long, c_long, c_long, c_long)'
-            },
-            'AU3_WinGetHandle': {
-                'ReturnType': 'HWND',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinGetHandleAsText': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_WinExists': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinGetState': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinGetPos': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, POINTER(c_int * 4))'
-            },
-            'AU3_WinGetClientSize': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, POINTER(c_int * 4))'
-            },
-            'AU3_WinActivate': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinActive': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinClose': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinGetCaretPos': {
-                'ReturnType': 'c_int',
-                'ArgTypes': '(POINTER(c_int * 2),)'
-            },
-            'AU3_WinGetClassList': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_WinGetProcess': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_WinWait': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinWaitActive': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinWaitClose': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinWaitNotActive': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinGetText': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_WinGetTitle': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_WinKill': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinMenuSelectItem': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinMinimizeAll': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '()'
-            },
-            'AU3_WinMinimizeAllUndo': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '()'
-            },
-            'AU3_WinMove': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long, c_long, c_long, c_long)'
-            },
-            'AU3_WinSetOnTop': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinSetState': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_WinSetTitle': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_WinSetTrans': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_ControlClick': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_long, c_long, c_long)'
-            },
-            'AU3_ControlGetHandle': {
-                'ReturnType': 'HWND',
-                'ArgTypes': '(HWND, c_wchar_p)'
-            },
-            'AU3_ControlGetHandleAsText': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_ControlGetText': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_ControlGetTextByHandle': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(HWND, HWND, c_wchar_p, c_int)'
-            },
-            'AU3_ControlCommand': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_Send': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_long)'
-            },
-            'AU3_ControlGetPos': {
-                'ReturnType': 'c_int',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, POINTER(c_int * 4))'
-            },
-            'AU3_ControlGetPosByHandle': {
-                'ReturnType': 'c_int',
-                'ArgTypes': '(HWND, HWND, POINTER(c_int * 4))'
-            },
-            'AU3_ControlListView': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_ControlDisable': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlEnable': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlFocus': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlGetFocus': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_ControlGetFocusByHandle': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(HWND, c_wchar_p, c_int)'
-            },
-            'AU3_ControlHide': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlShow': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlMove': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_long, c_long, c_long, c_long)'
-            },
-            'AU3_ControlSend': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_long)'
-            },
-            'AU3_ControlSetText': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p)'
-            },
-            'AU3_ControlTreeView': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_wchar_p, c_int)'
-            },
-            'AU3_StatusbarGetText': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_wchar_p, c_long, c_wchar_p, c_int)'
-            },
-            'AU3_MouseDown': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p,)'
-            },
-            'AU3_MouseUp': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p,)'
-            },
-            'AU3_MouseMove': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_long, c_long, c_long)'
-            },
-            'AU3_MouseWheel': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_long)'
-            },
-            'AU3_MouseGetCursor': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '()'
-            },
-            'AU3_MouseGetPos': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(POINTER(c_int * 2),)'
-            },
-            'AU3_PixelChecksum': {
-                'ReturnType': 'c_ulong',
-                'ArgTypes': '(c_long, c_long, c_long, c_long, c_long)'
-            },
-            'AU3_PixelGetColor': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '(c_long, c_long)'
-            },
-            'AU3_PixelSearch': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_long, c_long, c_long, c_long, c_long, c_long, c_long, PixelSearchRetTypeP)'
-            },
-            'AU3_ClipGet': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p, c_int)'
-            },
-            'AU3_ClipPut': {
-                'ReturnType': 'c_void_p',
-                'ArgTypes': '(c_wchar_p,)'
-            },
-            'AU3_IsAdmin': {
-                'ReturnType': 'c_long',
-                'ArgTypes': '()'
-            },
-        }
-        #Ищем и грузим AutoItX3.DLL
         if sysMaxSize > 2 ** 32:
             self.__x64__ = True
-            dllKa = 'side_libs\\AutoItX3_x64.dll'
+        #Если бэкенд не задан - ищем и грузим AutoItX3.DLL
+        if Backend is None:
+            Backend = DLLBackend(PathToDLL)
         else:
-            dllKa = 'side_libs\\AutoItX3.dll'
-        tmpPath = PathToDLL if PathToDLL is not None else os.path.join(os.path.split(globals()['__file__'])[0], dllKa)
-        self.__AutoItDLL__ = CustomWinDLL(AutoDLLdict, tmpPath)
+            AutoItBackend.CheckBackend(Backend)
+        Profiler.Register(Backend, AutoItBackend.FunctionNames + AutoItBackend.OptionalFunctionNames)
+        self.__AutoItDLL__ = Backend
         if not self.__AutoItDLL__:
             raise RuntimeError('Невозможно загрузить библиотеку AutoIt!')
-        #Определяем метод Error, возврщающий признак ошибки из AutoItX3.dll
-        self.Error = self.__AutoItDLL__.AU3_error
-        #Пробрасываем MessageBoxW из User32.dll
-        self.__MsgBox__ = windll.user32.MessageBoxW
-        self.__MsgBox__.restype = c_int
-        self.__MsgBox__.argtypes = (HWND, c_wchar_p, c_wchar_p, c_uint)
+        self.GrowBuffers = GrowBuffers
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('TRUE-FALSE')
+    def Error(self):
+        """
+            Признак ошибки последнего вызова AutoItX3.dll (AU3_error), 0 - если ошибки не было.
+            Функция берется у бэкенда при каждом вызове, чтобы включение и выключение профилировщика
+            действовали и на уже созданные объекты AutoItX.
+        """
+        return self.__AutoItDLL__.AU3_error()
+
+    def __ReadString__(self, Func, Size, *arg):
+        """
+            Внутренний метод: вызвать функцию DLL, которая пишет строку в буфер (буфер и его размер - последние
+            параметры), и вернуть буфер из пула OutputBuffers. Size - штатный размер буфера для функции.
+        """
+        BufSize = min(self.StartBufferSize, Size) if self.GrowBuffers else Size
+        while True:
+            Buf = OutputBuffers.Get(BufSize)
+            #Чтобы при неудаче не вернуть строку от предыдущего вызова.
+            Buf[0] = '\0'
+            if BufSize >= Size:
+                Func(*arg, Buf, BufSize)
+                return Buf
+            #Если предпоследний символ после вызова не нулевой - строка, скорее всего, обрезана.
+            Buf[BufSize - 2] = '\0'
+            Func(*arg, Buf, BufSize)
+            if Buf[BufSize - 2] == '\0':
+                return Buf
+            BufSize = min(BufSize * 8, Size)
+
+    def __Forget__(self, Title, Text, Closing=False):
+        """
+            Внутренний метод: сбросить записи подключенных кэшей об окне, которое меняет геометрию
+            (или закрывается, если Closing=True).
+        """
+        if self.LayoutCache is not None:
+            self.LayoutCache.Forget(Title, Text)
+        if Closing and self.HandleCache is not None:
+            self.HandleCache.Forget(Title, Text)
+
+    #-------------------------------------------------------------------------------
+
+    @AutoItCall('TRUE-FALSE', SetsError=False)
     def MouseClick(self, X, Y, NumClicks=1, Button='left', Speed=-1):
         """
             Метод клика мышью по точке на экране.
@@ -887,7 +1399,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('TRUE-FALSE')
+    @AutoItCall('TRUE-FALSE', SetsError=False)
     def MouseClickDrag(self, X, Y, NewX, NewY, Button='left', Speed=-1):
         """
             Перетаскивание мышью.
@@ -910,7 +1422,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseDown(self, Button='left'):
         """
             Нажать и удерживать кнопку мыши.
@@ -926,7 +1438,7 @@ class AutoItX:
         self.__AutoItDLL__.AU3_MouseDown(RealButton)
         return True
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseUp(self, Button='left'):
         """
             Отпустить кнопку мыши.
@@ -944,7 +1456,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseMove(self, X, Y, Speed=-1):
         """
             Передвинуть курсор мыши.
@@ -960,7 +1472,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseWheel(self, Direction, Clicks=1):
         """
             Прокрутить колесико мыши.
@@ -977,7 +1489,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseGetCursor(self):
         """
             Определить текущий тип курсора мыши.
@@ -988,7 +1500,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def MouseGetPos(self):
         """
             Определение положения курсора мыши.
@@ -1017,8 +1529,7 @@ class AutoItX:
             "0x<значение Handle>", которую можно использовать для работы с окнами вместо заголовка.
         """
         bufSize = 19 if self.__x64__ else 11
-        tmp = create_unicode_buffer(bufSize)
-        self.__AutoItDLL__.AU3_WinGetHandleAsText(Title, Text, tmp, bufSize)
+        tmp = self.__ReadString__(self.__AutoItDLL__.AU3_WinGetHandleAsText, bufSize, Title, Text)
         Res = tmp.value if tmp.value != '' else None
         #Res = '0x{}'.format(tmp.value) if tmp.value != '' else None
         return Res
@@ -1106,19 +1617,26 @@ class AutoItX:
         ttmmpp = tmpCtypes(0, 0, 0, 0)
         #pTmp = pointer(ttmmpp)
         self.__AutoItDLL__.AU3_WinGetClientSize(Title, Text, pointer(ttmmpp))
-        cwa = list(p for p in ttmmpp)
         wra = self.WinGetPos(Title, Text)
         if wra:
-            ClientWidth = cwa[2]  # if cwa[2] < wra[2] else wra[2]
-            ClientHeight = cwa[3]  # if cwa[3] < wra[3] else wra[3]
-            BorderWidth = (wra[2] - wra[0] - ClientWidth) // 2
-            ClientX = wra[0] + BorderWidth
-            ClientY = wra[3]-cwa[3]-BorderWidth #(wra[3] - wra[1] - ClientHeight) // 2
-
-            return WinRect(ClientX, ClientY, ClientWidth, ClientHeight)
+            return self.__ClientRect__(wra, ttmmpp)
         else:
             return None
 
+    @staticmethod
+    def __ClientRect__(wra, cwa):
+        """
+            Внутренний метод: координаты клиентской области по результатам WinGetPos (wra) и
+            AU3_WinGetClientSize (cwa).
+        """
+        ClientWidth = cwa[2]  # if cwa[2] < wra[2] else wra[2]
+        ClientHeight = cwa[3]  # if cwa[3] < wra[3] else wra[3]
+        BorderWidth = (wra[2] - wra[0] - ClientWidth) // 2
+        ClientX = wra[0] + BorderWidth
+        ClientY = wra[3]-cwa[3]-BorderWidth #(wra[3] - wra[1] - ClientHeight) // 2
+
+        return WinRect(ClientX, ClientY, ClientWidth, ClientHeight)
+
     #-------------------------------------------------------------------------------
 
     @AutoItCall('TRUE-FALSE')
@@ -1164,6 +1682,7 @@ class AutoItX:
 
             Возвращает True в случае успеха, False в случае неудачи.
         """
+        self.__Forget__(Title, Text, True)
         return self.__AutoItDLL__.AU3_WinClose(Title, Text)
 
     #-------------------------------------------------------------------------------
@@ -1178,8 +1697,9 @@ class AutoItX:
             В случает неудачи метод Error() вернет 1.
         """
         tmpCtypes = c_int * 2
-        self.__AutoItDLL__.AU3_WinGetCaretPos(pointer(tmpCtypes))
-        return WinPoint(*list(p for p in tmpCtypes))
+        ttmmpp = tmpCtypes(0, 0)
+        self.__AutoItDLL__.AU3_WinGetCaretPos(pointer(ttmmpp))
+        return WinPoint(*list(p for p in ttmmpp))
         #return WinPoint(self.__AutoItDLL__.AU3_WinGetCaretPosX(), self.__AutoItDLL__.AU3_WinGetCaretPosY())
 
     #-------------------------------------------------------------------------------
@@ -1196,10 +1716,20 @@ class AutoItX:
             В случае неудачи вернет None, метод Error() вернет 1.
 
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_WinGetClassList(Title, Text, Res, 65535)
+        return self.__ReadString__(self.__AutoItDLL__.AU3_WinGetClassList, 65535, Title, Text)
 
-        return Res
+    def SnapshotControls(self, Title, Text=''):
+        """
+            Снимок контролов окна с индексами по классу, описанию и Handle (см. ControlSnapshot).
+
+            * Title - Заголовок окна в формате AutoIt.
+            * Text='' - Текст, содержащийся в окне.
+
+            Возвращает ControlSnapshot, если окно не найдено - пустой (WinHandle равен None). Обновлять снимок
+            следует его методом Refresh, он перечитывает области только пересозданных контролов.
+        """
+        from ._ControlTreeMod import ControlSnapshot
+        return ControlSnapshot(self, Title, Text)
 
     #-------------------------------------------------------------------------------
 
@@ -1214,8 +1744,7 @@ class AutoItX:
             Возвращает строку с PID процесса окна в десятиричном формате.
             В случае неудачи вернет None.
         """
-        Res = create_unicode_buffer(9)
-        self.__AutoItDLL__.AU3_WinGetProcess(Title, Text, Res, 9)
+        Res = self.__ReadString__(self.__AutoItDLL__.AU3_WinGetProcess, 9, Title, Text)
 
         if len(Res.value) > 0:
             return int(Res.value)
@@ -1235,10 +1764,7 @@ class AutoItX:
             Возвращает текст окна в виде строки,
             в случае неудачи - None.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_WinGetText(Title, Text, Res, 65535)
-
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_WinGetText, 65535, Title, Text)
 
     #-------------------------------------------------------------------------------
 
@@ -1253,9 +1779,84 @@ class AutoItX:
             Возвращает заголовок окна,
             в случае неудачи - None.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_WinGetTitle(Title, Text, Res, 65535)
+        return self.__ReadString__(self.__AutoItDLL__.AU3_WinGetTitle, 65535, Title, Text)
+
+    #-------------------------------------------------------------------------------
+
+    def WinQueryMany(self, Titles, Fields=WinQueryFields, Text='', Workers=0):
+        """
+            Получить параметры сразу многих окон.
+
+            * Titles - последовательность заголовков окон в формате AutoIt и/или объектов WinParams.
+            * Fields=WinQueryFields - какие параметры получать, любые из 'State', 'Rectangle', 'ClientRectangle',
+            'Header', 'PID'. Handle и состояние окна получаются всегда.
+            * Text='' - Текст, содержащийся в окнах.
+            * Workers=0 - если больше 1, то окна опрашиваются параллельно в пуле из Workers потоков. Имеет смысл,
+            только если бэкенд допускает вызовы из нескольких потоков.
+
+            Возвращает список той же длины, что и Titles: для каждого найденного окна - объект WinParams с
+            заполненными Handle, State (WinState), Rectangle, ClientRectangle, Header и PID (из запрошенных),
+            для ненайденных - None. Объекты WinParams из Titles заполняются на месте и возвращаются они же.
+
+            Каждый заголовок разрешается в Handle один раз, каждое окно опрашивается один раз (даже если на него
+            указывают разные заголовки), дальше запросы идут по Handle. Для Rectangle и ClientRectangle делается
+            один WinGetPos и одна проверка Error() на окно.
+        """
+        Fields = set(Fields)
+        Unknown = Fields.difference(WinQueryFields)
+        if Unknown:
+            raise ValueError('Неизвестные параметры окна: {}'.format(', '.join(sorted(Unknown))))
+        Keys = list(T.StringID if isinstance(T, WinParams) else T for T in Titles)
+        UniqueKeys = list(OrderedDict.fromkeys(Keys))
+        Pool = ThreadPoolExecutor(Workers) if Workers > 1 else None
+        try:
+            Map = Pool.map if Pool else map
+            Handles = dict(zip(UniqueKeys, Map(lambda Key: self.WinGetHandle(Key, Text), UniqueKeys)))
+            UniqueHandles = list(OrderedDict.fromkeys(H for H in Handles.values() if H))
+            Info = dict(zip(UniqueHandles, Map(lambda Handle: self.__QueryWindow__(Handle, Fields), UniqueHandles)))
+        finally:
+            if Pool:
+                Pool.shutdown()
+        Res = []
+        for Title, Key in zip(Titles, Keys):
+            Handle = Handles[Key]
+            Params = Info.get(Handle)
+            if not Params or not Params['State']:
+                Res.append(None)
+                continue
+            Window = Title if isinstance(Title, WinParams) else WinParams(Params.get('Header'))
+            Window.Handle = Handle
+            Window.State = WinState(Params['State'])
+            for Field in ('Rectangle', 'ClientRectangle', 'Header', 'PID'):
+                if Field in Params:
+                    setattr(Window, Field, Params[Field])
+            Res.append(Window)
+        return Res
 
+    def __QueryWindow__(self, Handle, Fields):
+        """
+            Внутренний метод для WinQueryMany: опрос одного окна по Handle, возвращает словарь с параметрами.
+        """
+        DLL = self.__AutoItDLL__
+        Title = WinHandle(Handle)
+        Res = {'State': DLL.AU3_WinGetState(Title, '')}
+        if not Res['State']:
+            return Res
+        if 'Rectangle' in Fields or 'ClientRectangle' in Fields:
+            wra = (c_int * 4)(0, 0, 0, 0)
+            cwa = (c_int * 4)(0, 0, 0, 0)
+            #Признак ошибки AU3_error общий для всех потоков пула, поэтому успех определяется по результату вызова
+            #(0 - окно не найдено), а не через Error().
+            Client = DLL.AU3_WinGetClientSize(Title, '', pointer(cwa)) if 'ClientRectangle' in Fields else 0
+            Rectangle = WinRect(*wra) if DLL.AU3_WinGetPos(Title, '', pointer(wra)) else None
+            if 'Rectangle' in Fields:
+                Res['Rectangle'] = Rectangle
+            if 'ClientRectangle' in Fields:
+                Res['ClientRectangle'] = self.__ClientRect__(Rectangle, cwa) if Rectangle and Client else None
+        if 'Header' in Fields:
+            Res['Header'] = self.WinGetTitle(Title)
+        if 'PID' in Fields:
+            Res['PID'] = self.WinGetProcess(Title)
         return Res
 
     #-------------------------------------------------------------------------------
@@ -1271,6 +1872,7 @@ class AutoItX:
             Возвращает True в случае успеха,
             False в случае неудачи.
         """
+        self.__Forget__(Title, Text, True)
         return self.__AutoItDLL__.AU3_WinKill(Title, Text)
 
     #-------------------------------------------------------------------------------
@@ -1363,38 +1965,19 @@ class AutoItX:
             функции WinGetState),
                 либо строкой с перечислением признаков, например: "ENABLED, VISIBLE, ACTIVE".
             * Timeout - Время ожидания в секундах, вещественное число для представления долей секунд.
-            * Interval=0.25 - Интервал проверки состояния.
+            * Interval=0.25 - Максимальный интервал проверки состояния. Опрос адаптивный: начинается с частых
+            проверок, интервал растет, пока состояние не меняется, а если бэкенд сообщает об изменениях - ожидание
+            прерывается сразу (подробнее см. WinWaiter).
             * Text='' - Текст, содержащийся в окне.
 
             Возвращает время, прошедшее с начала ожидания в случае успеха,
              0 - если не удалось дождаться нужного состояния за заданное время,
             -1 - если окно не было обнаружено.
         """
-        tmpState = WinState(State).StateNum
-        tmpTimeout = Timeout if Timeout > 0 else 10
-        Res = 0
-        if self.WinExists(Title, Text):
-            CurState = self.WinGetState(Title, Text)
-            Delta = 0
-            Expired = False
-            Start = perf_counter()
-            while CurState != tmpState:
-                sleep(Interval)
-                if self.WinExists(Title, Text):
-                    CurState = self.WinGetState(Title, Text)
-                else:
-                    Res = -1
-                    break
-                Delta = perf_counter() - Start
-                if Delta >= tmpTimeout:
-                    Expired = True
-                    break
-            if not Expired:
-                Res = Delta
-        else:
-            Res = -1
-
-        return Res
+        Res = WinWaiter(self, MaxInterval=Interval).Wait(Title, State, Timeout if Timeout > 0 else 10, Text)
+        if Res.Status == 1:
+            return Res.Elapsed if Res.Polls > 1 else 0
+        return Res.Status
 
     #-------------------------------------------------------------------------------
 
@@ -1431,6 +2014,8 @@ class AutoItX:
 
             Возвращает True.
         """
+        if self.LayoutCache is not None:
+            self.LayoutCache.Forget()
         self.__AutoItDLL__.AU3_WinMinimizeAll()
         return True
 
@@ -1440,6 +2025,8 @@ class AutoItX:
 
             Возвращает True.
         """
+        if self.LayoutCache is not None:
+            self.LayoutCache.Forget()
         self.__AutoItDLL__.AU3_WinMinimizeAllUndo()
         return True
 
@@ -1461,6 +2048,7 @@ class AutoItX:
             Возвращает True в случае успеха,
             False в случае неудачи.
         """
+        self.__Forget__(Title, Text)
         return self.__AutoItDLL__.AU3_WinMove(Title, Text, X, Y, Width, Height)
 
     #-------------------------------------------------------------------------------
@@ -1496,6 +2084,7 @@ class AutoItX:
             Возвращает True в случае успеха,
             False в случае неудачи.
         """
+        self.__Forget__(Title, Text)
         return self.__AutoItDLL__.AU3_WinSetState(Title, Text, State)
 
     #-------------------------------------------------------------------------------
@@ -1513,6 +2102,7 @@ class AutoItX:
             False в случае неудачи.
 
         """
+        self.__Forget__(Title, Text)
         return self.__AutoItDLL__.AU3_WinSetTitle(Title, Text, NewTitle)
 
     #-------------------------------------------------------------------------------
@@ -1547,8 +2137,7 @@ class AutoItX:
         """
         #Res = create_unicode_buffer(255)
         bufSize = 19 if self.__x64__ else 11
-        tmp = create_unicode_buffer(bufSize)
-        self.__AutoItDLL__.AU3_ControlGetHandleAsText(Title, Text, Control, tmp, bufSize)
+        tmp = self.__ReadString__(self.__AutoItDLL__.AU3_ControlGetHandleAsText, bufSize, Title, Text, Control)
         Res = tmp.value if tmp.value != '' else None
         return Res
 
@@ -1582,10 +2171,7 @@ class AutoItX:
             Возвращает строку, содержащую текст из контрола,
             в случае неудачи - None.
         """
-        Res = create_unicode_buffer(4095)
-        self.__AutoItDLL__.AU3_ControlGetText(Title, Text, Control, Res, 4095)
-
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlGetText, 4095, Title, Text, Control)
 
     #-------------------------------------------------------------------------------
 
@@ -1600,10 +2186,7 @@ class AutoItX:
             Возвращает строку, содержащую текст из контрола,
             в случае неудачи - None.
         """
-        Res = create_unicode_buffer(4095)
-        self.__AutoItDLL__.AU3_ControlGetTextByHandle(WinHandle, ControlHandle, Res, 4095)
-
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlGetTextByHandle, 4095, WinHandle, ControlHandle)
 
     #-------------------------------------------------------------------------------
     @AutoItCall('STRING-BUF')
@@ -1621,10 +2204,8 @@ class AutoItX:
             Возвращает строку с результатом выполнения команды, содержимое различается, в зависимости от команды.
             В случае ошибок метод Error() вернет 1.
         """
-        Res = create_unicode_buffer(255)
-        self.__AutoItDLL__.AU3_ControlCommand(Title, Text, Control, Command, ExtraData, Res, 255)
-
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlCommand, 255, Title, Text, Control, Command,
+                                   ExtraData)
 
     #-------------------------------------------------------------------------------
 
@@ -1721,10 +2302,18 @@ class AutoItX:
             * Speed=-1 - скорость нажатия, от 0 до 100, чем больше, тем медленнее, по умолчанию -1, что дает 10.
             * Text='' - Текст, содержащийся в окне.
 
+            Если подключен кэш геометрии (LayoutCache), координаты окна и контрола берутся из него, и повторное нажатие
+            на тот же контрол стоит двух вызовов DLL (AU3_WinGetHandle и AU3_MouseClick).
+
             Возвращает True в случае успеха,
             False в случае неудачи.
         """
-        Res = None
+        if self.LayoutCache is not None:
+            Origin = self.LayoutCache.ControlOrigin(Title, Control, Text)
+            if Origin is None:
+                return 0
+            return self.MouseClick(Origin.X + X, Origin.Y + Y, NumClicks, Button, Speed)
+        Res = 0
         WinClientRectangle = self.WinGetClientRect(Title, Text)
         #ControlX = self.__AutoItDLL__.AU3_ControlGetPosX(Title, Text, Control)
         #ControlY = self.__AutoItDLL__.AU3_ControlGetPosY(Title, Text, Control)
@@ -1779,9 +2368,27 @@ class AutoItX:
             Возвращает строку с результатом выполнения команды, содержимое различается, в зависимости от команды.
             В случае ошибок метод Error() вернет 1.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_ControlListView(Title, Text, Control, Command, Extra1, Extra2, Res, 65535)
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlListView, 65535, Title, Text, Control, Command,
+                                   Extra1, Extra2)
+
+    def ControlListViewRows(self, Title, Control, Columns=None, First=0, Last=None, Selected=False, PageSize=256,
+                            Prefetch=False, Text=''):
+        """
+            Читать строки ListView постранично (см. ListViewReader).
+
+            * Title - Заголовок окна в формате AutoIt.
+            * Control - Идентификатор контрола в формате AutoIt.
+            * Columns=None - номера читаемых столбцов, None - все.
+            * First=0, Last=None - номера первой и последней (включительно) строк, None - до конца списка.
+            * Selected=False - читать только выделенные строки.
+            * PageSize=256 - число строк, читаемых за раз.
+            * Prefetch=False - читать следующую страницу в фоновом потоке.
+            * Text='' - Текст, содержащийся в окне.
+
+            Генератор, выдает кортежи текстов ячеек. Если окно или контрол не найдены - ничего не выдает.
+        """
+        from ._ListViewMod import ListViewReader
+        return ListViewReader(self, Title, Control, Text, Columns, PageSize, Prefetch).Rows(First, Last, Selected)
 
     #-------------------------------------------------------------------------------
 
@@ -1844,9 +2451,7 @@ class AutoItX:
             Возвращает строку с именем контрола, в котором находится фокус ввода,
             в случае нейдачи - None.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_ControlGetFocus(Title, Text, Res, 65535)
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlGetFocus, 65535, Title, Text)
 
     #-------------------------------------------------------------------------------
 
@@ -1860,9 +2465,7 @@ class AutoItX:
             Возвращает строку с именем контрола, в котором находится фокус ввода,
             в случае нейдачи - None.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_ControlGetFocusByHandle(WinHandle, Res, 65535)
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlGetFocusByHandle, 65535, WinHandle)
 
     #-------------------------------------------------------------------------------
 
@@ -1914,6 +2517,7 @@ class AutoItX:
             Возвращает True в случае успеха,
             False в случае неудачи.
         """
+        self.__Forget__(Title, Text)
         return self.__AutoItDLL__.AU3_ControlMove(Title, Text, Control, X, Y, Width, Height)
 
     #-------------------------------------------------------------------------------
@@ -1970,9 +2574,22 @@ class AutoItX:
             Возвращает строку с результатом выполнения команды, содержимое различается, в зависимости от команды.
             В случае ошибок метод Error() вернет 1.
         """
-        Res = create_unicode_buffer(65535)
-        self.__AutoItDLL__.AU3_ControlTreeView(Title, Text, Control, Command, Extra1, Extra2, Res, 65535)
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_ControlTreeView, 65535, Title, Text, Control, Command,
+                                   Extra1, Extra2)
+
+    def ControlTreeViewModel(self, Title, Control, PrefetchDepth=0, Text=''):
+        """
+            Ленивая модель дерева контрола SysTreeView32 с кэшированием узлов (см. TreeViewModel).
+
+            * Title - Заголовок окна в формате AutoIt.
+            * Control - Идентификатор контрола в формате AutoIt.
+            * PrefetchDepth=0 - сразу загрузить в ширину столько уровней дерева, None - все.
+            * Text='' - Текст, содержащийся в окне.
+
+            Возвращает TreeViewModel.
+        """
+        from ._TreeViewMod import TreeViewModel
+        return TreeViewModel(self, Title, Control, Text, PrefetchDepth)
 
     #-------------------------------------------------------------------------------
 
@@ -1989,14 +2606,11 @@ class AutoItX:
             Возвращает строку, содержащую текст из контрола,
             в случае неудачи - None.
         """
-        Res = create_unicode_buffer(4095)
-        self.__AutoItDLL__.AU3_StatusbarGetText(Title, Text, Part, Res, 4095)
-
-        return Res
+        return self.__ReadString__(self.__AutoItDLL__.AU3_StatusbarGetText, 4095, Title, Text, Part)
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def Send(self, KeyString, NumSends=1, Flag=0):
         """
             Ввод с клавиатуры.
@@ -2006,8 +2620,16 @@ class AutoItX:
             * Flag=0 - Флаг интерпретации. Если 0 - будут рабраны спец. последовательности для клавиш, вроде "+" для
             зажатия SHIFT или {клавиша} для отсылки клавиш. Если 1 - строка будет отослана как есть.
 
+            Повторы по возможности отправляются одним вызовом DLL: одна клавиша сворачивается в {клавиша n},
+            например Send('{BACKSPACE}', 7) отправляет "{BACKSPACE 7}", прочие строки склеиваются (см. RepeatKeys).
+
             Возвращает количество отправок строки (обычно оно равно NumSends).
         """
+        Chunks = RepeatKeys(KeyString, NumSends, Flag)
+        if Chunks is not None:
+            for Chunk in Chunks:
+                self.__AutoItDLL__.AU3_Send(Chunk, Flag)
+            return max(NumSends, 0)
         i=0
         for i in range(1, NumSends + 1):
             self.__AutoItDLL__.AU3_Send(KeyString, Flag)
@@ -2016,7 +2638,27 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
+    def SendMany(self, Strings, Flag=0, ChunkSize=SendChunkSize):
+        """
+            Ввод с клавиатуры многих строк подряд. Строки склеиваются в куски не длиннее ChunkSize символов, и каждый
+            кусок отправляется одним вызовом DLL (см. JoinKeys).
+
+            * Strings - последовательность строк для ввода.
+            * Flag=0 - Флаг интерпретации, общий для всех строк (см. Send).
+            * ChunkSize=SendChunkSize - наибольшая длина куска.
+
+            Возвращает количество отправленных строк.
+        """
+        Count = 0
+        for Chunk, Num in JoinKeys(Strings, Flag, ChunkSize):
+            self.__AutoItDLL__.AU3_Send(Chunk, Flag)
+            Count += Num
+        return Count
+
+    #-------------------------------------------------------------------------------
+
+    @AutoItCall('RAW', SetsError=False)
     def PixelChecksum(self, Left, Top, Right, Bottom, Step=1):
         """
             Вычислить контрольную сумму области на экране.
@@ -2037,7 +2679,7 @@ class AutoItX:
 
     #-------------------------------------------------------------------------------
 
-    @AutoItCall('RAW')
+    @AutoItCall('RAW', SetsError=False)
     def PixelGetColor(self, X, Y):
         """
             Определить цвет пиксела на экране.
@@ -2066,14 +2708,195 @@ class AutoItX:
             попадут под критерий поиска по каждому цвету. 0 - абсолютное соответствие, 255 - совпадет любой цвет.
             * Step=1 - шаг в пикселах, позволяет ускорить поиск путем пропуска пикселов.
 
-            Возвращает объект типа WinPoint с координатами пиксела, если он найден
+            Возвращает объект типа WinPoint с координатами пиксела, если он найден, иначе None.
         """
         tmp = PixelSearchRetType(0, 0)
         self.__AutoItDLL__.AU3_PixelSearch(Left, Top, Right, Bottom, Col, Var, Step, byref(tmp))
+        if self.Error():
+            return None
         return WinPoint(tmp[0], tmp[1])
 
     #-------------------------------------------------------------------------------
 
+    @AutoItCall('RAW', SetsError=False)
+    def CaptureRegionBytes(self, Left, Top, Right, Bottom):
+        """
+            Снимок области экрана в виде байт, не требует numpy.
+
+            * Left, Top, Right, Bottom - края области экрана, включительно (как в PixelSearch).
+
+            Возвращает (ширина, высота, байты RGB построчно, по три байта на пиксел). Если бэкенд умеет снимать
+            экран (CaptureScreen), это один вызов, иначе область читается по пикселу через AU3_PixelGetColor.
+        """
+        Capture = getattr(self.__AutoItDLL__, 'CaptureScreen', None)
+        if Capture is not None:
+            return Capture(Left, Top, Right, Bottom)
+        Width, Height = max(Right - Left + 1, 0), max(Bottom - Top + 1, 0)
+        GetColor = self.__AutoItDLL__.AU3_PixelGetColor
+        Res = bytearray()
+        for Y in range(Top, Top + Height):
+            for X in range(Left, Left + Width):
+                Res += (GetColor(X, Y) & 0xFFFFFF).to_bytes(3, 'big')
+        return Width, Height, bytes(Res)
+
+    @AutoItCall('RAW', SetsError=False)
+    def CaptureRegion(self, Left, Top, Right, Bottom):
+        """
+            Снимок области экрана в виде массива numpy формы (высота, ширина, 3), uint8, каналы R, G, B.
+            Края области включительно, Image[Y - Top, X - Left] - пиксел экрана (X, Y). Требует numpy.
+        """
+        from ._PixelMod import ImageFromBytes
+        return ImageFromBytes(*self.CaptureRegionBytes(Left, Top, Right, Bottom))
+
+    #-------------------------------------------------------------------------------
+
+    #Без проверки на None: Points может быть массивом numpy.
+    @AutoItCall('RAW', CheckNone=False, SetsError=False)
+    def PixelGetColors(self, Points, Packed=True, Method=None):
+        """
+            Цвета многих пикселов экрана сразу. Требует numpy.
+
+            * Points - координаты: массив формы (N, 2) или последовательность пар (X, Y) / WinPoint.
+            * Packed=True - вернуть массив int32 цветов в формате 0xRRGGBB (как PixelGetColor), иначе массив
+            (N, 3) uint8 с каналами R, G, B.
+            * Method=None - способ чтения: 'POINTS' - по вызову AU3_PixelGetColor на точку, 'CAPTURE' - один снимок
+            охватывающего точки прямоугольника (CaptureRegion) и выборка из него. None - выбрать более дешевый по
+            числу точек и площади прямоугольника (см. PixelCallCost, CaptureCallCost, CapturePixelCost).
+
+            Точки за пределами экрана при чтении по точкам дают -1 (ошибка PixelGetColor), при чтении снимком -
+            черный цвет.
+        """
+        from ._PixelMod import numpy, PointArrays, PackColors, UnpackColors
+        Xs, Ys = PointArrays(Points)
+        if not len(Xs):
+            return numpy.zeros(0, dtype=numpy.int32) if Packed else numpy.zeros((0, 3), dtype=numpy.uint8)
+        Left, Top, Right, Bottom = int(Xs.min()), int(Ys.min()), int(Xs.max()), int(Ys.max())
+        if Method is None:
+            Area = (Right - Left + 1) * (Bottom - Top + 1)
+            Capture = self.CaptureCallCost + self.CapturePixelCost * Area < self.PixelCallCost * len(Xs)
+            Method = 'CAPTURE' if Capture else 'POINTS'
+        if Method.upper() == 'CAPTURE':
+            Colors = self.CaptureRegion(Left, Top, Right, Bottom)[Ys - Top, Xs - Left]
+            return PackColors(Colors).astype(numpy.int32) if Packed else Colors
+        GetColor = self.__AutoItDLL__.AU3_PixelGetColor
+        Colors = numpy.fromiter((GetColor(X, Y) for X, Y in zip(Xs.tolist(), Ys.tolist())), dtype=numpy.int32,
+                                count=len(Xs))
+        return Colors if Packed else UnpackColors(Colors)
+
+    def CalibratePixels(self, X=0, Y=0, Size=256, Repeat=20):
+        """
+            Замерить для текущего бэкенда стоимость чтения точки вызовом AU3_PixelGetColor и чтения снимком и записать
+            их в PixelCallCost, CaptureCallCost и CapturePixelCost этого объекта (см. PixelGetColors). Замеряется
+            сам PixelGetColors, поэтому в оценки входят и расходы на массивы numpy.
+
+            * X=0, Y=0 - левый верхний угол области экрана для замеров.
+            * Size=256 - сторона квадрата для замеров.
+            * Repeat=20 - число повторов каждого замера.
+
+            Возвращает кортеж (PixelCallCost, CaptureCallCost, CapturePixelCost).
+        """
+        def Time(Points, Method):
+            Start = perf_counter()
+            for i in range(Repeat):
+                self.PixelGetColors(Points, Method=Method)
+            return (perf_counter() - Start) / Repeat
+
+        Diagonal = list((X + N, Y + N) for N in range(0, Size, max(Size // 64, 1)))
+        self.PixelCallCost = Time(Diagonal, 'POINTS') / len(Diagonal)
+        Small = Time(((X, Y),), 'CAPTURE')
+        Large = Time(((X, Y), (X + Size - 1, Y + Size - 1)), 'CAPTURE')
+        self.CapturePixelCost = max(Large - Small, 0) / (Size * Size - 1)
+        self.CaptureCallCost = max(Small - self.CapturePixelCost, 0)
+        return self.PixelCallCost, self.CaptureCallCost, self.CapturePixelCost
+
+    #-------------------------------------------------------------------------------
+
+    @AutoItCall('RAW', SetsError=False)
+    def PixelSearchAll(self, Left, Top, Right, Bottom, Col, Var=0):
+        """
+            Поиск всех пикселов с определенным цветом в области экрана: один снимок и векторное сравнение (numpy)
+            вместо попиксельных вызовов DLL.
+
+            * Left, Top, Right, Bottom - края области экрана, включительно.
+            * Col - цвет 0xRRGGBB или тройка (R, G, B).
+            * Var=0 - допуск: одно число на все каналы или тройка (по R, G, B).
+
+            Возвращает список WinPoint в порядке поиска PixelSearch (построчно), пустой, если совпадений нет.
+        """
+        from ._PixelMod import FindColor
+        Points = FindColor(self.CaptureRegion(Left, Top, Right, Bottom), Col, Var, Left, Top)
+        return list(WinPoint(X, Y) for X, Y in Points.tolist())
+
+    @AutoItCall('RAW', SetsError=False)
+    def PixelSearchColors(self, Left, Top, Right, Bottom, Colors, Var=0):
+        """
+            Поиск нескольких цветов в области экрана по одному снимку.
+
+            * Left, Top, Right, Bottom - края области экрана, включительно.
+            * Colors - последовательность цветов или словарь {цвет: допуск} (см. FindColors).
+            * Var=0 - допуск для цветов без своего допуска.
+
+            Возвращает словарь {цвет: список WinPoint}.
+        """
+        from ._PixelMod import FindColors
+        Found = FindColors(self.CaptureRegion(Left, Top, Right, Bottom), Colors, Var, Left, Top)
+        return dict((Color, list(WinPoint(X, Y) for X, Y in Points.tolist())) for Color, Points in Found.items())
+
+    @AutoItCall('RAW', SetsError=False)
+    def PixelSearchNearest(self, Left, Top, Right, Bottom, Col, X, Y, Var=0):
+        """
+            Поиск ближайшего к точке (X, Y) пиксела с определенным цветом в области экрана.
+
+            * Left, Top, Right, Bottom - края области экрана, включительно.
+            * Col - цвет 0xRRGGBB или тройка (R, G, B).
+            * X, Y - экранные координаты точки.
+            * Var=0 - допуск: одно число на все каналы или тройка (по R, G, B).
+
+            Возвращает WinPoint или None, если совпадений нет.
+        """
+        from ._PixelMod import NearestColor
+        return NearestColor(self.CaptureRegion(Left, Top, Right, Bottom), Col, X, Y, Var, Left, Top)
+
+    #-------------------------------------------------------------------------------
+
+    #Без проверки на None: шаблоны - массивы numpy, их нельзя сравнивать с None через "in".
+    @AutoItCall('RAW', CheckNone=False, SetsError=False)
+    def ImageSearch(self, Template, Region, Threshold=0.9, MaxMatches=None):
+        """
+            Поиск изображения (шаблона) в области экрана. Требует numpy.
+
+            * Template - шаблон: ImageTemplate или массив (высота, ширина, 3), например, снимок CaptureRegion.
+            Подготовка шаблона (серое изображение, пирамида) кэшируется, см. PrepareTemplate.
+            * Region - область поиска: WinRect или кортеж (X, Y, ширина, высота) в экранных координатах.
+            * Threshold=0.9 - наименьшая степень совпадения, от -1 до 1 (см. FindTemplate).
+            * MaxMatches=None - наибольшее число результатов, None - все.
+
+            Возвращает список WinRect найденных совпадений по убыванию степени совпадения, пустой, если ничего
+            не найдено.
+        """
+        from ._ImageMod import FindTemplate
+        X, Y, Width, Height = Region
+        Image = self.CaptureRegion(X, Y, X + Width - 1, Y + Height - 1)
+        return list(Match.Rect for Match in FindTemplate(Image, Template, Threshold, X, Y, MaxMatches))
+
+    #Без проверки на None: шаблоны - массивы numpy, их нельзя сравнивать с None через "in".
+    @AutoItCall('RAW', CheckNone=False, SetsError=False)
+    def ImageSearchMany(self, Templates, Region, Threshold=0.9, MaxMatches=None):
+        """
+            Поиск нескольких шаблонов в одной области экрана по одному снимку (см. ImageSearch).
+
+            * Templates - словарь {ключ: шаблон} или последовательность шаблонов (ключи - их номера).
+
+            Возвращает словарь {ключ: список WinRect}.
+        """
+        from ._ImageMod import FindTemplates
+        X, Y, Width, Height = Region
+        Image = self.CaptureRegion(X, Y, X + Width - 1, Y + Height - 1)
+        return dict((Key, list(Match.Rect for Match in Matches))
+                    for Key, Matches in FindTemplates(Image, Templates, Threshold, X, Y, MaxMatches).items())
+
+    #-------------------------------------------------------------------------------
+
     @AutoItCall('TRUE-FALSE')
     def ClipPut(self, Text):
         """
@@ -2093,15 +2916,14 @@ class AutoItX:
             В случае успеха вернет текст, если в буфере обмена был не текст, а что-то другое, или возникли ошибки,
             вернет None.
         """
-        tmp = create_unicode_buffer(65536)
-        self.__AutoItDLL__.AU3_ClipGet(tmp, 65536)
+        tmp = self.__ReadString__(self.__AutoItDLL__.AU3_ClipGet, 65536)
         Out = self.Error()
         Res = tmp.value if Out == 0 else None
         return Res
 
         #-------------------------------------------------------------------------------
 
-    @AutoItCall('TRUE-FALSE')
+    @AutoItCall('TRUE-FALSE', SetsError=False)
     def IsAdmin(self):
         return self.__AutoItDLL__.AU3_IsAdmin()
 
@@ -2119,7 +2941,15 @@ class AutoItX:
                 MB_Flags.MB_ICONWARNING|MB_Flags.MB_OKCANCEL|MB_Flags.MB_SYSTEMMODAL
             * WinHandle=None - Handle родительского окна, которое открыло MessageBox.
         """
-        return self.__MsgBox__(WinHandle, Message, Title, Flags)
+        #MessageBoxW из User32.dll (или его замена в бэкенде)
+        return self.__AutoItDLL__.MessageBoxW(WinHandle, Message, Title, Flags)
+
+
+#Методы AutoItX учитываются профилировщиком, когда он включен.
+Profiler.AddClass(AutoItX)
+
+#_WaitMod сам импортирует WinState из этого модуля, поэтому WinWaiter импортируется в конце, когда все определено.
+from ._WaitMod import WinWaiter
 
 #-------------------------------------------------------------------------------
 
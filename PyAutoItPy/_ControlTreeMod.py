@@ -0,0 +1,225 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Снимок контролов окна по списку классов (WinGetClassList) с индексами по классу, описанию и Handle.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import namedtuple
+
+from ._AutomationMod import WinHandle
+from ._SpecMod import CanonicalControlSpec, ParseControlSpec, SpecError
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Итог обновления снимка: Changed - новые контролы и контролы с новым Handle, Removed - исчезнувшие.
+ControlChanges = namedtuple('ControlChanges', 'Changed, Removed')
+
+
+#-------------------------------------------------------------------------------
+
+def ParseClassList(ClassList):
+    """
+        Разобрать строку WinGetClassList (классы через перевод строки) в список пар (класс, номер экземпляра).
+        Номера экземпляров считаются по порядку среди контролов одного класса, как их нумерует AutoIt.
+    """
+    Counts = dict()
+    Res = []
+    for Class in ClassList.split('\n'):
+        Class = Class.rstrip('\r')
+        if not Class:
+            continue
+        Counts[Class] = Counts.get(Class, 0) + 1
+        Res.append((Class, Counts[Class]))
+    return Res
+
+
+def _Spec(Class, Instance):
+    """
+        Внутренняя функция: каноническое описание "[CLASS:x; INSTANCE:n]" контрола.
+    """
+    return CanonicalControlSpec('[CLASS:{}; INSTANCE:{}]'.format(Class.replace(';', ';;'), Instance))
+
+
+#-------------------------------------------------------------------------------
+
+class ControlNode:
+    """
+        Контрол в снимке ControlSnapshot.
+
+        Свойства:
+
+        * Class - класс контрола.
+        * Instance - номер экземпляра среди контролов того же класса.
+        * Handle - числовой Handle контрола.
+        * Rect - область контрола (WinRect, как ее возвращает ControlGetPosByHandle) или None.
+        * Spec - каноническое описание "[CLASS:x; INSTANCE:n]", годится как Control в методах AutoItX.
+        * ClassNN - описание вида "Edit2".
+        * Parent - снимок (ControlSnapshot), которому принадлежит контрол.
+    """
+    __slots__ = ('Class', 'Instance', 'Handle', 'Rect', 'Spec', 'Parent')
+
+    def __init__(self, Parent, Class, Instance, Handle, Rect=None):
+        self.Parent = Parent
+        self.Class = Class
+        self.Instance = Instance
+        self.Handle = Handle
+        self.Rect = Rect
+        self.Spec = _Spec(Class, Instance)
+
+    @property
+    def ClassNN(self):
+        return '{}{}'.format(self.Class, self.Instance)
+
+    @property
+    def HandleSpec(self):
+        """
+            Описание контрола по Handle, "[HANDLE:0x...]", не зависит от номера экземпляра.
+        """
+        return WinHandle('0x{:X}'.format(self.Handle))
+
+    def __repr__(self):
+        return 'ControlNode({}, Handle=0x{:X}, Rect={})'.format(self.Spec, self.Handle, self.Rect)
+
+
+#-------------------------------------------------------------------------------
+
+class ControlSnapshot:
+    """
+        Снимок контролов окна: дерево "окно - классы - экземпляры", построенное по WinGetClassList, с Handle
+        (ControlGetHandle) и областью (ControlGetPosByHandle) каждого контрола. AutoItX не сообщает, какой контрол
+        вложен в какой, поэтому глубже класса дерево не идет.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Title - Заголовок окна в формате AutoIt.
+        * Text='' - Текст, содержащийся в окне.
+        * Refresh=True - сразу заполнить снимок.
+
+        Свойства:
+
+        * WinHandle - числовой Handle окна или None, если окно не найдено.
+        * Nodes - контролы (ControlNode) в порядке WinGetClassList.
+        * ByClass - словарь {класс: список контролов по номерам экземпляров} (второй уровень дерева).
+        * BySpec - словарь {описание "[CLASS:x; INSTANCE:n]" в каноническом виде: контрол}.
+        * ByClassNN - словарь {ClassNN ("Edit2", "SysListView321"): контрол}.
+        * ByHandle - словарь {Handle: контрол}.
+
+        Найти контрол можно и через снимок[ключ], где ключ - Handle (число), ClassNN ("Edit2") или описание
+        в квадратных скобках по классу и номеру экземпляра, ClassNN или Handle ("[CLASS:Edit; INSTANCE:2]",
+        "[CLASSNN:Edit2]", "[HANDLE:0x1F2]") в любом допустимом написании.
+
+        Обновление (Refresh) перечитывает список классов и Handle контролов, а область запрашивает только у новых
+        контролов и контролов, у которых сменился Handle. Перемещение контрола без пересоздания так не заметить -
+        для этого есть Refresh(Rects=True).
+    """
+
+    def __init__(self, Automat, Title, Text='', Refresh=True):
+        self.Automat = Automat
+        self.Title = Title
+        self.Text = Text
+        self.WinHandle = None
+        self.Nodes = []
+        self.ByClass = dict()
+        self.BySpec = dict()
+        self.ByClassNN = dict()
+        self.ByHandle = dict()
+        if Refresh:
+            self.Refresh()
+
+    #-------------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.Nodes)
+
+    def __iter__(self):
+        return iter(self.Nodes)
+
+    def __contains__(self, Key):
+        return self.Get(Key) is not None
+
+    def __getitem__(self, Key):
+        Res = self.Get(Key)
+        if Res is None:
+            raise KeyError(Key)
+        return Res
+
+    def Get(self, Key, Default=None):
+        """
+            Контрол по Handle, описанию в квадратных скобках или ClassNN, Default - если такого нет.
+        """
+        if isinstance(Key, int):
+            return self.ByHandle.get(Key, Default)
+        if not Key.startswith('['):
+            return self.ByClassNN.get(Key, Default)
+        try:
+            Parsed = ParseControlSpec(Key)
+        except SpecError:
+            return Default
+        Fields = Parsed.AsDict()
+        if len(Fields) == 1 and 'HANDLE' in Fields:
+            try:
+                return self.ByHandle.get(int(Fields['HANDLE'], 16), Default)
+            except ValueError:
+                return Default
+        if len(Fields) == 1 and 'CLASSNN' in Fields:
+            return self.ByClassNN.get(Fields['CLASSNN'], Default)
+        if len(Fields) == 1 and 'CLASS' in Fields:
+            #Без INSTANCE AutoIt берет первый контрол класса.
+            Nodes = self.ByClass.get(Fields['CLASS'])
+            return Nodes[0] if Nodes else Default
+        return self.BySpec.get(Parsed.Canonical, Default)
+
+    #-------------------------------------------------------------------------------
+
+    def Refresh(self, Rects=False):
+        """
+            Обновить снимок.
+
+            * Rects=False - перечитать области всех контролов, а не только новых.
+
+            Возвращает ControlChanges: списки новых (или пересозданных) и исчезнувших контролов. Контролы, сохранившие
+            Handle, остаются теми же объектами ControlNode, у них обновляется только номер экземпляра.
+        """
+        Automat = self.Automat
+        Handle = Automat.WinGetHandle(self.Title, self.Text)
+        ClassList = Automat.WinGetClassList(WinHandle(Handle), '') if Handle else None
+        if ClassList is None:
+            Removed = self.Nodes
+            self.WinHandle = None
+            self.Nodes, self.ByClass, self.BySpec, self.ByClassNN, self.ByHandle = [], dict(), dict(), dict(), dict()
+            return ControlChanges([], Removed)
+        WinHandleInt = int(Handle, 16)
+        #Контролы другого окна (окно пересоздано) сохранять нельзя, даже если Handle совпали.
+        Old = self.ByHandle if WinHandleInt == self.WinHandle else dict()
+        Nodes, Changed = [], []
+        ByClass, BySpec, ByClassNN, ByHandle = dict(), dict(), dict(), dict()
+        for Class, Instance in ParseClassList(ClassList):
+            Spec = _Spec(Class, Instance)
+            ControlHandle = Automat.ControlGetHandleInt(WinHandleInt, Spec)
+            if not ControlHandle:
+                #Контрол исчез между вызовами.
+                continue
+            Node = Old.get(ControlHandle)
+            if Node is not None and Node.Class == Class:
+                if Node.Instance != Instance:
+                    Node.Instance, Node.Spec = Instance, Spec
+                if Rects:
+                    Node.Rect = Automat.ControlGetPosByHandle(WinHandleInt, ControlHandle)
+            else:
+                Node = ControlNode(self, Class, Instance, ControlHandle,
+                                   Automat.ControlGetPosByHandle(WinHandleInt, ControlHandle))
+                Changed.append(Node)
+            Nodes.append(Node)
+            ByClass.setdefault(Class, []).append(Node)
+            BySpec[Spec] = Node
+            ByClassNN[Node.ClassNN] = Node
+            ByHandle[ControlHandle] = Node
+        Removed = list(Node for Node in self.Nodes if ByHandle.get(Node.Handle) is not Node)
+        self.WinHandle = WinHandleInt
+        self.Nodes, self.ByClass, self.BySpec = Nodes, ByClass, BySpec
+        self.ByClassNN, self.ByHandle = ByClassNN, ByHandle
+        return ControlChanges(Changed, Removed)
@@ -0,0 +1,153 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Кэш соответствия заголовков окон в формате AutoIt их Handle.
+"""
+
+# -------------------------------------------------------------------------------
+
+from threading import Lock
+from time import perf_counter
+
+from ._AutomationMod import WinHandle, WinParams
+from ._SpecMod import CanonicalWinSpec, SpecError, SpecHandle, HandleNumber
+
+
+#-------------------------------------------------------------------------------
+
+class WinHandleCache:
+    """
+        Кэш, сопоставляющий заголовку окна в формате AutoIt (например, "[CLASS:Notepad; TITLE:Без имени]" или
+        WinParams.StringID) строку "[HANDLE:...]" найденного окна. Заголовки приводятся к каноническому виду
+        (см. CanonicalWinSpec), поэтому "[class:Notepad;title:Без имени]" использует ту же запись. Поиск окна по
+        Handle в AutoIt намного дешевле сопоставления заголовков, классов и регулярных выражений, поэтому скрипты,
+        многократно передающие один и тот же заголовок, выигрывают, если передают вместо него результат Resolve.
+
+        Запись кэша считается действительной, пока не истек ее срок (TTL) и окно с этим Handle существует
+        (проверяется одним вызовом WinExists по Handle, если Validate=True). Записи удаляются также при закрытии окна
+        через AutoItX.WinClose / AutoItX.WinKill, если кэш подключен к объекту AutoItX (свойство HandleCache).
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * TTL=5.0 - время жизни записи в секундах, None - без ограничения.
+        * Validate=True - проверять ли существование окна при каждом попадании в кэш.
+        * Attach=True - подключить кэш к Automat (Automat.HandleCache = self), чтобы WinClose/WinKill удаляли
+        записи о закрытых окнах.
+
+        Свойства:
+
+        * Hits - число попаданий в кэш.
+        * Misses - число промахов (в том числе устаревших записей).
+        * Expired - сколько из промахов пришлось на записи, которые устарели по TTL или не прошли проверку.
+    """
+
+    def __init__(self, Automat, TTL=5.0, Validate=True, Attach=True):
+        self.Automat = Automat
+        self.TTL = TTL
+        self.Validate = Validate
+        self.Hits = 0
+        self.Misses = 0
+        self.Expired = 0
+        self.__Entries__ = dict()
+        self.__Lock__ = Lock()
+        if Attach:
+            Automat.HandleCache = self
+
+    #-------------------------------------------------------------------------------
+
+    def __call__(self, Title, Text=''):
+        return self.Resolve(Title, Text)
+
+    def __len__(self):
+        return len(self.__Entries__)
+
+    #-------------------------------------------------------------------------------
+
+    @staticmethod
+    def __Key__(Title, Text):
+        """
+            Внутренний метод: ключ записи кэша.
+        """
+        if isinstance(Title, WinParams):
+            Title, Text = Title.StringID, Text or Title.Text
+        try:
+            #Одинаковые по смыслу описания, записанные по-разному, попадают в одну запись.
+            return CanonicalWinSpec(Title), Text
+        except SpecError:
+            return Title, Text
+
+    #-------------------------------------------------------------------------------
+
+    def Resolve(self, Title, Text=''):
+        """
+            Получить заголовок вида "[HANDLE:...]" для окна.
+
+            * Title - Заголовок окна в формате AutoIt или объект WinParams.
+            * Text='' - Текст, содержащийся в окне.
+
+            Возвращает строку "[HANDLE:...]", которую можно передавать любым методам AutoItX вместо Title,
+            или None, если окно не найдено. Заголовки, уже заданные через HANDLE, возвращаются без изменений.
+        """
+        Key = self.__Key__(Title, Text)
+        if Key[0].startswith('[HANDLE:'):
+            return Key[0]
+        Entry = self.__Entries__.get(Key)
+        if Entry is not None:
+            HandleTitle, Expires = Entry
+            if (Expires is None or perf_counter() < Expires) and \
+                    (not self.Validate or self.Automat.WinExists(HandleTitle)):
+                #Счетчики меняются под блокировкой, иначе "+= 1" из разных потоков теряет приращения.
+                with self.__Lock__:
+                    self.Hits += 1
+                return HandleTitle
+        Raw = self.Automat.WinGetHandle(*Key)
+        with self.__Lock__:
+            self.Misses += 1
+            if Entry is not None:
+                self.Expired += 1
+            if not Raw:
+                self.__Entries__.pop(Key, None)
+                return None
+            HandleTitle = WinHandle(Raw)
+            self.__Entries__[Key] = (HandleTitle, perf_counter() + self.TTL if self.TTL is not None else None)
+        return HandleTitle
+
+    #-------------------------------------------------------------------------------
+
+    def Forget(self, Title=None, Text=''):
+        """
+            Удалить записи кэша.
+
+            * Title=None - Заголовок окна в формате AutoIt, объект WinParams или строка "[HANDLE:...]".
+            Удаляется запись для этого заголовка и все записи, указывающие на то же окно, под каким бы заголовком
+            они ни были получены (окно, на которое заголовок указывает сейчас, определяется через WinGetHandle,
+            поэтому вызывать Forget нужно до закрытия окна). Если None - кэш очищается полностью.
+            * Text='' - Текст, содержащийся в окне.
+        """
+        if Title is None:
+            with self.__Lock__:
+                self.__Entries__.clear()
+            return
+        if not self.__Entries__:
+            return
+        Key = self.__Key__(Title, Text)
+        Handle = SpecHandle(*Key)
+        if Handle is None:
+            Handle = self.Automat.WinGetHandle(*Key)
+        with self.__Lock__:
+            Entry = self.__Entries__.pop(Key, None)
+            #Handle сравниваются числами: "0x10010" и "0x0000000000010010" - одно и то же окно.
+            Handles = set(HandleNumber(Found) for Found in (Handle, Entry and SpecHandle(Entry[0])) if Found)
+            for Other in [K for K, E in self.__Entries__.items() if HandleNumber(SpecHandle(E[0])) in Handles]:
+                del self.__Entries__[Other]
+
+    #-------------------------------------------------------------------------------
+
+    def ResetStats(self):
+        """
+            Обнулить счетчики Hits, Misses, Expired.
+        """
+        with self.__Lock__:
+            self.Hits = self.Misses = self.Expired = 0
@@ -0,0 +1,374 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Поиск изображений (шаблонов) в снимках области экрана: нормированная взаимная корреляция по пирамиде
+изображений, от грубого уровня к точному. Требует numpy.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import namedtuple, OrderedDict
+from threading import Lock
+
+try:
+    import numpy
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    numpy = None
+
+from ._AutomationMod import WinRect
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Найденное совпадение: Rect - WinRect в экранных координатах, Score - степень совпадения от -1 до 1.
+TemplateMatch = namedtuple('TemplateMatch', 'Rect, Score')
+#: Сколько подготовленных шаблонов хранить для шаблонов, переданных массивами (см. PrepareTemplate).
+TemplateCacheSize = 64
+#: Наименьшая сторона шаблона на самом грубом уровне пирамиды.
+PyramidMinSize = 12
+#: Наибольшее число уровней пирамиды (считая исходный).
+PyramidMaxLevels = 4
+#: На сколько ниже порога может быть совпадение на каждом уровне пирамиды выше исходного, чтобы его проверили
+#: на следующем уровне: на уменьшенных изображениях оценки менее точные.
+PyramidSlack = 0.15
+#: Наибольшее число кандидатов, переходящих с уровня на уровень (остаются лучшие).
+MaxCandidates = 512
+#: Сколько лучших положений грубых уровней проверяется дальше, даже если их оценка ниже порога: совпадение,
+#: не попадающее на сетку уменьшенного изображения (например, X = 50 на уровне с шагом 4), может получить там
+#: низкую оценку.
+PyramidKeep = 32
+#: Окна с дисперсией яркости меньше этой считаются однотонными.
+_FlatVariance = 1e-3
+
+
+#-------------------------------------------------------------------------------
+
+def _NeedNumpy(Name):
+    """
+        Внутренняя функция: выбросить ImportError, если numpy не установлен.
+    """
+    if numpy is None:
+        raise ImportError('Для {} нужен пакет numpy'.format(Name))
+
+
+def Grayscale(Image):
+    """
+        Яркость снимка: массив float32 формы (Height, Width). Снимок (Height, Width, 3) переводится по формуле
+        0.299 R + 0.587 G + 0.114 B, двумерный массив считается уже серым.
+    """
+    _NeedNumpy('Grayscale')
+    Image = numpy.asarray(Image)
+    if Image.ndim == 2:
+        return Image.astype(numpy.float32)
+    Image = Image.astype(numpy.float32)
+    return Image[..., 0] * 0.299 + Image[..., 1] * 0.587 + Image[..., 2] * 0.114
+
+
+def _Downsample(Gray):
+    """
+        Внутренняя функция: уменьшить изображение вдвое усреднением квадратов 2x2.
+    """
+    Height, Width = Gray.shape[0] // 2 * 2, Gray.shape[1] // 2 * 2
+    Gray = Gray[:Height, :Width]
+    return (Gray[0::2, 0::2] + Gray[1::2, 0::2] + Gray[0::2, 1::2] + Gray[1::2, 1::2]) * 0.25
+
+
+def IntegralImage(Gray):
+    """
+        Интегральное изображение (float64, на строку и столбец больше исходного): сумма по любому прямоугольнику
+        считается по четырем элементам.
+    """
+    _NeedNumpy('IntegralImage')
+    Res = numpy.zeros((Gray.shape[0] + 1, Gray.shape[1] + 1), dtype=numpy.float64)
+    numpy.cumsum(numpy.cumsum(Gray, axis=0, dtype=numpy.float64), axis=1, out=Res[1:, 1:])
+    return Res
+
+
+def _WindowSums(Integral, Height, Width):
+    """
+        Внутренняя функция: суммы по всем окнам Height x Width по интегральному изображению.
+    """
+    return Integral[Height:, Width:] - Integral[:-Height, Width:] - Integral[Height:, :-Width] + \
+        Integral[:-Height, :-Width]
+
+
+#-------------------------------------------------------------------------------
+
+class ImageTemplate:
+    """
+        Подготовленный для поиска шаблон: пирамида серых изображений, ядра с нулевым средним и их нормы, а также
+        спектры (FFT) ядер для каждого размера области поиска. Все это считается один раз на шаблон, поэтому
+        искать один и тот же шаблон много раз выгоднее через ImageTemplate (или через кэш PrepareTemplate).
+
+        Параметры конструктора:
+
+        * Image - шаблон: снимок (Height, Width, 3) uint8, например, из AutoItX.CaptureRegion, или серый
+        двумерный массив.
+        * Name=None - имя шаблона, для удобства.
+        * MaxLevels=PyramidMaxLevels - наибольшее число уровней пирамиды, 1 - искать без пирамиды.
+
+        Свойства:
+
+        * Image, Name - см. выше.
+        * Width, Height - размеры шаблона.
+        * Levels - список уровней пирамиды, на каждом кортеж (ядро с нулевым средним, норма ядра, средняя яркость).
+
+        Поиск идет по яркости, поэтому шаблоны, отличающиеся только цветом при той же яркости, неразличимы.
+    """
+
+    def __init__(self, Image, Name=None, MaxLevels=PyramidMaxLevels):
+        _NeedNumpy('ImageTemplate')
+        self.Image = Image
+        self.Name = Name
+        Gray = Grayscale(Image)
+        self.Height, self.Width = Gray.shape
+        if not self.Height or not self.Width:
+            raise ValueError('Пустой шаблон')
+        self.Levels = []
+        while True:
+            Mean = float(Gray.mean())
+            Kernel = Gray - numpy.float32(Mean)
+            self.Levels.append((Kernel, float(numpy.sqrt(numpy.square(Kernel, dtype=numpy.float64).sum())), Mean))
+            if len(self.Levels) >= MaxLevels or min(Gray.shape) // 2 < PyramidMinSize:
+                break
+            Gray = _Downsample(Gray)
+        #: {(уровень, форма области): спектр ядра}
+        self.__Spectra__ = dict()
+
+    #-------------------------------------------------------------------------------
+
+    def Spectrum(self, Level, Shape):
+        """
+            Сопряженный спектр ядра уровня Level для области поиска формы Shape (кэшируется).
+        """
+        Key = (Level, Shape)
+        Res = self.__Spectra__.get(Key)
+        if Res is None:
+            Res = self.__Spectra__[Key] = numpy.conj(numpy.fft.rfft2(self.Levels[Level][0], s=Shape))
+        return Res
+
+
+#: Кэш шаблонов, переданных массивами: {(форма, тип, байты): ImageTemplate}.
+_Templates = OrderedDict()
+_TemplatesLock = Lock()
+
+
+def PrepareTemplate(Template):
+    """
+        Получить ImageTemplate для шаблона: ImageTemplate возвращается как есть, для массива - берется из кэша
+        (по содержимому массива, последние TemplateCacheSize шаблонов) или создается.
+    """
+    if isinstance(Template, ImageTemplate):
+        return Template
+    _NeedNumpy('PrepareTemplate')
+    Template = numpy.ascontiguousarray(Template)
+    Key = (Template.shape, Template.dtype.str, Template.tobytes())
+    with _TemplatesLock:
+        Res = _Templates.get(Key)
+        if Res is not None:
+            _Templates.move_to_end(Key)
+            return Res
+    Res = ImageTemplate(Template)
+    with _TemplatesLock:
+        _Templates[Key] = Res
+        while len(_Templates) > TemplateCacheSize:
+            _Templates.popitem(last=False)
+    return Res
+
+
+#-------------------------------------------------------------------------------
+
+class _SearchImage:
+    """
+        Внутренний класс: пирамида области поиска с интегральными изображениями (сумм и сумм квадратов) и
+        спектрами уровней. Строится лениво и общая для всех шаблонов, которые ищутся в одном снимке.
+    """
+
+    def __init__(self, Image):
+        self.Levels = [Grayscale(Image)]
+        self.__Integrals__ = dict()
+        self.__Spectra__ = dict()
+
+    def Gray(self, Level):
+        while len(self.Levels) <= Level:
+            self.Levels.append(_Downsample(self.Levels[-1]))
+        return self.Levels[Level]
+
+    def Integrals(self, Level):
+        Res = self.__Integrals__.get(Level)
+        if Res is None:
+            Gray = self.Gray(Level)
+            Res = self.__Integrals__[Level] = (IntegralImage(Gray), IntegralImage(numpy.square(Gray)))
+        return Res
+
+    def Spectrum(self, Level):
+        Res = self.__Spectra__.get(Level)
+        if Res is None:
+            Res = self.__Spectra__[Level] = numpy.fft.rfft2(self.Gray(Level))
+        return Res
+
+
+def _Scores(Corr, Sum, SumSq, Count, Norm, Mean):
+    """
+        Внутренняя функция: нормированная корреляция по сумме произведений с ядром (Corr), сумме и сумме квадратов
+        яркости окон. Однотонные окна сразу отбрасываются (оценка -1), для однотонного шаблона оценка - близость
+        средней яркости и однотонности окна.
+    """
+    Variance = numpy.maximum(SumSq - Sum * Sum / Count, 0)
+    if Norm * Norm / Count < _FlatVariance:
+        return 1 - (numpy.abs(Sum / Count - Mean) + numpy.sqrt(Variance / Count)) / 255
+    Res = numpy.full(Variance.shape, -1.0)
+    Textured = Variance / Count >= _FlatVariance
+    Res[Textured] = Corr[Textured] / (numpy.sqrt(Variance[Textured]) * Norm)
+    return Res
+
+
+def _LocalMax(Scores):
+    """
+        Внутренняя функция: наибольшее значение в окрестности 3x3 каждого элемента.
+    """
+    Padded = numpy.pad(Scores, 1, constant_values=-numpy.inf)
+    Height, Width = Scores.shape
+    Res = Scores.copy()
+    for Y in range(3):
+        for X in range(3):
+            numpy.maximum(Res, Padded[Y:Y + Height, X:X + Width], out=Res)
+    return Res
+
+
+def _Best(Ys, Xs, Scores, Limit):
+    """
+        Внутренняя функция: оставить не больше Limit кандидатов с лучшими оценками.
+    """
+    if len(Scores) > Limit:
+        Keep = numpy.argpartition(-Scores, Limit)[:Limit]
+        return Ys[Keep], Xs[Keep], Scores[Keep]
+    return Ys, Xs, Scores
+
+
+def _Candidates(Ys, Xs, Scores, Threshold, Level):
+    """
+        Внутренняя функция: кандидаты для проверки на следующем уровне - прошедшие порог уровня, а на грубых
+        уровнях не меньше PyramidKeep лучших.
+    """
+    Keep = Scores >= Threshold - PyramidSlack * Level
+    if Level and numpy.count_nonzero(Keep) < PyramidKeep:
+        Keep = Scores > 0
+        return _Best(Ys[Keep], Xs[Keep], Scores[Keep], PyramidKeep)
+    return _Best(Ys[Keep], Xs[Keep], Scores[Keep], MaxCandidates)
+
+
+def _Match(Search, Template, Threshold):
+    """
+        Внутренняя функция: поиск шаблона в области, возвращает массивы (Ys, Xs, оценки) положений на исходном
+        уровне с оценкой не ниже Threshold.
+    """
+    Top = len(Template.Levels) - 1
+    while Top > 0 and any(S < T for S, T in zip(Search.Gray(Top).shape, Template.Levels[Top][0].shape)):
+        Top -= 1
+    Gray = Search.Gray(Top)
+    Kernel, Norm, Mean = Template.Levels[Top]
+    Height, Width = Kernel.shape
+    if Gray.shape[0] < Height or Gray.shape[1] < Width:
+        Empty = numpy.zeros(0, dtype=numpy.intp)
+        return Empty, Empty, numpy.zeros(0)
+    #Грубый уровень - по всем положениям сразу, корреляция через FFT.
+    Corr = numpy.fft.irfft2(Search.Spectrum(Top) * Template.Spectrum(Top, Gray.shape), s=Gray.shape)
+    Corr = Corr[:Gray.shape[0] - Height + 1, :Gray.shape[1] - Width + 1]
+    Integral, IntegralSq = Search.Integrals(Top)
+    Scores = _Scores(Corr, _WindowSums(Integral, Height, Width), _WindowSums(IntegralSq, Height, Width),
+                     Height * Width, Norm, Mean)
+    #Соседи совпадения тоже получают высокие оценки, дальше идут только локальные максимумы.
+    Ys, Xs = numpy.nonzero(Scores >= _LocalMax(Scores))
+    Ys, Xs, Scores = _Candidates(Ys, Xs, Scores[Ys, Xs], Threshold, Top)
+    #Точные уровни - только окрестности кандидатов с предыдущего уровня, от каждого остается лучшее положение.
+    ShiftY, ShiftX = (Shift.ravel() for Shift in numpy.mgrid[-1:3, -1:3])
+    for Level in range(Top - 1, -1, -1):
+        if not len(Ys):
+            break
+        Gray = Search.Gray(Level)
+        Kernel, Norm, Mean = Template.Levels[Level]
+        Height, Width = Kernel.shape
+        Count = Height * Width
+        Ys = numpy.clip(Ys[:, None] * 2 + ShiftY, 0, Gray.shape[0] - Height)
+        Xs = numpy.clip(Xs[:, None] * 2 + ShiftX, 0, Gray.shape[1] - Width)
+        #Кандидатов мало, поэтому суммы считаются прямо по их окнам, без интегральных изображений всего уровня.
+        Windows = sliding_window_view(Gray, (Height, Width))[Ys.ravel(), Xs.ravel()]
+        Sum = Windows.sum(axis=(1, 2), dtype=numpy.float64)
+        SumSq = numpy.einsum('nij,nij->n', Windows, Windows, dtype=numpy.float64)
+        Scores = numpy.full(len(Sum), -1.0)
+        #Однотонные окна отбрасываются до вычисления корреляции (если сам шаблон не однотонный).
+        if Norm * Norm / Count >= _FlatVariance:
+            Textured = numpy.nonzero((SumSq - Sum * Sum / Count) / Count >= _FlatVariance)[0]
+        else:
+            Textured = numpy.arange(len(Sum))
+        Corr = numpy.einsum('nij,ij->n', Windows[Textured], Kernel, dtype=numpy.float64)
+        Scores[Textured] = _Scores(Corr, Sum[Textured], SumSq[Textured], Count, Norm, Mean)
+        Scores = Scores.reshape(Ys.shape)
+        Rows, Best = numpy.arange(len(Ys)), Scores.argmax(axis=1)
+        Ys, Xs, Scores = Ys[Rows, Best], Xs[Rows, Best], Scores[Rows, Best]
+        #Соседние кандидаты могли прийти к одному положению.
+        _, Unique = numpy.unique(Ys * Gray.shape[1] + Xs, return_index=True)
+        Ys, Xs, Scores = _Candidates(Ys[Unique], Xs[Unique], Scores[Unique], Threshold, Level)
+    return Ys, Xs, Scores
+
+
+def _Suppress(Ys, Xs, Scores, Template, Left, Top, MaxMatches):
+    """
+        Внутренняя функция: из перекрывающихся больше чем наполовину совпадений оставить лучшие, результат -
+        список TemplateMatch по убыванию оценки.
+    """
+    Res = []
+    for Index in numpy.argsort(-Scores, kind='stable'):
+        Y, X = int(Ys[Index]), int(Xs[Index])
+        if any(abs(Y - Other.Rect.Y + Top) * 2 < Template.Height and abs(X - Other.Rect.X + Left) * 2 < Template.Width
+               for Other in Res):
+            continue
+        Res.append(TemplateMatch(WinRect(X + Left, Y + Top, Template.Width, Template.Height),
+                                 float(min(Scores[Index], 1.0))))
+        if MaxMatches is not None and len(Res) >= MaxMatches:
+            break
+    return Res
+
+
+#-------------------------------------------------------------------------------
+
+def FindTemplate(Image, Template, Threshold=0.9, Left=0, Top=0, MaxMatches=None, __Search__=None):
+    """
+        Поиск шаблона в снимке.
+
+        * Image - снимок (Height, Width, 3), например, из AutoItX.CaptureRegion.
+        * Template - шаблон: ImageTemplate или массив (см. PrepareTemplate).
+        * Threshold=0.9 - наименьшая степень совпадения (нормированная корреляция яркости, 1 - полное совпадение
+        с точностью до яркости и контраста).
+        * Left=0, Top=0 - экранные координаты левого верхнего угла снимка.
+        * MaxMatches=None - наибольшее число результатов, None - все.
+
+        Сначала все положения проверяются на самом грубом уровне пирамиды (через FFT), затем на каждом следующем
+        уровне уточняются только окрестности прошедших проверку, однотонные окна отбрасываются сразу.
+        Возвращает список TemplateMatch по убыванию оценки, перекрывающиеся больше чем наполовину совпадения
+        сводятся к лучшему.
+    """
+    _NeedNumpy('FindTemplate')
+    Template = PrepareTemplate(Template)
+    Search = __Search__ if __Search__ is not None else _SearchImage(Image)
+    Ys, Xs, Scores = _Match(Search, Template, Threshold)
+    return _Suppress(Ys, Xs, Scores, Template, Left, Top, MaxMatches)
+
+
+def FindTemplates(Image, Templates, Threshold=0.9, Left=0, Top=0, MaxMatches=None):
+    """
+        Поиск нескольких шаблонов в одном снимке: пирамида, интегральные изображения и спектры снимка считаются
+        один раз на все шаблоны.
+
+        * Templates - словарь {ключ: шаблон} или последовательность шаблонов (ключи - их номера).
+        * Остальное - см. FindTemplate.
+
+        Возвращает словарь {ключ: список TemplateMatch}.
+    """
+    _NeedNumpy('FindTemplates')
+    Search = _SearchImage(Image)
+    Items = Templates.items() if isinstance(Templates, dict) else enumerate(Templates)
+    return dict((Key, FindTemplate(Image, Template, Threshold, Left, Top, MaxMatches, Search))
+                for Key, Template in Items)
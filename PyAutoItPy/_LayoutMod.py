@@ -0,0 +1,177 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Кэш геометрии окон и контролов для ControlMouseClick и подобных вызовов.
+"""
+
+# -------------------------------------------------------------------------------
+
+from threading import Lock
+from time import perf_counter
+
+from ._AutomationMod import WinPoint, WinHandle
+from ._SpecMod import CanonicalControlSpec, SpecError, SpecHandle, HandleNumber
+
+
+#-------------------------------------------------------------------------------
+
+def _Canonical(Func, Spec):
+    """
+        Внутренняя функция: канонический вид описания, а если оно ошибочно - оно само.
+    """
+    try:
+        return Func(Spec)
+    except SpecError:
+        return Spec
+
+
+#-------------------------------------------------------------------------------
+
+class LayoutCache:
+    """
+        Кэш координат клиентских областей окон и областей контролов внутри них.
+
+        Без кэша каждый AutoItX.ControlMouseClick делает около шести вызовов DLL (AU3_WinGetClientSize,
+        AU3_WinGetPos, AU3_ControlGetPos и проверки AU3_error), прежде чем нажать мышью. С подключенным кэшем
+        повторные нажатия на тот же контрол того же окна стоят двух вызовов - AU3_WinGetHandle и самого
+        AU3_MouseClick, а если окно задано строкой "[HANDLE:...]" - одного.
+
+        Записи хранятся по Handle окна и по описанию контрола внутри окна. Заголовок при каждом обращении заново
+        сводится к Handle, поэтому относительные описания ("[ACTIVE]", "[LAST]", начало заголовка, регулярные
+        выражения) берут геометрию того окна, на которое указывают сейчас. Записи окна удаляются (вместе с записями
+        его контролов), когда через тот же AutoItX вызываются WinMove, WinSetState, WinSetTitle, WinClose, WinKill,
+        ControlMove, а WinMinimizeAll и WinMinimizeAllUndo очищают кэш полностью. Изменения, сделанные мимо этого
+        AutoItX (пользователем или самой программой), кэш не видит, от них защищает время жизни TTL.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * TTL=1.0 - время жизни записи окна в секундах, None - без ограничения.
+        * Attach=True - подключить кэш к Automat (Automat.LayoutCache = self), чтобы ControlMouseClick его
+        использовал, а перечисленные выше методы сбрасывали.
+
+        Свойства:
+
+        * Hits - число попаданий в кэш.
+        * Misses - число промахов.
+    """
+
+    def __init__(self, Automat, TTL=1.0, Attach=True):
+        self.Automat = Automat
+        self.TTL = TTL
+        self.Hits = 0
+        self.Misses = 0
+        #: {Handle окна числом: [Handle, WinRect клиентской области, срок, {контрол: WinRect}]}
+        self.__Windows__ = dict()
+        self.__Lock__ = Lock()
+        if Attach:
+            Automat.LayoutCache = self
+
+    #-------------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.__Windows__)
+
+    #-------------------------------------------------------------------------------
+
+    def __Handle__(self, Title, Text):
+        """
+            Внутренний метод: Handle окна, на которое сейчас указывает заголовок, None - если окна нет.
+        """
+        Handle = SpecHandle(Title, Text)
+        return Handle if Handle is not None else self.Automat.WinGetHandle(Title, Text)
+
+    def __Window__(self, Title, Text):
+        """
+            Внутренний метод: запись окна, при необходимости заполняемая заново. None, если окна нет.
+        """
+        Handle = self.__Handle__(Title, Text)
+        if not Handle:
+            return None
+        Key = HandleNumber(Handle)
+        Entry = self.__Windows__.get(Key)
+        if Entry is not None and (Entry[2] is None or perf_counter() < Entry[2]):
+            return Entry
+        Client = self.Automat.WinGetClientRect(WinHandle(Handle))
+        with self.__Lock__:
+            if not Client:
+                self.__Windows__.pop(Key, None)
+                return None
+            Entry = [Handle, Client, perf_counter() + self.TTL if self.TTL is not None else None, dict()]
+            self.__Windows__[Key] = Entry
+        return Entry
+
+    #-------------------------------------------------------------------------------
+
+    def ClientRect(self, Title, Text=''):
+        """
+            Координаты клиентской области окна (как AutoItX.WinGetClientRect), из кэша, если возможно.
+        """
+        Entry = self.__Window__(Title, Text)
+        return Entry[1] if Entry is not None else None
+
+    def ControlRect(self, Title, Control, Text=''):
+        """
+            Область контрола внутри окна (как AutoItX.ControlGetPos), из кэша, если возможно.
+        """
+        Res = self.__Control__(Title, Control, Text)
+        return Res[1] if Res is not None else None
+
+    def ControlOrigin(self, Title, Control, Text=''):
+        """
+            Экранные координаты левого верхнего угла контрола (WinPoint), из кэша, если возможно.
+            Возвращает None, если окно или контрол не найдены.
+        """
+        Res = self.__Control__(Title, Control, Text)
+        if Res is None:
+            return None
+        Client, Rect = Res
+        return WinPoint(Client.X + Rect.X, Client.Y + Rect.Y)
+
+    def __Control__(self, Title, Control, Text):
+        """
+            Внутренний метод: пара (клиентская область окна, область контрола) или None.
+        """
+        Entry = self.__Window__(Title, Text)
+        if Entry is None:
+            self.Misses += 1
+            return None
+        ControlKey = _Canonical(CanonicalControlSpec, Control)
+        Rect = Entry[3].get(ControlKey)
+        if Rect is not None:
+            self.Hits += 1
+            return Entry[1], Rect
+        self.Misses += 1
+        Rect = self.Automat.ControlGetPos(WinHandle(Entry[0]), Control)
+        if Rect is None:
+            return None
+        Entry[3][ControlKey] = Rect
+        return Entry[1], Rect
+
+    #-------------------------------------------------------------------------------
+
+    def Forget(self, Title=None, Text=''):
+        """
+            Удалить записи окна (и его контролов).
+
+            * Title=None - Заголовок окна в формате AutoIt или строка "[HANDLE:...]". Удаляются записи окна,
+            на которое он сейчас указывает. Если None - кэш очищается полностью.
+            * Text='' - Текст, содержащийся в окне.
+        """
+        if Title is None:
+            with self.__Lock__:
+                self.__Windows__.clear()
+            return
+        if not self.__Windows__:
+            return
+        Handle = self.__Handle__(Title, Text)
+        if Handle:
+            with self.__Lock__:
+                self.__Windows__.pop(HandleNumber(Handle), None)
+
+    def ResetStats(self):
+        """
+            Обнулить счетчики Hits, Misses.
+        """
+        self.Hits = self.Misses = 0
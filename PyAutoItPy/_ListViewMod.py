@@ -0,0 +1,390 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Постраничное чтение строк ListView (SysListView32) через ControlListView.
+"""
+
+# -------------------------------------------------------------------------------
+
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, perf_counter
+
+from ._AutomationMod import WinHandle
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Число строк в странице по умолчанию.
+ListViewPageSize = 256
+#: Событие ListViewWatcher: Kind - 'INSERTED', 'REMOVED' или 'CHANGED', Row - номер строки, Cells - тексты ячеек.
+ListViewEvent = namedtuple('ListViewEvent', 'Kind, Row, Cells')
+
+
+#-------------------------------------------------------------------------------
+
+class ListViewReader:
+    """
+        Чтение строк ListView страницами, без построения всей таблицы в памяти.
+
+        Окно и контрол находятся один раз (по Handle), после чего каждая ячейка - один вызов AU3_ControlListView
+        "GetText" с выходным буфером из пула OutputBuffers, без проверок аргументов и разбора заголовка окна
+        на каждом вызове, как у AutoItX.ControlListView.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Title - Заголовок окна в формате AutoIt.
+        * Control - Идентификатор контрола в формате AutoIt.
+        * Text='' - Текст, содержащийся в окне.
+        * Columns=None - номера читаемых столбцов, None - все (по GetSubItemCount).
+        * PageSize=ListViewPageSize - число строк в странице.
+        * Prefetch=False - читать следующую страницу в фоновом потоке, пока обрабатывается текущая.
+
+        Свойства:
+
+        * Columns, PageSize, Prefetch - см. выше, можно менять между чтениями.
+        * Calls - число прочитанных ячеек за все время.
+
+        AutoItX не сообщает, какие строки ListView видны на экране (нет команды вроде GetTopIndex), поэтому
+        выбирать можно только диапазон номеров строк или выделенные строки.
+    """
+
+    def __init__(self, Automat, Title, Control, Text='', Columns=None, PageSize=ListViewPageSize, Prefetch=False):
+        self.Automat = Automat
+        self.Title = Title
+        self.Control = Control
+        self.Text = Text
+        self.Columns = Columns
+        self.PageSize = PageSize
+        self.Prefetch = Prefetch
+        self.Calls = 0
+        self.__Target__ = None
+
+    #-------------------------------------------------------------------------------
+
+    def Resolve(self):
+        """
+            Найти окно и контрол заново (например, после пересоздания окна). Возвращает True, если контрол найден.
+        """
+        Win = self.Automat.WinGetHandle(self.Title, self.Text)
+        Ctrl = self.Automat.ControlGetHandle(WinHandle(Win), self.Control) if Win else None
+        self.__Target__ = (WinHandle(Win), WinHandle(Ctrl)) if Ctrl else None
+        return self.__Target__ is not None
+
+    def __Command__(self, Command, Extra1='', Extra2=''):
+        """
+            Внутренний метод: команда ControlListView по найденным Handle, строка результата или None.
+        """
+        if self.__Target__ is None and not self.Resolve():
+            return None
+        Win, Ctrl = self.__Target__
+        return self.Automat.ControlListView(Win, Ctrl, Command, Extra1, Extra2)
+
+    def ItemCount(self):
+        """
+            Число строк, 0 - если контрол не найден.
+        """
+        return int(self.__Command__('GetItemCount') or 0)
+
+    def SubItemCount(self):
+        """
+            Число столбцов, 0 - если контрол не найден.
+        """
+        return int(self.__Command__('GetSubItemCount') or 0)
+
+    def SelectedRows(self):
+        """
+            Номера выделенных строк по возрастанию.
+        """
+        Res = self.__Command__('GetSelected', '1')
+        return sorted(int(Row) for Row in Res.split('|')) if Res else []
+
+    #-------------------------------------------------------------------------------
+
+    def __ColumnList__(self):
+        """
+            Внутренний метод: номера читаемых столбцов.
+        """
+        return self.Columns if self.Columns is not None else range(max(self.SubItemCount(), 1))
+
+    def ReadRows(self, Rows, Columns=None):
+        """
+            Прочитать строки.
+
+            * Rows - номера строк.
+            * Columns=None - номера столбцов, None - по свойству Columns.
+
+            Возвращает список кортежей текстов ячеек. Ячейки несуществующих строк и столбцов - пустые строки.
+        """
+        if self.__Target__ is None and not self.Resolve():
+            return []
+        #DLL принимает номера строкой, переводим их один раз на страницу, а не на каждую ячейку.
+        Columns = list(map(str, self.__ColumnList__() if Columns is None else Columns))
+        Win, Ctrl = self.__Target__
+        Func = self.Automat.__AutoItDLL__.AU3_ControlListView
+        ReadString = self.Automat.__ReadString__
+        Res = list(tuple(ReadString(Func, 65535, Win, '', Ctrl, 'GetText', Row, Column).value for Column in Columns)
+                   for Row in map(str, Rows))
+        self.Calls += len(Res) * len(Columns)
+        return Res
+
+    def Pages(self, First=0, Last=None, Selected=False, WithIndex=False):
+        """
+            Читать строки страницами.
+
+            * First=0, Last=None - номера первой и последней (включительно) строк, None - до конца списка.
+            * Selected=False - читать только выделенные строки (из диапазона First..Last).
+            * WithIndex=False - первым элементом каждого кортежа ставить номер строки.
+
+            Генератор, выдает списки кортежей текстов ячеек, по PageSize строк. Число строк и столбцов узнается
+            один раз, в начале чтения.
+        """
+        if self.__Target__ is None and not self.Resolve():
+            return
+        if Selected:
+            Rows = list(Row for Row in self.SelectedRows() if Row >= First and (Last is None or Row <= Last))
+        else:
+            Rows = range(First, (self.ItemCount() if Last is None else Last + 1))
+        Columns = self.__ColumnList__()
+        Size = max(self.PageSize, 1)
+        Chunks = list(Rows[Start:Start + Size] for Start in range(0, len(Rows), Size))
+        Pool = ThreadPoolExecutor(1) if self.Prefetch and len(Chunks) > 1 else None
+        Pending = None
+        try:
+            for N, Chunk in enumerate(Chunks):
+                Page = Pending.result() if Pending is not None else self.ReadRows(Chunk, Columns)
+                Pending = Pool.submit(self.ReadRows, Chunks[N + 1], Columns) \
+                    if Pool is not None and N + 1 < len(Chunks) else None
+                if WithIndex:
+                    Page = list((Row,) + Cells for Row, Cells in zip(Chunk, Page))
+                yield Page
+        finally:
+            if Pool is not None:
+                if Pending is not None:
+                    Pending.cancel()
+                Pool.shutdown(wait=False)
+
+    def Rows(self, First=0, Last=None, Selected=False, WithIndex=False):
+        """
+            Читать строки по одной (страницами под капотом, см. Pages).
+
+            Генератор, выдает кортежи текстов ячеек.
+        """
+        for Page in self.Pages(First, Last, Selected, WithIndex):
+            yield from Page
+
+    __iter__ = Rows
+
+
+#-------------------------------------------------------------------------------
+
+class ListViewWatcher:
+    """
+        Наблюдение за изменениями строк ListView без перечитывания всей таблицы.
+
+        Для каждой строки хранится отпечаток - хэш текстов пробных столбцов (ProbeColumns), все отпечатки лежат
+        в одном массиве array('q'), по 8 байт на строку. При каждом опросе (Poll):
+
+        * GetItemCount сообщает, изменилось ли число строк. Если да, место вставки или удаления ищется двоичным
+        поиском первого несовпадающего отпечатка (O(log N) чтений), добавление в конец и удаление с конца
+        проверяются одним чтением. Если найденное место не подтверждается (одновременно изменилось много строк),
+        строки сравниваются по позициям, а лишние или недостающие считаются добавленными или удаленными в конце.
+        * Пробные столбцы читаются у очередной порции из ScanRows строк (по кругу), строки с изменившимся
+        отпечатком считаются измененными.
+        * Полностью (столбцы Columns) читаются только добавленные и измененные строки.
+
+        Так опрос списка на 100 тысяч строк стоит порядка ScanRows + log N чтений ячеек, но изменение строки
+        замечается не сразу, а когда до нее дойдет круг (за N / ScanRows опросов), и только если оно затронуло
+        пробные столбцы. ScanRows=None - проверять все строки при каждом опросе.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Title - Заголовок окна в формате AutoIt.
+        * Control - Идентификатор контрола в формате AutoIt.
+        * Text='' - Текст, содержащийся в окне.
+        * ProbeColumns=(0,) - номера пробных столбцов.
+        * Columns=None - номера столбцов, выдаваемых в событиях, None - все.
+        * ScanRows=1024 - сколько строк проверять за опрос, None - все.
+        * ReportInitial=False - выдать при первом опросе все строки как добавленные (иначе первый опрос только
+        запоминает отпечатки и возвращает пустой список).
+
+        Свойства:
+
+        * Count - число строк по последнему опросу.
+        * Calls - число прочитанных ячеек за все время.
+        * Reader - ListViewReader, через который идет чтение.
+    """
+
+    def __init__(self, Automat, Title, Control, Text='', ProbeColumns=(0,), Columns=None, ScanRows=1024,
+                 ReportInitial=False):
+        self.Reader = ListViewReader(Automat, Title, Control, Text, Columns)
+        self.ProbeColumns = tuple(ProbeColumns)
+        self.ScanRows = ScanRows
+        self.ReportInitial = ReportInitial
+        self.__Prints__ = None
+        self.__Cursor__ = 0
+
+    #-------------------------------------------------------------------------------
+
+    @property
+    def Count(self):
+        return len(self.__Prints__) if self.__Prints__ is not None else 0
+
+    @property
+    def Calls(self):
+        return self.Reader.Calls
+
+    def Reset(self):
+        """
+            Забыть отпечатки: следующий опрос начнет наблюдение заново.
+        """
+        self.__Prints__ = None
+        self.__Cursor__ = 0
+
+    #-------------------------------------------------------------------------------
+
+    def __Probe__(self, Rows):
+        """
+            Внутренний метод: отпечатки строк Rows.
+        """
+        return list(hash(Cells) for Cells in self.Reader.ReadRows(Rows, self.ProbeColumns))
+
+    def __ItemCount__(self):
+        """
+            Внутренний метод: число строк, с повторным поиском контрола, если он пересоздан.
+        """
+        Count = self.Reader.ItemCount()
+        if self.Reader.Automat.Error():
+            self.Reader.Resolve()
+            Count = self.Reader.ItemCount()
+        return Count
+
+    def __FirstMismatch__(self, Prints, Size, Probe):
+        """
+            Внутренний метод: номер первой строки из первых Size, отпечаток которой не совпадает с запомненным,
+            или Size, если совпадают все. Сначала проверяется последняя строка (частый случай - изменения в конце),
+            затем двоичный поиск.
+        """
+        if Size == 0 or Probe(Size - 1) == Prints[Size - 1]:
+            return Size
+        Low, High = 0, Size - 1
+        while Low < High:
+            Middle = (Low + High) // 2
+            if Probe(Middle) == Prints[Middle]:
+                Low = Middle + 1
+            else:
+                High = Middle
+        return Low
+
+    def __Shift__(self, Prints, Count, Probe):
+        """
+            Внутренний метод: найти вставку или удаление строк и сдвинуть отпечатки.
+            Возвращает пару (номера добавленных строк, номера удаленных строк в старой нумерации) и признак
+            того, что место не подтвердилось и строки надо сравнить по позициям.
+        """
+        Old = len(Prints)
+        Delta = Count - Old
+        if Delta > 0:
+            At = self.__FirstMismatch__(Prints, Old, Probe)
+            if At == Old or Probe(At + Delta) == Prints[At]:
+                Prints[At:At] = array('q', bytes(8 * Delta))
+                return range(At, At + Delta), range(0), False
+            Prints.extend(array('q', bytes(8 * Delta)))
+            return range(Old, Count), range(0), True
+        At = self.__FirstMismatch__(Prints, Count, Probe)
+        if At == Count or Probe(At) == Prints[At - Delta]:
+            del Prints[At:At - Delta]
+            return range(0), range(At, At - Delta), False
+        del Prints[Count:]
+        return range(0), range(Count, Old), True
+
+    def Poll(self):
+        """
+            Опросить ListView.
+
+            Возвращает список событий ListViewEvent: сначала удаленные строки (Row - номер до удаления, Cells -
+            None) по убыванию номеров, затем добавленные и измененные (Row - текущий номер, Cells - кортеж текстов
+            столбцов Columns) по возрастанию номеров.
+        """
+        Count = self.__ItemCount__()
+        Prints = self.__Prints__
+        if Prints is None:
+            Prints = self.__Prints__ = array('q', bytes(8 * Count))
+            Rows = range(Count)
+            for Start in range(0, Count, ListViewPageSize):
+                Chunk = Rows[Start:Start + ListViewPageSize]
+                Prints[Start:Start + len(Chunk)] = array('q', self.__Probe__(Chunk))
+            if not self.ReportInitial:
+                return []
+            return self.__Events__([], Rows, Prints, dict())
+        #{номер строки: отпечаток}, прочитанные в этом опросе.
+        Known = dict()
+
+        def Probe(Row):
+            Res = Known.get(Row)
+            if Res is None:
+                Res = Known[Row] = self.__Probe__((Row,))[0]
+            return Res
+
+        #Отпечатки в Known прочитаны уже в новой нумерации строк, как и Prints после сдвига, поэтому годятся и дальше.
+        Inserted, Removed, Resync = self.__Shift__(Prints, Count, Probe) if Count != len(Prints) else \
+            (range(0), range(0), False)
+        New = set(Inserted)
+        if Resync or self.ScanRows is None or self.ScanRows >= Count:
+            Scan = range(Count)
+        else:
+            Start = self.__Cursor__ % Count
+            Scan = list(range(Start, min(Start + self.ScanRows, Count)))
+            Scan.extend(range(0, self.ScanRows - len(Scan)))
+            self.__Cursor__ = (Start + self.ScanRows) % Count
+        Scan = list(Row for Row in Scan if Row not in New)
+        Missing = list(Row for Row in Scan if Row not in Known)
+        for Start in range(0, len(Missing), ListViewPageSize):
+            Chunk = Missing[Start:Start + ListViewPageSize]
+            Known.update(zip(Chunk, self.__Probe__(Chunk)))
+        Changed = list(Row for Row in Scan if Known[Row] != Prints[Row])
+        return self.__Events__(Removed, sorted(New.union(Changed)), Prints, Known, New)
+
+    def __Events__(self, Removed, Rows, Prints, Known, New=None):
+        """
+            Внутренний метод: события по удаленным строкам и полное чтение добавленных и измененных строк.
+        """
+        Events = list(ListViewEvent('REMOVED', Row, None) for Row in reversed(Removed))
+        Reader = self.Reader
+        Columns = list(Reader.Columns if Reader.Columns is not None else range(max(Reader.SubItemCount(), 1)))
+        #Если пробные столбцы читаются и так, отпечаток считается по прочитанной строке, без лишних чтений.
+        Positions = list(Columns.index(Column) for Column in self.ProbeColumns) \
+            if all(Column in Columns for Column in self.ProbeColumns) else None
+        for Start in range(0, len(Rows), ListViewPageSize):
+            Chunk = Rows[Start:Start + ListViewPageSize]
+            Page = Reader.ReadRows(Chunk, Columns)
+            if Positions is None:
+                Missing = list(Row for Row in Chunk if Row not in Known)
+                Known.update(zip(Missing, self.__Probe__(Missing)))
+            for Row, Cells in zip(Chunk, Page):
+                Print = Known.get(Row) if Positions is None else hash(tuple(Cells[Index] for Index in Positions))
+                Prints[Row] = Print
+                Kind = 'INSERTED' if New is None or Row in New else 'CHANGED'
+                Events.append(ListViewEvent(Kind, Row, Cells))
+        return Events
+
+    #-------------------------------------------------------------------------------
+
+    def Watch(self, Interval=0.5, Timeout=None):
+        """
+            Следить за ListView: опрашивать каждые Interval секунд и выдавать изменения.
+
+            * Interval=0.5 - пауза между опросами в секундах.
+            * Timeout=None - сколько секунд следить, None - без ограничения.
+
+            Генератор, выдает непустые списки событий ListViewEvent, по одному на опрос.
+        """
+        End = perf_counter() + Timeout if Timeout is not None else None
+        while End is None or perf_counter() < End:
+            Events = self.Poll()
+            if Events:
+                yield Events
+            sleep(Interval)
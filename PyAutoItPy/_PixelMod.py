@@ -0,0 +1,195 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Векторный поиск цветов в снимках области экрана (AutoItX.CaptureRegion), требует numpy.
+"""
+
+# -------------------------------------------------------------------------------
+
+from numbers import Integral
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ._AutomationMod import WinPoint
+
+
+#-------------------------------------------------------------------------------
+
+def _NeedNumpy(Name):
+    """
+        Внутренняя функция: выбросить ImportError, если numpy не установлен.
+    """
+    if numpy is None:
+        raise ImportError('Для {} нужен пакет numpy'.format(Name))
+
+
+def _Channels(Color):
+    """
+        Внутренняя функция: цвет 0xRRGGBB или тройка (R, G, B) в виде тройки чисел.
+        Целым считается и скаляр numpy (например, элемент массива PackColors или PixelGetColors).
+    """
+    if isinstance(Color, Integral):
+        Color = int(Color)
+        return (Color >> 16) & 0xFF, (Color >> 8) & 0xFF, Color & 0xFF
+    R, G, B = Color
+    return R, G, B
+
+
+def _Tolerance(Var):
+    """
+        Внутренняя функция: допуск - одно число на все каналы или тройка (по R, G, B) - в виде тройки чисел.
+    """
+    if isinstance(Var, Integral):
+        Var = int(Var)
+        return Var, Var, Var
+    R, G, B = Var
+    return R, G, B
+
+
+#-------------------------------------------------------------------------------
+
+def ImageFromBytes(Width, Height, Data):
+    """
+        Массив numpy формы (Height, Width, 3), uint8, из байт RGB, записанных построчно (без копирования, если
+        Data - bytearray, массив доступен для записи).
+    """
+    _NeedNumpy('ImageFromBytes')
+    return numpy.frombuffer(Data, dtype=numpy.uint8).reshape(Height, Width, 3)
+
+
+def PackColors(Image):
+    """
+        Снимок (Height, Width, 3) в виде массива (Height, Width) чисел uint32 в формате 0xRRGGBB, как возвращает
+        PixelGetColor.
+    """
+    _NeedNumpy('PackColors')
+    Image = numpy.asarray(Image, dtype=numpy.uint8)
+    return (Image[..., 0].astype(numpy.uint32) << 16) | (Image[..., 1].astype(numpy.uint32) << 8) | Image[..., 2]
+
+
+def UnpackColors(Colors):
+    """
+        Массив цветов 0xRRGGBB в виде массива (..., 3) uint8 с каналами R, G, B (обратное к PackColors).
+    """
+    _NeedNumpy('UnpackColors')
+    Colors = numpy.asarray(Colors)
+    return numpy.stack(((Colors >> 16) & 0xFF, (Colors >> 8) & 0xFF, Colors & 0xFF), axis=-1).astype(numpy.uint8)
+
+
+def PointArrays(Points):
+    """
+        Координаты точек в виде двух массивов int64 (Xs, Ys).
+
+        * Points - массив формы (N, 2) или последовательность пар (X, Y) / WinPoint.
+    """
+    _NeedNumpy('PointArrays')
+    Points = numpy.asarray(Points, dtype=numpy.int64).reshape(-1, 2)
+    return Points[:, 0], Points[:, 1]
+
+
+#-------------------------------------------------------------------------------
+
+def ColorMask(Image, Color, Var=0):
+    """
+        Маска совпадений цвета: массив bool формы (Height, Width), True там, где цвет пиксела отличается от Color
+        не больше чем на Var по каждому каналу (как в PixelSearch).
+
+        * Image - снимок формы (Height, Width, 3), uint8.
+        * Color - цвет 0xRRGGBB или тройка (R, G, B).
+        * Var=0 - допуск: одно число на все каналы или тройка (по R, G, B).
+    """
+    _NeedNumpy('ColorMask')
+    return _Mask(_Planes(Image), Color, Var)
+
+
+def _Planes(Image):
+    """
+        Внутренняя функция: каналы снимка по отдельности и (лениво) упакованные цвета, чтобы при поиске
+        нескольких цветов не разбирать снимок заново. Сравнение отдельных каналов с числами намного быстрее,
+        чем сравнение массива (Height, Width, 3) с тройкой.
+    """
+    Image = numpy.asarray(Image, dtype=numpy.uint8)
+    return [Image, Image[..., 0], Image[..., 1], Image[..., 2], None]
+
+
+def _Mask(Planes, Color, Var):
+    """
+        Внутренняя функция: ColorMask по результату _Planes.
+    """
+    Channels = _Channels(Color)
+    Tolerance = _Tolerance(Var)
+    if not any(Tolerance):
+        #Точное совпадение - одно сравнение упакованных цветов.
+        if Planes[4] is None:
+            Planes[4] = PackColors(Planes[0])
+        return Planes[4] == ((Channels[0] << 16) | (Channels[1] << 8) | Channels[2])
+    Mask = None
+    for Plane, C, V in zip(Planes[1:4], Channels, Tolerance):
+        Low, High = max(C - V, 0), min(C + V, 255)
+        if Low == 0 and High == 255:
+            continue
+        Part = (Plane >= Low) & (Plane <= High) if Low > 0 and High < 255 else \
+            (Plane <= High if Low == 0 else Plane >= Low)
+        Mask = Part if Mask is None else Mask & Part
+    return Mask if Mask is not None else numpy.ones(Planes[1].shape, dtype=bool)
+
+
+def FindColor(Image, Color, Var=0, Left=0, Top=0):
+    """
+        Все пикселы снимка, подходящие под цвет Color с допуском Var (см. ColorMask).
+
+        * Left=0, Top=0 - экранные координаты левого верхнего угла снимка, прибавляются к результату.
+
+        Возвращает массив формы (N, 2) с координатами (X, Y), построчно сверху вниз и слева направо (в том же
+        порядке, в каком ищет PixelSearch).
+    """
+    _NeedNumpy('FindColor')
+    return _Points(_Mask(_Planes(Image), Color, Var), Left, Top)
+
+
+def _Points(Mask, Left, Top):
+    """
+        Внутренняя функция: координаты (X, Y) элементов маски, равных True, в виде массива (N, 2).
+    """
+    Ys, Xs = numpy.nonzero(Mask)
+    return numpy.column_stack((Xs + Left, Ys + Top))
+
+
+def FindColors(Image, Colors, Var=0, Left=0, Top=0):
+    """
+        Поиск нескольких цветов по одному снимку.
+
+        * Colors - последовательность цветов (0xRRGGBB или тройки) или словарь {цвет: допуск} для своего допуска у
+        каждого цвета.
+        * Var=0 - допуск для цветов, у которых он не задан словарем (число или тройка по каналам).
+        * Left=0, Top=0 - экранные координаты левого верхнего угла снимка.
+
+        Возвращает словарь {цвет: массив (N, 2) координат (X, Y)}, см. FindColor.
+    """
+    _NeedNumpy('FindColors')
+    Planes = _Planes(Image)
+    Items = Colors.items() if isinstance(Colors, dict) else ((Color, Var) for Color in Colors)
+    return dict((int(Color) if isinstance(Color, Integral) else tuple(Color),
+                 _Points(_Mask(Planes, Color, ColorVar), Left, Top)) for Color, ColorVar in Items)
+
+
+def NearestColor(Image, Color, X, Y, Var=0, Left=0, Top=0):
+    """
+        Ближайший к точке (X, Y) пиксел снимка, подходящий под цвет Color с допуском Var.
+
+        * X, Y - экранные координаты точки.
+        * Left=0, Top=0 - экранные координаты левого верхнего угла снимка.
+
+        Возвращает WinPoint с экранными координатами или None, если подходящих пикселов нет.
+    """
+    Ys, Xs = numpy.nonzero(ColorMask(Image, Color, Var))
+    if not len(Xs):
+        return None
+    Dx = Xs.astype(numpy.int64) + (Left - X)
+    Dy = Ys.astype(numpy.int64) + (Top - Y)
+    Index = int(numpy.argmin(Dx * Dx + Dy * Dy))
+    return WinPoint(int(Xs[Index]) + Left, int(Ys[Index]) + Top)
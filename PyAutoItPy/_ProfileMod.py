@@ -0,0 +1,293 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Профилирование вызовов AutoItX и функций DLL.
+"""
+
+# -------------------------------------------------------------------------------
+
+import json
+from collections import namedtuple
+from functools import wraps
+from threading import local, Lock
+from time import perf_counter_ns
+from weakref import WeakKeyDictionary
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Статистика по одной функции (CallProfiler.Stats):
+#: Count - число вызовов; Total, Mean, P50, P99 - суммарное, среднее время и 50-й и 99-й процентили в секундах;
+#: Errors - сколько вызовов завершилось с AU3_error() != 0, ErrorRate - их доля. Считаются только для методов
+#: AutoItX, чья функция DLL выставляет признак ошибки (AutoItCall с SetsError=True), у остальных методов и у
+#: функций бэкендов (AU3_* и др.) признак ошибки не проверяется, там Errors и ErrorRate равны None;
+#: BufferBytes - сколько байт выходных буферов было выделено во время вызовов (только для методов AutoItX).
+CallStats = namedtuple('CallStats', 'Count, Total, Mean, P50, P99, Errors, ErrorRate, BufferBytes')
+
+#: Признак отсутствия атрибута в словаре экземпляра.
+_Missing = object()
+
+
+#-------------------------------------------------------------------------------
+
+def _Bucket(Ns):
+    """
+        Номер корзины гистограммы для времени Ns наносекунд: по 4 корзины на каждую степень двойки.
+    """
+    if Ns < 8:
+        return Ns
+    Bits = Ns.bit_length()
+    return Bits * 4 + ((Ns >> (Bits - 3)) & 3)
+
+
+def _BucketTop(Bucket):
+    """
+        Верхняя граница корзины гистограммы в наносекундах.
+    """
+    if Bucket < 8:
+        return Bucket
+    Bits, Sub = divmod(Bucket, 4)
+    return (5 + Sub) << (Bits - 3)
+
+
+#-------------------------------------------------------------------------------
+
+class CallProfiler:
+    """
+        Профилировщик вызовов: методов AutoItX (объявленных через AutoItCall) и функций бэкендов (AU3_*, а также
+        функций любых CustomWinDLL).
+
+        Для каждой функции собирается число вызовов, суммарное время, гистограмма времени (по ней считаются p50 и
+        p99 с точностью до ширины корзины, около 25%), для методов AutoItX - число ошибок по AU3_error (только
+        у методов, функция DLL которых выставляет этот признак) и объем выделенных выходных буферов. Для функций
+        бэкендов ошибки не считаются: лишний вызов AU3_error после каждой из них исказил бы замеры, а многие
+        функции признак ошибки не выставляют вовсе.
+
+        Включается и выключается на ходу. При включении методы классов и функции бэкендов подменяются
+        обертками, при выключении возвращаются исходные, поэтому в выключенном состоянии накладных расходов нет.
+
+        Используется общий экземпляр Profiler:
+            Profiler.Enable()
+            ...
+            print(Profiler.Report())
+            Profiler.Dump('profile.json')
+    """
+
+    def __init__(self):
+        self.Enabled = False
+        #: {имя: [число вызовов, суммарное время нс, ошибки, байты буферов, {корзина: число}, проверок ошибки]}
+        self.Records = dict()
+        self.__Lock__ = Lock()
+        self.__Current__ = local()
+        self.__Classes__ = list()
+        self.__Backends__ = WeakKeyDictionary()
+        self.__SavedMethods__ = list()
+        self.__SavedFunctions__ = WeakKeyDictionary()
+
+    #-------------------------------------------------------------------------------
+    # Регистрация того, что можно профилировать.
+
+    def AddClass(self, Class, Prefix=None):
+        """
+            Зарегистрировать класс, методы которого, объявленные через AutoItCall, будут профилироваться.
+            Prefix - префикс имен в статистике, по умолчанию имя класса.
+        """
+        self.__Classes__.append((Class, Prefix or Class.__name__))
+        if self.Enabled:
+            self.__WrapClass__(Class, Prefix or Class.__name__)
+
+    def Register(self, Backend, Names):
+        """
+            Зарегистрировать бэкенд (или CustomWinDLL), функции которого с именами Names будут профилироваться.
+            Бэкенд хранится по слабой ссылке.
+        """
+        Known = self.__Backends__.get(Backend, ())
+        New = tuple(Name for Name in Names if Name not in Known)
+        self.__Backends__[Backend] = Known + New
+        if self.Enabled and New:
+            self.__WrapBackend__(Backend, New)
+
+    #-------------------------------------------------------------------------------
+
+    def Enable(self):
+        """
+            Включить профилирование.
+        """
+        with self.__Lock__:
+            if self.Enabled:
+                return
+            self.Enabled = True
+        for Class, Prefix in self.__Classes__:
+            self.__WrapClass__(Class, Prefix)
+        for Backend, Names in list(self.__Backends__.items()):
+            self.__WrapBackend__(Backend, Names)
+
+    def Disable(self):
+        """
+            Выключить профилирование и вернуть исходные методы и функции. Собранная статистика сохраняется.
+        """
+        with self.__Lock__:
+            if not self.Enabled:
+                return
+            self.Enabled = False
+        for Class, Name, Method in reversed(self.__SavedMethods__):
+            setattr(Class, Name, Method)
+        self.__SavedMethods__.clear()
+        for Backend, Saved in list(self.__SavedFunctions__.items()):
+            for Name, (Value, Func) in Saved.items():
+                if Value is _Missing:
+                    vars(Backend).pop(Name, None)
+                else:
+                    setattr(Backend, Name, Value)
+        self.__SavedFunctions__.clear()
+
+    def Reset(self):
+        """
+            Очистить собранную статистику.
+        """
+        with self.__Lock__:
+            self.Records.clear()
+
+    #-------------------------------------------------------------------------------
+
+    def __Record__(self, Name, Ns, Error=None, Bytes=0):
+        """
+            Внутренний метод: учесть один вызов. Error=None - признак ошибки не проверялся.
+        """
+        with self.__Lock__:
+            Rec = self.Records.get(Name)
+            if Rec is None:
+                Rec = self.Records[Name] = [0, 0, 0, 0, dict(), 0]
+            Rec[0] += 1
+            Rec[1] += Ns
+            if Error is not None:
+                Rec[2] += 1 if Error else 0
+                Rec[5] += 1
+            Rec[3] += Bytes
+            Bucket = _Bucket(Ns)
+            Rec[4][Bucket] = Rec[4].get(Bucket, 0) + 1
+
+    def Buffer(self, Bytes):
+        """
+            Учесть выделение выходного буфера размером Bytes байт в текущем профилируемом методе.
+            Вызывается пулом буферов (BufferPool), только когда профилирование включено.
+        """
+        Current = self.__Current__
+        Current.Bytes = getattr(Current, 'Bytes', 0) + Bytes
+
+    #-------------------------------------------------------------------------------
+
+    def __WrapClass__(self, Class, Prefix):
+        """
+            Внутренний метод: подменить методы класса, объявленные через AutoItCall, профилирующими обертками.
+        """
+        Record = self.__Record__
+        Current = self.__Current__
+        Saved = self.__SavedFunctions__
+        for Name, Method in list(vars(Class).items()):
+            if not callable(Method) or not hasattr(Method, '__AutoItMode__'):
+                continue
+            FullName = '{}.{}'.format(Prefix, Name)
+            SetsError = getattr(Method, '__AutoItSetsError__', True)
+
+            def Profiled(self, *arg, __Method__=Method, __Name__=FullName, __SetsError__=SetsError, **kwarg):
+                Outer = getattr(Current, 'Bytes', 0)
+                Current.Bytes = 0
+                Start = perf_counter_ns()
+                try:
+                    return __Method__(self, *arg, **kwarg)
+                finally:
+                    Ns = perf_counter_ns() - Start
+                    Error = None
+                    if __SetsError__:
+                        Backend = self.__AutoItDLL__
+                        #Исходная AU3_error, чтобы проверка ошибки не попадала в статистику самой AU3_error.
+                        Error = Saved.get(Backend, {}).get('AU3_error', (None, Backend.AU3_error))[1]()
+                    Bytes = Current.Bytes
+                    Current.Bytes = Outer + Bytes
+                    Record(__Name__, Ns, Error, Bytes)
+
+            self.__SavedMethods__.append((Class, Name, Method))
+            setattr(Class, Name, wraps(Method)(Profiled))
+
+    def __WrapBackend__(self, Backend, Names):
+        """
+            Внутренний метод: подменить функции бэкенда профилирующими обертками.
+        """
+        Record = self.__Record__
+        Saved = self.__SavedFunctions__.setdefault(Backend, dict())
+        for Name in Names:
+            if Name in Saved:
+                continue
+            try:
+                Func = getattr(Backend, Name)
+            except AttributeError:
+                continue
+
+            def Profiled(*arg, __Func__=Func, __Name__=Name):
+                Start = perf_counter_ns()
+                try:
+                    return __Func__(*arg)
+                finally:
+                    Record(__Name__, perf_counter_ns() - Start)
+
+            Saved[Name] = (vars(Backend).get(Name, _Missing), Func)
+            setattr(Backend, Name, Profiled)
+
+    #-------------------------------------------------------------------------------
+    # Чтение результатов.
+
+    def Stats(self):
+        """
+            Получить статистику: словарь {имя функции: CallStats}, время в секундах.
+            Имена методов - вида "AutoItX.WinGetText", функций бэкендов - вида "AU3_WinGetText".
+        """
+        with self.__Lock__:
+            Records = dict((Name, (Rec[0], Rec[1], Rec[2], Rec[3], dict(Rec[4]), Rec[5]))
+                           for Name, Rec in self.Records.items())
+        Res = dict()
+        for Name, (Count, Total, Errors, Bytes, Hist, Checked) in Records.items():
+            P50 = P99 = 0
+            Seen = 0
+            for Bucket in sorted(Hist):
+                Seen += Hist[Bucket]
+                if not P50 and Seen >= Count * 0.5:
+                    P50 = _BucketTop(Bucket)
+                if Seen >= Count * 0.99:
+                    P99 = _BucketTop(Bucket)
+                    break
+            Res[Name] = CallStats(Count, Total / 1e9, Total / Count / 1e9, P50 / 1e9, P99 / 1e9,
+                                  Errors if Checked else None, Errors / Checked if Checked else None, Bytes)
+        return Res
+
+    def Report(self, Top=20):
+        """
+            Текстовая таблица Top самых затратных (по суммарному времени) функций.
+        """
+        Lines = ['{:<36} {:>9} {:>10} {:>10} {:>10} {:>10} {:>7} {:>10}'.format(
+            'Функция', 'Вызовов', 'Всего, мс', 'Сред., мкс', 'p50, мкс', 'p99, мкс', 'Ошибок', 'Буферы, Б')]
+        Stats = sorted(self.Stats().items(), key=lambda Item: Item[1].Total, reverse=True)
+        for Name, S in Stats[:Top]:
+            ErrorRate = '{:.1%}'.format(S.ErrorRate) if S.ErrorRate is not None else '-'
+            Lines.append('{:<36} {:>9} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f} {:>7} {:>10}'.format(
+                Name, S.Count, S.Total * 1e3, S.Mean * 1e6, S.P50 * 1e6, S.P99 * 1e6, ErrorRate, S.BufferBytes))
+        return '\n'.join(Lines)
+
+    def Dump(self, File=None):
+        """
+            Статистика в формате JSON: {имя функции: {поля CallStats}}.
+            Если задан File (путь или открытый файл) - записывает в него. Возвращает строку JSON.
+        """
+        Res = json.dumps(dict((Name, S._asdict()) for Name, S in sorted(self.Stats().items())),
+                         indent=2, ensure_ascii=False)
+        if File is not None:
+            if hasattr(File, 'write'):
+                File.write(Res)
+            else:
+                with open(File, 'w', encoding='utf-8') as Out:
+                    Out.write(Res)
+        return Res
+
+
+#: Общий профилировщик, к нему подключаются AutoItX, CustomWinDLL и все бэкенды.
+Profiler = CallProfiler()
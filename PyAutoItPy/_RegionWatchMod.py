@@ -0,0 +1,245 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Наблюдение за изменениями области экрана по контрольным суммам плиток (PixelChecksum).
+"""
+
+# -------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, perf_counter
+
+from ._AutomationMod import WinRect
+
+
+#-------------------------------------------------------------------------------
+
+def MergeTiles(Tiles):
+    """
+        Объединить плитки в прямоугольники: соседние плитки строки сливаются в полосы, а полосы с одинаковыми
+        столбцами в соседних строках - в прямоугольники.
+
+        * Tiles - итерируемая последовательность пар (столбец, строка).
+
+        Генератор, выдает кортежи (первый столбец, первая строка, столбец за последним, строка за последней).
+        Прямоугольник выдается, как только становится ясно, что ниже он не продолжается.
+    """
+    Rows = dict()
+    for Column, Row in Tiles:
+        Rows.setdefault(Row, []).append(Column)
+    #{(первый столбец, столбец за последним): [первая строка, строка за последней]}
+    Open = dict()
+    for Row in sorted(Rows):
+        Columns = sorted(set(Rows[Row]))
+        Runs = []
+        Start = Prev = Columns[0]
+        for Column in Columns[1:]:
+            if Column != Prev + 1:
+                Runs.append((Start, Prev + 1))
+                Start = Column
+            Prev = Column
+        Runs.append((Start, Prev + 1))
+        Next = dict()
+        for Run in Runs:
+            Rect = Open.pop(Run, None)
+            if Rect is not None and Rect[1] == Row:
+                Rect[1] = Row + 1
+            else:
+                if Rect is not None:
+                    yield Run[0], Rect[0], Run[1], Rect[1]
+                Rect = [Row, Row + 1]
+            Next[Run] = Rect
+        for Run, Rect in Open.items():
+            yield Run[0], Rect[0], Run[1], Rect[1]
+        Open = Next
+    for Run, Rect in Open.items():
+        yield Run[0], Rect[0], Run[1], Rect[1]
+
+
+#-------------------------------------------------------------------------------
+
+class RegionWatcher:
+    """
+        Наблюдение за областью экрана: область делится на плитки, для каждой хранится последняя контрольная сумма
+        (AU3_PixelChecksum), и при каждом обновлении выясняется, какие плитки изменились. Изменившиеся плитки
+        сливаются в прямоугольники, так что перечитывать (CaptureRegion, PixelSearch и т.п.) нужно только их.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Region - область: WinRect или кортеж (X, Y, ширина, высота) в экранных координатах.
+        * TileWidth=64, TileHeight=64 - размер плитки в пикселах (крайние плитки могут быть меньше).
+        * Step=1 - шаг PixelChecksum (см. AutoItX.PixelChecksum): больше - быстрее, но мелкие изменения могут
+        остаться незамеченными.
+        * Hierarchical=False - иерархический режим: плитки объединены в дерево (каждый узел делится на четыре),
+        сначала проверяется сумма всей области, и вниз проверка идет только по изменившимся узлам. Если изменилось
+        немного плиток, это гораздо меньше вызовов DLL, чем проверка каждой плитки.
+        * Workers=0 - число потоков для подсчета сумм, 0 - считать последовательно.
+
+        Свойства:
+
+        * Region, TileWidth, TileHeight, Step, Hierarchical - см. выше.
+        * Columns, Rows - число столбцов и строк плиток.
+        * Calls - число вызовов PixelChecksum за все время.
+
+        При первом обновлении прежних сумм нет, поэтому изменившейся считается вся область.
+    """
+
+    def __init__(self, Automat, Region, TileWidth=64, TileHeight=64, Step=1, Hierarchical=False, Workers=0):
+        self.Automat = Automat
+        self.Region = WinRect(*Region)
+        if self.Region.WIDTH <= 0 or self.Region.HEIGHT <= 0:
+            raise ValueError('Пустая область: {}'.format(self.Region))
+        self.TileWidth = TileWidth
+        self.TileHeight = TileHeight
+        self.Step = Step
+        self.Hierarchical = Hierarchical
+        self.Columns = -(-self.Region.WIDTH // TileWidth)
+        self.Rows = -(-self.Region.HEIGHT // TileHeight)
+        self.Calls = 0
+        self.Workers = Workers
+        #: {(первый столбец, первая строка, столбец за последним, строка за последней): контрольная сумма}
+        self.__Sums__ = dict()
+        self.__Pool__ = None
+
+    #-------------------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *arg):
+        self.Close()
+
+    def Close(self):
+        """
+            Остановить пул потоков (если он был создан).
+        """
+        if self.__Pool__ is not None:
+            self.__Pool__.shutdown(wait=False)
+            self.__Pool__ = None
+
+    #-------------------------------------------------------------------------------
+
+    def TileRect(self, Column, Row, Columns=1, Rows=1):
+        """
+            Прямоугольник (WinRect в экранных координатах) из Columns x Rows плиток, начиная с плитки (Column, Row).
+        """
+        X = self.Region.X + Column * self.TileWidth
+        Y = self.Region.Y + Row * self.TileHeight
+        Right = min(X + Columns * self.TileWidth, self.Region.X + self.Region.WIDTH)
+        Bottom = min(Y + Rows * self.TileHeight, self.Region.Y + self.Region.HEIGHT)
+        return WinRect(X, Y, Right - X, Bottom - Y)
+
+    def __Checksum__(self, Node):
+        """
+            Внутренний метод: контрольная сумма узла (прямоугольника плиток).
+        """
+        X, Y, Width, Height = self.TileRect(Node[0], Node[1], Node[2] - Node[0], Node[3] - Node[1])
+        return self.Automat.__AutoItDLL__.AU3_PixelChecksum(X, Y, X + Width - 1, Y + Height - 1, self.Step)
+
+    def __Checksums__(self, Nodes):
+        """
+            Внутренний метод: контрольные суммы узлов, в пуле потоков, если он задан.
+        """
+        self.Calls += len(Nodes)
+        if self.Workers > 0 and len(Nodes) > 1:
+            if self.__Pool__ is None:
+                self.__Pool__ = ThreadPoolExecutor(self.Workers)
+            return list(self.__Pool__.map(self.__Checksum__, Nodes))
+        return list(self.__Checksum__(Node) for Node in Nodes)
+
+    #-------------------------------------------------------------------------------
+
+    @staticmethod
+    def __Children__(Node):
+        """
+            Внутренний метод: до четырех дочерних узлов (половины по столбцам и строкам).
+        """
+        C0, R0, C1, R1 = Node
+        CM, RM = (C0 + C1 + 1) // 2, (R0 + R1 + 1) // 2
+        return list((A, B, C, D) for A, C in ((C0, CM), (CM, C1)) for B, D in ((R0, RM), (RM, R1)) if A < C and B < D)
+
+    def Refresh(self, Tiles=None):
+        """
+            Пересчитать контрольные суммы и узнать, какие плитки изменились.
+
+            * Tiles=None - какие плитки проверять: последовательность пар (столбец, строка), None - все.
+
+            Возвращает список изменившихся плиток (пар (столбец, строка)).
+        """
+        Wanted = None if Tiles is None else set(Tiles)
+        Sums = self.__Sums__
+        if not self.Hierarchical:
+            Nodes = list((C, R, C + 1, R + 1) for R in range(self.Rows) for C in range(self.Columns)
+                         if Wanted is None or (C, R) in Wanted)
+            Changed = []
+            for Node, Sum in zip(Nodes, self.__Checksums__(Nodes)):
+                if Sums.get(Node) != Sum:
+                    Sums[Node] = Sum
+                    Changed.append(Node[:2])
+            return Changed
+        Changed = []
+        Level = [(0, 0, self.Columns, self.Rows)]
+        while Level:
+            Next = []
+            for Node, Sum in zip(Level, self.__Checksums__(Level)):
+                if Sums.get(Node) == Sum:
+                    continue
+                if Node[2] - Node[0] == 1 and Node[3] - Node[1] == 1:
+                    Sums[Node] = Sum
+                    Changed.append(Node[:2])
+                    continue
+                Children = self.__Children__(Node)
+                if Wanted is not None:
+                    Children = list(Child for Child in Children if self.__Covers__(Child, Wanted))
+                #Сумму узла можно запомнить, только если все его плитки будут проверены, иначе изменение
+                #в непроверенной плитке потом не будет замечено.
+                if Wanted is None or self.__Covers__(Node, Wanted, True):
+                    Sums[Node] = Sum
+                else:
+                    Sums.pop(Node, None)
+                Next.extend(Children)
+            Level = Next
+        return Changed
+
+    @staticmethod
+    def __Covers__(Node, Wanted, All=False):
+        """
+            Внутренний метод: есть ли среди плиток узла запрошенные (All=True - все ли плитки узла запрошены).
+        """
+        Check = all if All else any
+        return Check((C, R) in Wanted for C in range(Node[0], Node[2]) for R in range(Node[1], Node[3]))
+
+    #-------------------------------------------------------------------------------
+
+    def DirtyRects(self, Tiles=None):
+        """
+            Обновить суммы (см. Refresh) и выдать прямоугольники изменившихся областей.
+
+            Генератор, выдает WinRect в экранных координатах, изменившиеся плитки объединены (см. MergeTiles).
+        """
+        for C0, R0, C1, R1 in MergeTiles(self.Refresh(Tiles)):
+            yield self.TileRect(C0, R0, C1 - C0, R1 - R0)
+
+    def Watch(self, Interval=0.1, Timeout=None):
+        """
+            Следить за областью: обновлять суммы каждые Interval секунд и выдавать изменения.
+
+            * Interval=0.1 - пауза между обновлениями в секундах.
+            * Timeout=None - сколько секунд следить, None - без ограничения.
+
+            Генератор, выдает непустые списки WinRect изменившихся областей, по одному на обновление.
+        """
+        End = perf_counter() + Timeout if Timeout is not None else None
+        while End is None or perf_counter() < End:
+            Rects = list(self.DirtyRects())
+            if Rects:
+                yield Rects
+            sleep(Interval)
+
+    def Reset(self):
+        """
+            Забыть все суммы: следующее обновление сочтет изменившейся всю область.
+        """
+        self.__Sums__.clear()
@@ -0,0 +1,138 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Разбор и предварительная компиляция строк для AutoItX.Send.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import namedtuple
+from functools import lru_cache
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Одна клавиша строки Send:
+#: Mods - модификаторы "^!+#" перед клавишей;
+#: Key - клавиша: символ или имя из фигурных скобок (для {ASC 065}, {a down} и т.п. - все содержимое скобок);
+#: Count - число повторов ({DEL 4} -> 4);
+#: Repeatable - можно ли повторы клавиши записать в виде {Key n}.
+KeyToken = namedtuple('KeyToken', 'Mods, Key, Count, Repeatable')
+#: Результат CompileKeys: Tokens - кортеж KeyToken; Complete - строка корректна и не заканчивается
+#: "висящим" модификатором, т.е. ее можно без изменения смысла склеивать с другими строками.
+CompiledKeys = namedtuple('CompiledKeys', 'Tokens, Complete')
+#: Наибольшая длина строки, отправляемой одним вызовом AU3_Send при склейке повторов и строк.
+SendChunkSize = 4096
+#: Модификаторы в синтаксисе Send.
+SendModifiers = '^!+#'
+#: Символы, которые не записываются в виде {символ n}.
+_NotFoldable = '{} \t\r\n'
+#: Клавиши-переключатели, повторять которые бессмысленно.
+_Toggles = frozenset(Name + Suffix for Name in ('SHIFT', 'CTRL', 'ALT', 'LWIN', 'RWIN') for Suffix in ('DOWN', 'UP'))
+
+
+#-------------------------------------------------------------------------------
+
+@lru_cache(maxsize=1024)
+def CompileKeys(KeyString):
+    """
+        Разобрать строку в синтаксисе AutoIt Send (флаг 0) на клавиши.
+        Результат кэшируется, поэтому повторный разбор одной и той же строки ничего не стоит.
+
+        * KeyString - строка, например "^a{DEL 4}+{TAB}".
+
+        Возвращает CompiledKeys.
+    """
+    Tokens = []
+    Mods = ''
+    i, Length = 0, len(KeyString)
+    while i < Length:
+        Char = KeyString[i]
+        if Char in SendModifiers:
+            Mods += Char
+            i += 1
+            continue
+        if Char == '{':
+            #{}} - сама закрывающая скобка
+            End = i + 2 if KeyString.startswith('{}}', i) else KeyString.find('}', i + 1)
+            if End < 0:
+                return CompiledKeys(tuple(Tokens), False)
+            Inner = KeyString[i + 1:End]
+            Name, Space, Arg = Inner.rpartition(' ')
+            if Space and Name and Arg.isdigit() and Name.upper() != 'ASC':
+                Tokens.append(KeyToken(Mods, Name, int(Arg), Name not in _NotFoldable))
+            else:
+                Tokens.append(KeyToken(Mods, Inner, 1,
+                                       not Space and Inner not in _NotFoldable and Inner.upper() not in _Toggles))
+            i = End + 1
+        else:
+            Tokens.append(KeyToken(Mods, Char, 1, Char not in _NotFoldable and Char.isascii()))
+            i += 1
+        Mods = ''
+    return CompiledKeys(tuple(Tokens), not Mods)
+
+
+#-------------------------------------------------------------------------------
+
+def RepeatKeys(KeyString, NumSends, Flag=0, ChunkSize=SendChunkSize):
+    """
+        Записать NumSends повторов KeyString в виде как можно меньшего числа строк для AU3_Send.
+
+        * KeyString - строка для Send.
+        * NumSends - число повторов.
+        * Flag=0 - флаг Send: 0 - строка в синтаксисе Send, 1 - как есть.
+        * ChunkSize=SendChunkSize - наибольшая длина одной строки при склейке повторов.
+
+        Одна клавиша сворачивается в {Key n}, например "{BACKSPACE}" x 7 -> "{BACKSPACE 7}", прочие корректные
+        строки склеиваются друг с другом кусками не длиннее ChunkSize.
+        Возвращает список строк или None, если повторы свернуть нельзя (строку придется отправить NumSends раз).
+    """
+    if NumSends < 1:
+        return []
+    if not Flag:
+        Tokens, Complete = CompileKeys(KeyString)
+        if not Complete:
+            return None
+        if len(Tokens) == 1 and Tokens[0].Repeatable:
+            Token = Tokens[0]
+            return ['{}{{{} {}}}'.format(Token.Mods, Token.Key, Token.Count * NumSends)]
+    if not KeyString:
+        return []
+    PerChunk = max(1, ChunkSize // len(KeyString))
+    Res = []
+    while NumSends > 0:
+        Res.append(KeyString * min(PerChunk, NumSends))
+        NumSends -= PerChunk
+    return Res
+
+
+#-------------------------------------------------------------------------------
+
+def JoinKeys(Strings, Flag=0, ChunkSize=SendChunkSize):
+    """
+        Склеить последовательность строк для Send в куски не длиннее ChunkSize (строка длиннее ChunkSize
+        составляет кусок сама по себе).
+
+        * Strings - итерируемая последовательность строк.
+        * Flag=0 - флаг Send, общий для всех строк.
+        * ChunkSize=SendChunkSize - наибольшая длина куска.
+
+        Генератор, выдает пары (кусок, сколько строк в него вошло). Строки, которые нельзя склеивать (например,
+        заканчивающиеся модификатором), выдаются отдельными кусками.
+    """
+    Chunk = []
+    Size = 0
+    for KeyString in Strings:
+        if not Flag and not CompileKeys(KeyString).Complete:
+            if Chunk:
+                yield ''.join(Chunk), len(Chunk)
+                Chunk, Size = [], 0
+            yield KeyString, 1
+            continue
+        if Chunk and Size + len(KeyString) > ChunkSize:
+            yield ''.join(Chunk), len(Chunk)
+            Chunk, Size = [], 0
+        Chunk.append(KeyString)
+        Size += len(KeyString)
+    if Chunk:
+        yield ''.join(Chunk), len(Chunk)
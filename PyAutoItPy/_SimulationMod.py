@@ -0,0 +1,1212 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Имитационный бэкенд AutoItX: рабочий стол на чистом Python.
+Позволяет гонять AutoItX (и замерять его скорость) без Windows и без AutoItX3.dll.
+"""
+
+# -------------------------------------------------------------------------------
+
+import re
+import zlib
+from collections import Counter, deque
+from functools import wraps
+from threading import RLock, Condition
+from time import sleep, perf_counter
+from sys import maxsize as sysMaxSize
+
+from ._AutomationMod import AutoItBackend, WinState, WinRect, SW
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Флаги состояния окна в формате WinGetState.
+_StateFlags = WinState.__StatesDict__
+#: Ширина рамки и высота заголовка имитируемых окон в пикселах.
+SimBorderWidth = 8
+SimCaptionHeight = 31
+#: Индекс курсора ARROW в MouseGetCursorValue.
+SimArrowCursor = 2
+
+
+#-------------------------------------------------------------------------------
+# Служебные функции.
+
+def _Out(Pointer):
+    """
+        Внутренняя функция: достает ctypes-массив из объекта, полученного через pointer() или byref().
+    """
+    return Pointer.contents if hasattr(Pointer, 'contents') else Pointer._obj
+
+
+def _PutString(Buf, BufSize, Value):
+    """
+        Внутренняя функция: записывает строку в буфер create_unicode_buffer, обрезая ее как это делает DLL.
+    """
+    Buf.value = Value[:max(min(BufSize, len(Buf)) - 1, 0)]
+
+
+def _PutRect(Pointer, Left, Top, Right, Bottom):
+    Rect = _Out(Pointer)
+    Rect[0], Rect[1], Rect[2], Rect[3] = Left, Top, Right, Bottom
+
+
+def _ParseSpec(Spec):
+    """
+        Внутренняя функция: разбирает строку в формате AutoIt вида "[CLASS:Edit; INSTANCE:1]" в список пар
+        (КЛЮЧ, значение). Если строка не в квадратных скобках - возвращает None.
+    """
+    if not (Spec.startswith('[') and Spec.endswith(']')):
+        return None
+    Res = []
+    for Record in Spec[1:-1].split(';'):
+        Record = Record.strip()
+        if Record:
+            Key, _, Value = Record.partition(':')
+            Res.append((Key.strip().upper(), Value.strip()))
+    return Res
+
+
+def _HandleFromText(Value):
+    Value = str(Value).strip()
+    try:
+        return int(Value, 16) if Value.lower().startswith('0x') else int(Value)
+    except ValueError:
+        return None
+
+
+def _SimCall(Func):
+    """
+        Внутренний декоратор функций AU3_* имитационного бэкенда: считает вызовы, эмулирует задержку DLL
+        (CallDelay) и выполняет функцию под блокировкой рабочего стола.
+    """
+    Name = Func.__name__
+
+    @wraps(Func)
+    def wrapper(self, *arg):
+        if self.CallDelay:
+            sleep(self.CallDelay)
+        with self.Lock:
+            self.Calls[Name] += 1
+            return Func(self, *arg)
+
+    return wrapper
+
+
+#-------------------------------------------------------------------------------
+
+class SimTreeItem:
+    """
+        Элемент дерева имитируемого контрола SysTreeView32.
+
+        Параметры конструктора:
+            * Text - текст элемента.
+            * Children=() - дочерние элементы (SimTreeItem или строки).
+    """
+
+    def __init__(self, Text, Children=()):
+        self.Text = Text
+        self.Children = list(C if isinstance(C, SimTreeItem) else SimTreeItem(C) for C in Children)
+        self.Expanded = False
+        self.Checked = False
+
+    #-------------------------------------------------------------------------------
+
+    def Add(self, Text, Children=()):
+        """
+            Добавить дочерний элемент, возвращает его.
+        """
+        Item = SimTreeItem(Text, Children)
+        self.Children.append(Item)
+        return Item
+
+
+#-------------------------------------------------------------------------------
+
+class SimControl:
+    """
+        Имитируемый контрол окна.
+
+        Свойства:
+            * Handle - числовой Handle контрола.
+            * Class - класс контрола, например "Edit" или "SysListView32".
+            * Instance - номер экземпляра контрола среди контролов того же класса в окне.
+            * ID - идентификатор контрола.
+            * Name - имя контрола.
+            * Text - текст контрола.
+            * X, Y, Width, Height - положение и размер внутри клиентской области окна.
+            * Visible, Enabled, Checked - логические признаки.
+            * Items - строки ListView (список списков колонок), либо элементы ComboBox/ListBox (список строк).
+            * Selected - множество номеров выделенных строк ListView или элементов ComboBox/ListBox.
+            * Tree - корень дерева (SimTreeItem) для SysTreeView32.
+            * Parts - список текстов полей строки состояния msctls_statusbar32.
+    """
+
+    def __init__(self, Handle, Class, Instance, Text='', X=0, Y=0, Width=100, Height=20, ID=None, Name=''):
+        self.Handle = Handle
+        self.Class = Class
+        self.Instance = Instance
+        self.ID = ID if ID is not None else Handle & 0xFFFF
+        self.Name = Name
+        self.Text = Text
+        self.X = X
+        self.Y = Y
+        self.Width = Width
+        self.Height = Height
+        self.Visible = True
+        self.Enabled = True
+        self.Checked = False
+        self.Items = []
+        self.Selected = set()
+        self.Tree = SimTreeItem('')
+        self.Parts = []
+        self.__Lines__ = (None, [''])
+
+    #-------------------------------------------------------------------------------
+
+    @property
+    def ClassNN(self):
+        return '{}{}'.format(self.Class, self.Instance)
+
+    @property
+    def Lines(self):
+        """
+            Строки текста контрола (как их видят команды GetLineCount, GetLine), разбиение запоминается до
+            изменения текста, чтобы построчное чтение длинного текста не разбивало его заново на каждую строку.
+        """
+        Text, Lines = self.__Lines__
+        if Text is not self.Text:
+            Lines = self.Text.splitlines() or ['']
+            self.__Lines__ = (self.Text, Lines)
+        return Lines
+
+
+#-------------------------------------------------------------------------------
+
+class SimWindow:
+    """
+        Имитируемое окно верхнего уровня. Создается методом SimulatedBackend.AddWindow.
+
+        Свойства:
+            * Handle - числовой Handle окна.
+            * Title - заголовок окна.
+            * Class - класс окна.
+            * Text - текст окна (помимо текстов контролов).
+            * X, Y, Width, Height - положение и размер окна на экране.
+            * PID - идентификатор процесса окна.
+            * Visible, Enabled, Minimized, Maximized - логические признаки состояния.
+            * OnTop, Trans - признак "поверх всех" и прозрачность.
+            * Controls - список контролов (SimControl).
+            * Focus - контрол с фокусом ввода или None.
+            * Caret - положение текстового курсора (X, Y).
+    """
+
+    def __init__(self, Desktop, Handle, Title, Class, Text, X, Y, Width, Height, PID):
+        self.Desktop = Desktop
+        self.Handle = Handle
+        self.Title = Title
+        self.Class = Class
+        self.Text = Text
+        self.X = X
+        self.Y = Y
+        self.Width = Width
+        self.Height = Height
+        self.PID = PID
+        self.Visible = True
+        self.Enabled = True
+        self.Minimized = False
+        self.Maximized = False
+        self.OnTop = False
+        self.Trans = 255
+        self.Controls = []
+        self.Focus = None
+        self.Caret = (0, 0)
+
+    #-------------------------------------------------------------------------------
+
+    def AddControl(self, Class, Text='', X=0, Y=0, Width=100, Height=20, ID=None, Name=''):
+        """
+            Добавить контрол в окно, возвращает созданный SimControl.
+            Номер экземпляра (Instance) назначается автоматически по порядку среди контролов того же класса.
+        """
+        with self.Desktop.Lock:
+            Instance = 1 + sum(1 for C in self.Controls if C.Class == Class)
+            Control = SimControl(self.Desktop.NewHandle(), Class, Instance, Text, X, Y, Width, Height, ID, Name)
+            self.Controls.append(Control)
+            self.Desktop.ControlIndex[Control.Handle] = (self, Control)
+            self.Desktop.Touch()
+        return Control
+
+    def RemoveControl(self, Control):
+        """
+            Убрать контрол из окна. Номера экземпляров следующих контролов того же класса уменьшаются, как и в
+            Windows, где Instance - порядковый номер среди контролов класса.
+            Возвращает True, если контрол был найден.
+        """
+        with self.Desktop.Lock:
+            if Control not in self.Controls:
+                return False
+            self.Controls.remove(Control)
+            self.Desktop.ControlIndex.pop(Control.Handle, None)
+            for Other in self.Controls:
+                if Other.Class == Control.Class and Other.Instance > Control.Instance:
+                    Other.Instance -= 1
+            if self.Focus is Control:
+                self.Focus = None
+            self.Desktop.Touch()
+        return True
+
+    #-------------------------------------------------------------------------------
+
+    def ClientRect(self):
+        """
+            Положение и размер клиентской области окна на экране в виде WinRect.
+        """
+        return WinRect(self.X + SimBorderWidth, self.Y + SimCaptionHeight,
+                       max(self.Width - 2 * SimBorderWidth, 0), max(self.Height - SimCaptionHeight - SimBorderWidth, 0))
+
+    #-------------------------------------------------------------------------------
+
+    def StateNum(self):
+        """
+            Состояние окна в числовом виде, как его возвращает WinGetState.
+        """
+        Res = _StateFlags['EXISTS']
+        if self.Visible:
+            Res |= _StateFlags['VISIBLE']
+        if self.Enabled:
+            Res |= _StateFlags['ENABLED']
+        if self.Desktop.ActiveHandle == self.Handle:
+            Res |= _StateFlags['ACTIVE']
+        if self.Minimized:
+            Res |= _StateFlags['MINIMIZED']
+        if self.Maximized:
+            Res |= _StateFlags['MAXIMIZED']
+        return Res
+
+    #-------------------------------------------------------------------------------
+
+    def FullText(self):
+        """
+            Текст окна вместе с текстами видимых контролов, как его возвращает WinGetText.
+        """
+        Texts = [self.Text] if self.Text else []
+        Texts.extend(C.Text for C in self.Controls if C.Visible and C.Text)
+        return ''.join(T + '\n' for T in Texts)
+
+
+#-------------------------------------------------------------------------------
+
+class SimulatedBackend(AutoItBackend):
+    """
+        Имитационный бэкенд для AutoItX: рабочий стол на чистом Python, реализует все функции AU3_* из AutoDLLdict
+        и MessageBoxW с теми же сигнатурами, что и AutoItX3.dll, а также необязательную CaptureScreen (снимок
+        области экрана из Screen).
+
+        Параметры конструктора:
+
+        * ScreenWidth=1024 - ширина экрана в пикселах.
+        * ScreenHeight=768 - высота экрана в пикселах.
+        * CallDelay=0.0 - искусственная задержка каждого вызова в секундах, имитирует стоимость обращения к DLL.
+
+        Свойства:
+
+        * Windows - словарь {Handle: SimWindow}, порядок соответствует порядку создания окон.
+        * ActiveHandle - Handle активного окна или None.
+        * Clipboard - содержимое буфера обмена (строка или None).
+        * Screen - bytearray с пикселами экрана, по три байта (R, G, B) на пиксел, построчно.
+        * MousePos - текущее положение курсора мыши [X, Y].
+        * InputLog - очередь последних действий ввода (мышь, клавиатура, меню), кортежи вида ('Send', строка, флаг).
+        * Calls - счетчик вызовов функций AU3_* (collections.Counter), удобен для проверки числа обращений к DLL.
+        * Lock - блокировка рабочего стола (RLock), Changed - Condition на ней, оповещается при любых изменениях.
+        * Subscribers - функции, вызываемые при любых изменениях (см. Subscribe).
+
+        Как в AutoItX3.dll, WinGetPos, WinGetClientSize и ControlGetPos заполняют массив в формате RECT
+        (левый, верхний, правый, нижний края), у WinGetClientSize левый и верхний края нулевые.
+    """
+
+    def __init__(self, ScreenWidth=1024, ScreenHeight=768, CallDelay=0.0):
+        self.Lock = RLock()
+        self.Changed = Condition(self.Lock)
+        self.CallDelay = CallDelay
+        self.Calls = Counter()
+        self.Subscribers = []
+        self.Windows = {}
+        self.ControlIndex = {}
+        self.ActiveHandle = None
+        self.Clipboard = None
+        self.ScreenWidth = ScreenWidth
+        self.ScreenHeight = ScreenHeight
+        self.Screen = bytearray(ScreenWidth * ScreenHeight * 3)
+        self.MousePos = [0, 0]
+        self.Cursor = SimArrowCursor
+        self.InputLog = deque(maxlen=10000)
+        self.MessageBoxes = deque(maxlen=1000)
+        self.MsgBoxResult = 1
+        self.Admin = False
+        self.LastError = 0
+        self.__NextHandle__ = 0x10000
+        self.__NextPID__ = 1000
+        self.__MinimizedAll__ = []
+
+    #-------------------------------------------------------------------------------
+    # Методы для наполнения и изменения рабочего стола.
+
+    def NewHandle(self):
+        """
+            Выдать новый уникальный Handle для окна или контрола.
+        """
+        with self.Lock:
+            self.__NextHandle__ += 0x10
+            return self.__NextHandle__
+
+    #-------------------------------------------------------------------------------
+
+    def AddWindow(self, Title, Class='SimWindow', Text='', X=0, Y=0, Width=640, Height=480, PID=None, Activate=True):
+        """
+            Создать окно на имитируемом рабочем столе, возвращает SimWindow.
+
+            * Title - заголовок окна.
+            * Class='SimWindow' - класс окна.
+            * Text='' - текст окна.
+            * X=0, Y=0, Width=640, Height=480 - положение и размер окна.
+            * PID=None - идентификатор процесса, если не задан - назначается автоматически.
+            * Activate=True - сделать ли окно активным.
+        """
+        with self.Lock:
+            if PID is None:
+                self.__NextPID__ += 4
+                PID = self.__NextPID__
+            Window = SimWindow(self, self.NewHandle(), Title, Class, Text, X, Y, Width, Height, PID)
+            self.Windows[Window.Handle] = Window
+            if Activate:
+                self.ActiveHandle = Window.Handle
+            self.Touch()
+        return Window
+
+    #-------------------------------------------------------------------------------
+
+    def RemoveWindow(self, Window):
+        """
+            Убрать окно (SimWindow или его Handle) с рабочего стола.
+            Возвращает True, если окно было найдено.
+        """
+        Handle = getattr(Window, 'Handle', Window)
+        with self.Lock:
+            Window = self.Windows.pop(Handle, None)
+            if Window is None:
+                return False
+            for Control in Window.Controls:
+                self.ControlIndex.pop(Control.Handle, None)
+            if self.ActiveHandle == Handle:
+                self.ActiveHandle = next(reversed(self.Windows), None) if self.Windows else None
+            self.Touch()
+        return True
+
+    #-------------------------------------------------------------------------------
+
+    def Touch(self):
+        """
+            Оповестить ожидающих (WinWait и т.п.) об изменении рабочего стола.
+            Вызывать после прямого изменения свойств SimWindow/SimControl из другого потока.
+        """
+        with self.Lock:
+            self.Changed.notify_all()
+            for Callback in self.Subscribers:
+                Callback()
+
+    #-------------------------------------------------------------------------------
+
+    def Subscribe(self, Callback):
+        """
+            Подписаться на изменения рабочего стола: Callback() вызывается при каждом изменении (см. Touch).
+            Используется, например, WinWaiter, чтобы не ждать очередного опроса.
+        """
+        with self.Lock:
+            self.Subscribers = self.Subscribers + [Callback]
+
+    def Unsubscribe(self, Callback):
+        """
+            Отменить подписку, сделанную Subscribe.
+        """
+        with self.Lock:
+            self.Subscribers = list(C for C in self.Subscribers if C is not Callback)
+
+    #-------------------------------------------------------------------------------
+
+    def SetPixel(self, X, Y, Color):
+        """
+            Задать цвет пиксела экрана, цвет в формате 0xRRGGBB.
+        """
+        Offset = (Y * self.ScreenWidth + X) * 3
+        self.Screen[Offset:Offset + 3] = Color.to_bytes(3, 'big')
+
+    #-------------------------------------------------------------------------------
+
+    def GetPixel(self, X, Y):
+        """
+            Цвет пиксела экрана в формате 0xRRGGBB.
+        """
+        Offset = (Y * self.ScreenWidth + X) * 3
+        return int.from_bytes(self.Screen[Offset:Offset + 3], 'big')
+
+    #-------------------------------------------------------------------------------
+
+    def FillRect(self, X, Y, Width, Height, Color):
+        """
+            Закрасить прямоугольник экрана цветом в формате 0xRRGGBB.
+        """
+        Left = max(X, 0)
+        Right = min(X + Width, self.ScreenWidth)
+        if Right <= Left:
+            return
+        Row = Color.to_bytes(3, 'big') * (Right - Left)
+        for Line in range(max(Y, 0), min(Y + Height, self.ScreenHeight)):
+            Offset = (Line * self.ScreenWidth + Left) * 3
+            self.Screen[Offset:Offset + len(Row)] = Row
+
+    #-------------------------------------------------------------------------------
+    # Внутренние методы поиска окон и контролов.
+
+    def __FindWindows__(self, Title, Text=''):
+        """
+            Окна, подходящие под заголовок в формате AutoIt и текст, первым идет активное окно.
+        """
+        if Title.startswith('[HANDLE:') and not Text:
+            #Быстрый путь для самого частого случая - поиска только по Handle. Описания с другими ключами
+            #("[HANDLE:...; TITLE:...]") разбираются полностью ниже.
+            Body = Title[8:].rstrip('];')
+            if ';' not in Body:
+                Window = self.Windows.get(_HandleFromText(Body))
+                return [Window] if Window else []
+        Windows = list(self.Windows.values())
+        if self.ActiveHandle in self.Windows:
+            Active = self.Windows[self.ActiveHandle]
+            Windows.remove(Active)
+            Windows.insert(0, Active)
+        Props = _ParseSpec(Title)
+        Instance = None
+        if Props is None:
+            if Title:
+                Windows = list(W for W in Windows if W.Title.startswith(Title))
+            elif not Text:
+                Windows = Windows[:1]
+        else:
+            for Key, Value in Props:
+                if Key == 'TITLE':
+                    Windows = list(W for W in Windows if W.Title.startswith(Value))
+                elif Key == 'CLASS':
+                    Windows = list(W for W in Windows if W.Class == Value)
+                elif Key == 'REGEXPTITLE':
+                    Windows = list(W for W in Windows if re.search(Value, W.Title))
+                elif Key == 'REGEXPCLASS':
+                    Windows = list(W for W in Windows if re.search(Value, W.Class))
+                elif Key == 'HANDLE':
+                    Handle = _HandleFromText(Value)
+                    Windows = list(W for W in Windows if W.Handle == Handle)
+                elif Key == 'ACTIVE':
+                    Windows = list(W for W in Windows if W.Handle == self.ActiveHandle)
+                elif Key == 'INSTANCE':
+                    Instance = int(Value)
+        if Text:
+            Windows = list(W for W in Windows if Text in W.FullText())
+        if Instance is not None:
+            Windows = Windows[Instance - 1:Instance] if Instance > 0 else []
+        return Windows
+
+    def __FindWindow__(self, Title, Text=''):
+        """
+            Первое окно, подходящее под заголовок и текст, либо None. Выставляет признак ошибки.
+        """
+        Found = self.__FindWindows__(Title, Text)
+        self.LastError = 0 if Found else 1
+        return Found[0] if Found else None
+
+    #-------------------------------------------------------------------------------
+
+    def __FindControl__(self, Window, Control):
+        """
+            Контрол окна по идентификатору в формате AutoIt, либо None. Выставляет признак ошибки.
+        """
+        Res = None
+        if Window is not None:
+            Controls = Window.Controls
+            Props = _ParseSpec(Control)
+            if Props is None:
+                if Control == '':
+                    Res = Window.Focus
+                else:
+                    for Candidate in Controls:
+                        if Candidate.ClassNN == Control or str(Candidate.ID) == Control:
+                            Res = Candidate
+                            break
+                    else:
+                        Res = next((C for C in Controls if C.Text == Control), None)
+            else:
+                Instance = 1
+                for Key, Value in Props:
+                    if Key == 'CLASS':
+                        Controls = list(C for C in Controls if C.Class == Value)
+                    elif Key == 'REGEXPCLASS':
+                        Controls = list(C for C in Controls if re.search(Value, C.Class))
+                    elif Key == 'CLASSNN':
+                        Controls = list(C for C in Controls if C.ClassNN == Value)
+                    elif Key == 'ID':
+                        Controls = list(C for C in Controls if str(C.ID) == Value)
+                    elif Key == 'TEXT':
+                        Controls = list(C for C in Controls if C.Text.startswith(Value))
+                    elif Key == 'NAME':
+                        Controls = list(C for C in Controls if C.Name == Value)
+                    elif Key == 'HANDLE':
+                        Handle = _HandleFromText(Value)
+                        Controls = list(C for C in Controls if C.Handle == Handle)
+                    elif Key == 'INSTANCE':
+                        Instance = int(Value)
+                Res = Controls[Instance - 1] if 0 < Instance <= len(Controls) else None
+        self.LastError = 0 if Res is not None else 1
+        return Res
+
+    def __FindControlIn__(self, Title, Text, Control):
+        return self.__FindControl__(self.__FindWindow__(Title, Text), Control)
+
+    #-------------------------------------------------------------------------------
+
+    def __HandleText__(self, Handle):
+        return '0x{:0{}X}'.format(Handle, 16 if sysMaxSize > 2 ** 32 else 8)
+
+    #-------------------------------------------------------------------------------
+
+    def __WaitFor__(self, Predicate, Timeout):
+        """
+            Ждать выполнения условия Predicate() не дольше Timeout секунд (0 - без ограничения).
+            Вызывается под блокировкой, просыпается по оповещениям Changed.
+        """
+        Deadline = perf_counter() + Timeout if Timeout > 0 else None
+        while not Predicate():
+            Remaining = None if Deadline is None else Deadline - perf_counter()
+            if Remaining is not None and Remaining <= 0:
+                self.LastError = 1
+                return 0
+            self.Changed.wait(Remaining)
+        self.LastError = 0
+        return 1
+
+    #-------------------------------------------------------------------------------
+    # Функции AutoItX3.dll
+
+    @_SimCall
+    def AU3_error(self):
+        return self.LastError
+
+    @_SimCall
+    def AU3_MouseClick(self, Button, X, Y, NumClicks, Speed):
+        self.MousePos[:] = [X, Y]
+        self.InputLog.append(('MouseClick', Button, X, Y, NumClicks))
+        self.LastError = 0
+        return 1
+
+    @_SimCall
+    def AU3_MouseClickDrag(self, Button, X, Y, NewX, NewY, Speed):
+        self.MousePos[:] = [NewX, NewY]
+        self.InputLog.append(('MouseClickDrag', Button, X, Y, NewX, NewY))
+        self.LastError = 0
+        return 1
+
+    @_SimCall
+    def AU3_WinGetHandle(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        return Window.Handle if Window else None
+
+    @_SimCall
+    def AU3_WinGetHandleAsText(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, self.__HandleText__(Window.Handle) if Window else '')
+
+    @_SimCall
+    def AU3_WinExists(self, Title, Text):
+        return 1 if self.__FindWindow__(Title, Text) else 0
+
+    @_SimCall
+    def AU3_WinGetState(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        return Window.StateNum() if Window else 0
+
+    @_SimCall
+    def AU3_WinGetPos(self, Title, Text, Rect):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            _PutRect(Rect, Window.X, Window.Y, Window.X + Window.Width, Window.Y + Window.Height)
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinGetClientSize(self, Title, Text, Rect):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            Client = Window.ClientRect()
+            _PutRect(Rect, 0, 0, Client.WIDTH, Client.HEIGHT)
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinActivate(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            self.ActiveHandle = Window.Handle
+            Window.Minimized = False
+            self.Touch()
+            return 1
+        return 0
+
+    @_SimCall
+    def AU3_WinActive(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        return 1 if Window and Window.Handle == self.ActiveHandle else 0
+
+    @_SimCall
+    def AU3_WinClose(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        return 1 if Window and self.RemoveWindow(Window) else 0
+
+    @_SimCall
+    def AU3_WinGetCaretPos(self, Point):
+        Window = self.Windows.get(self.ActiveHandle)
+        Res = _Out(Point)
+        Res[0], Res[1] = Window.Caret if Window else (0, 0)
+        self.LastError = 0 if Window else 1
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinGetClassList(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, ''.join(C.Class + '\n' for C in Window.Controls) if Window else '')
+
+    @_SimCall
+    def AU3_WinGetProcess(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, str(Window.PID) if Window else '')
+
+    @_SimCall
+    def AU3_WinWait(self, Title, Text, Timeout):
+        return self.__WaitFor__(lambda: self.__FindWindows__(Title, Text), Timeout)
+
+    @_SimCall
+    def AU3_WinWaitActive(self, Title, Text, Timeout):
+        return self.__WaitFor__(
+            lambda: any(W.Handle == self.ActiveHandle for W in self.__FindWindows__(Title, Text)), Timeout)
+
+    @_SimCall
+    def AU3_WinWaitClose(self, Title, Text, Timeout):
+        return self.__WaitFor__(lambda: not self.__FindWindows__(Title, Text), Timeout)
+
+    @_SimCall
+    def AU3_WinWaitNotActive(self, Title, Text, Timeout):
+        return self.__WaitFor__(
+            lambda: not any(W.Handle == self.ActiveHandle for W in self.__FindWindows__(Title, Text)), Timeout)
+
+    @_SimCall
+    def AU3_WinGetText(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, Window.FullText() if Window else '')
+
+    @_SimCall
+    def AU3_WinGetTitle(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, Window.Title if Window else '')
+
+    @_SimCall
+    def AU3_WinKill(self, Title, Text):
+        Window = self.__FindWindow__(Title, Text)
+        return 1 if Window and self.RemoveWindow(Window) else 0
+
+    @_SimCall
+    def AU3_WinMenuSelectItem(self, Title, Text, *Items):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            self.InputLog.append(('WinMenuSelectItem', Window.Handle) + tuple(I for I in Items if I))
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinMinimizeAll(self):
+        self.__MinimizedAll__ = list(W for W in self.Windows.values() if not W.Minimized)
+        for Window in self.__MinimizedAll__:
+            Window.Minimized = True
+        self.Touch()
+
+    @_SimCall
+    def AU3_WinMinimizeAllUndo(self):
+        for Window in self.__MinimizedAll__:
+            Window.Minimized = False
+        self.__MinimizedAll__ = []
+        self.Touch()
+
+    @_SimCall
+    def AU3_WinMove(self, Title, Text, X, Y, Width, Height):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            Window.X = X
+            Window.Y = Y
+            if Width != -1:
+                Window.Width = Width
+            if Height != -1:
+                Window.Height = Height
+            self.Touch()
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinSetOnTop(self, Title, Text, Flag):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            Window.OnTop = bool(Flag)
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinSetState(self, Title, Text, Flags):
+        Window = self.__FindWindow__(Title, Text)
+        if not Window:
+            return 0
+        if Flags == SW.HIDE:
+            Window.Visible = False
+        elif Flags == SW.DISABLE:
+            Window.Enabled = False
+        elif Flags == SW.ENABLE:
+            Window.Enabled = True
+        elif Flags in (SW.LOCK, SW.UNLOCK):
+            pass
+        else:
+            Window.Visible = True
+            if Flags in (SW.MAXIMIZE, SW.SHOWMAXIMIZED):
+                Window.Maximized, Window.Minimized = True, False
+            elif Flags in (SW.MINIMIZE, SW.SHOWMINIMIZED, SW.SHOWMINNOACTIVE):
+                Window.Minimized, Window.Maximized = True, False
+            elif Flags in (SW.RESTORE, SW.SHOWNORMAL, SW.SHOWDEFAULT):
+                Window.Minimized = Window.Maximized = False
+        self.Touch()
+        return 1
+
+    @_SimCall
+    def AU3_WinSetTitle(self, Title, Text, NewTitle):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            Window.Title = NewTitle
+            self.Touch()
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_WinSetTrans(self, Title, Text, Trans):
+        Window = self.__FindWindow__(Title, Text)
+        if Window:
+            Window.Trans = Trans
+        return 1 if Window else 0
+
+    @_SimCall
+    def AU3_ControlClick(self, Title, Text, Control, Button, NumClicks, X, Y):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            self.InputLog.append(('ControlClick', Found.Handle, Button, NumClicks, X, Y))
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlGetHandle(self, WinHandle, Control):
+        Found = self.__FindControl__(self.Windows.get(WinHandle), Control)
+        return Found.Handle if Found else None
+
+    @_SimCall
+    def AU3_ControlGetHandleAsText(self, Title, Text, Control, Buf, BufSize):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        _PutString(Buf, BufSize, self.__HandleText__(Found.Handle) if Found else '')
+
+    @_SimCall
+    def AU3_ControlGetText(self, Title, Text, Control, Buf, BufSize):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        _PutString(Buf, BufSize, Found.Text if Found else '')
+
+    @_SimCall
+    def AU3_ControlGetTextByHandle(self, WinHandle, ControlHandle, Buf, BufSize):
+        Window, Found = self.ControlIndex.get(ControlHandle, (None, None))
+        self.LastError = 0 if Found and Window.Handle == WinHandle else 1
+        _PutString(Buf, BufSize, Found.Text if self.LastError == 0 else '')
+
+    @_SimCall
+    def AU3_ControlCommand(self, Title, Text, Control, Command, Extra, Buf, BufSize):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        Res = self.__ControlCommand__(Found, Command.upper(), Extra) if Found else ''
+        _PutString(Buf, BufSize, Res)
+
+    @_SimCall
+    def AU3_Send(self, KeyString, Flag):
+        self.InputLog.append(('Send', KeyString, Flag))
+        self.LastError = 0
+
+    @_SimCall
+    def AU3_ControlGetPos(self, Title, Text, Control, Rect):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            _PutRect(Rect, Found.X, Found.Y, Found.X + Found.Width, Found.Y + Found.Height)
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlGetPosByHandle(self, WinHandle, ControlHandle, Rect):
+        Window, Found = self.ControlIndex.get(ControlHandle, (None, None))
+        if Found and Window.Handle == WinHandle:
+            _PutRect(Rect, Found.X, Found.Y, Found.X + Found.Width, Found.Y + Found.Height)
+            self.LastError = 0
+            return 1
+        self.LastError = 1
+        return 0
+
+    @_SimCall
+    def AU3_ControlListView(self, Title, Text, Control, Command, Extra1, Extra2, Buf, BufSize):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        Res = self.__ListViewCommand__(Found, Command.upper(), Extra1, Extra2) if Found else ''
+        _PutString(Buf, BufSize, Res)
+
+    @_SimCall
+    def AU3_ControlDisable(self, Title, Text, Control):
+        return self.__SetControlFlag__(Title, Text, Control, 'Enabled', False)
+
+    @_SimCall
+    def AU3_ControlEnable(self, Title, Text, Control):
+        return self.__SetControlFlag__(Title, Text, Control, 'Enabled', True)
+
+    @_SimCall
+    def AU3_ControlFocus(self, Title, Text, Control):
+        Window = self.__FindWindow__(Title, Text)
+        Found = self.__FindControl__(Window, Control)
+        if Found:
+            Window.Focus = Found
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlGetFocus(self, Title, Text, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        _PutString(Buf, BufSize, Window.Focus.ClassNN if Window and Window.Focus else '')
+
+    @_SimCall
+    def AU3_ControlGetFocusByHandle(self, WinHandle, Buf, BufSize):
+        Window = self.Windows.get(WinHandle)
+        self.LastError = 0 if Window else 1
+        _PutString(Buf, BufSize, Window.Focus.ClassNN if Window and Window.Focus else '')
+
+    @_SimCall
+    def AU3_ControlHide(self, Title, Text, Control):
+        return self.__SetControlFlag__(Title, Text, Control, 'Visible', False)
+
+    @_SimCall
+    def AU3_ControlShow(self, Title, Text, Control):
+        return self.__SetControlFlag__(Title, Text, Control, 'Visible', True)
+
+    @_SimCall
+    def AU3_ControlMove(self, Title, Text, Control, X, Y, Width, Height):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            Found.X = X
+            Found.Y = Y
+            if Width != -1:
+                Found.Width = Width
+            if Height != -1:
+                Found.Height = Height
+            self.Touch()
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlSend(self, Title, Text, Control, String, Flag):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            self.InputLog.append(('ControlSend', Found.Handle, String, Flag))
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlSetText(self, Title, Text, Control, NewText):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            Found.Text = NewText
+            self.Touch()
+        return 1 if Found else 0
+
+    @_SimCall
+    def AU3_ControlTreeView(self, Title, Text, Control, Command, Extra1, Extra2, Buf, BufSize):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        Res = self.__TreeViewCommand__(Found, Command.upper(), Extra1, Extra2) if Found else ''
+        _PutString(Buf, BufSize, Res)
+
+    @_SimCall
+    def AU3_StatusbarGetText(self, Title, Text, Part, Buf, BufSize):
+        Window = self.__FindWindow__(Title, Text)
+        Bar = next((C for C in Window.Controls if C.Class == 'msctls_statusbar32'), None) if Window else None
+        Res = ''
+        if Bar and 0 < Part <= len(Bar.Parts):
+            Res = Bar.Parts[Part - 1]
+        self.LastError = 0 if Bar and Part <= len(Bar.Parts) else 1
+        _PutString(Buf, BufSize, Res)
+
+    @_SimCall
+    def AU3_MouseDown(self, Button):
+        self.InputLog.append(('MouseDown', Button))
+
+    @_SimCall
+    def AU3_MouseUp(self, Button):
+        self.InputLog.append(('MouseUp', Button))
+
+    @_SimCall
+    def AU3_MouseMove(self, X, Y, Speed):
+        self.MousePos[:] = [X, Y]
+        self.InputLog.append(('MouseMove', X, Y))
+
+    @_SimCall
+    def AU3_MouseWheel(self, Direction, Clicks):
+        self.InputLog.append(('MouseWheel', Direction, Clicks))
+
+    @_SimCall
+    def AU3_MouseGetCursor(self):
+        return self.Cursor
+
+    @_SimCall
+    def AU3_MouseGetPos(self, Point):
+        Res = _Out(Point)
+        Res[0], Res[1] = self.MousePos
+
+    @_SimCall
+    def AU3_PixelChecksum(self, Left, Top, Right, Bottom, Step):
+        Right = min(Right, self.ScreenWidth - 1)
+        Bottom = min(Bottom, self.ScreenHeight - 1)
+        Res = 1
+        for Y in range(max(Top, 0), Bottom + 1, Step):
+            Start = (Y * self.ScreenWidth + max(Left, 0)) * 3
+            Row = self.Screen[Start:(Y * self.ScreenWidth + Right + 1) * 3]
+            if Step > 1:
+                Row = b''.join(Row[I:I + 3] for I in range(0, len(Row), 3 * Step))
+            Res = zlib.adler32(Row, Res)
+        return Res
+
+    @_SimCall
+    def AU3_PixelGetColor(self, X, Y):
+        if 0 <= X < self.ScreenWidth and 0 <= Y < self.ScreenHeight:
+            self.LastError = 0
+            return self.GetPixel(X, Y)
+        self.LastError = 1
+        return -1
+
+    @_SimCall
+    def AU3_PixelSearch(self, Left, Top, Right, Bottom, Col, Var, Step, Point):
+        R, G, B = (Col >> 16) & 0xFF, (Col >> 8) & 0xFF, Col & 0xFF
+        Screen = self.Screen
+        for Y in range(max(Top, 0), min(Bottom, self.ScreenHeight - 1) + 1, Step):
+            for X in range(max(Left, 0), min(Right, self.ScreenWidth - 1) + 1, Step):
+                Offset = (Y * self.ScreenWidth + X) * 3
+                if abs(Screen[Offset] - R) <= Var and abs(Screen[Offset + 1] - G) <= Var and \
+                        abs(Screen[Offset + 2] - B) <= Var:
+                    Res = _Out(Point)
+                    Res[0], Res[1] = X, Y
+                    self.LastError = 0
+                    return
+        self.LastError = 1
+
+    @_SimCall
+    def CaptureScreen(self, Left, Top, Right, Bottom):
+        Width, Height = max(Right - Left + 1, 0), max(Bottom - Top + 1, 0)
+        Res = bytearray(Width * Height * 3)
+        #Видимая часть области, остальное остается черным.
+        VisLeft, VisRight = max(Left, 0), min(Right, self.ScreenWidth - 1)
+        if VisRight < VisLeft:
+            return Width, Height, bytes(Res)
+        RowBytes = (VisRight - VisLeft + 1) * 3
+        Into = (VisLeft - Left) * 3
+        for Y in range(max(Top, 0), min(Bottom, self.ScreenHeight - 1) + 1):
+            Start = (Y * self.ScreenWidth + VisLeft) * 3
+            Offset = (Y - Top) * Width * 3 + Into
+            Res[Offset:Offset + RowBytes] = self.Screen[Start:Start + RowBytes]
+        return Width, Height, bytes(Res)
+
+    @_SimCall
+    def AU3_ClipGet(self, Buf, BufSize):
+        self.LastError = 0 if self.Clipboard else 1
+        _PutString(Buf, BufSize, self.Clipboard or '')
+
+    @_SimCall
+    def AU3_ClipPut(self, Text):
+        self.Clipboard = getattr(Text, 'value', Text)
+        self.LastError = 0
+
+    @_SimCall
+    def AU3_IsAdmin(self):
+        return 1 if self.Admin else 0
+
+    @_SimCall
+    def MessageBoxW(self, WinHandle, Message, Title, Flags):
+        self.MessageBoxes.append((Title, Message, Flags))
+        return self.MsgBoxResult
+
+    #-------------------------------------------------------------------------------
+    # Внутренние методы команд контролов.
+
+    def __SetControlFlag__(self, Title, Text, Control, Flag, Value):
+        Found = self.__FindControlIn__(Title, Text, Control)
+        if Found:
+            setattr(Found, Flag, Value)
+            self.Touch()
+        return 1 if Found else 0
+
+    #-------------------------------------------------------------------------------
+
+    def __Fail__(self):
+        self.LastError = 1
+        return ''
+
+    #-------------------------------------------------------------------------------
+
+    def __ControlCommand__(self, Control, Command, Extra):
+        Lines = Control.Lines
+        Items = Control.Items
+        if Command == 'ISVISIBLE':
+            return '1' if Control.Visible else '0'
+        elif Command == 'ISENABLED':
+            return '1' if Control.Enabled else '0'
+        elif Command == 'ISCHECKED':
+            return '1' if Control.Checked else '0'
+        elif Command in ('CHECK', 'UNCHECK'):
+            Control.Checked = Command == 'CHECK'
+            return ''
+        elif Command == 'GETLINECOUNT':
+            return str(len(Lines))
+        elif Command == 'GETLINE':
+            Line = int(Extra or 0)
+            return Lines[Line - 1] if 0 < Line <= len(Lines) else self.__Fail__()
+        elif Command == 'GETCURRENTLINE':
+            return str(len(Lines))
+        elif Command == 'GETCURRENTCOL':
+            return str(len(Lines[-1]) + 1)
+        elif Command == 'GETSELECTED':
+            return ''
+        elif Command == 'EDITPASTE':
+            Control.Text += Extra
+            self.Touch()
+            return ''
+        elif Command == 'ADDSTRING':
+            Items.append(Extra)
+            return ''
+        elif Command == 'DELSTRING':
+            Index = int(Extra)
+            if 0 <= Index < len(Items):
+                del Items[Index]
+                return ''
+            return self.__Fail__()
+        elif Command == 'FINDSTRING':
+            return str(next((I for I, Item in enumerate(Items) if str(Item).startswith(Extra)), -1))
+        elif Command == 'GETCURRENTSELECTION':
+            return str(Items[min(Control.Selected)]) if Control.Selected else self.__Fail__()
+        elif Command == 'SETCURRENTSELECTION':
+            Index = int(Extra)
+            if 0 <= Index < len(Items):
+                Control.Selected = {Index}
+                return ''
+            return self.__Fail__()
+        elif Command == 'SELECTSTRING':
+            Index = next((I for I, Item in enumerate(Items) if str(Item).startswith(Extra)), None)
+            if Index is None:
+                return self.__Fail__()
+            Control.Selected = {Index}
+            return ''
+        return self.__Fail__()
+
+    #-------------------------------------------------------------------------------
+
+    def __ListViewCommand__(self, Control, Command, Extra1, Extra2):
+        Rows = Control.Items
+
+        def Index(Value):
+            Res = int(Value)
+            if not 0 <= Res < len(Rows):
+                raise IndexError(Res)
+            return Res
+
+        def Range():
+            First = Index(Extra1)
+            return range(First, Index(Extra2) + 1 if Extra2 != '' else First + 1)
+
+        try:
+            if Command == 'GETITEMCOUNT':
+                return str(len(Rows))
+            elif Command == 'GETSUBITEMCOUNT':
+                return str(max((len(Row) for Row in Rows), default=0))
+            elif Command == 'GETTEXT':
+                Row = Rows[Index(Extra1)]
+                Column = int(Extra2 or 0)
+                return str(Row[Column]) if 0 <= Column < len(Row) else self.__Fail__()
+            elif Command == 'GETSELECTED':
+                Selected = sorted(Control.Selected)
+                if str(Extra1) == '1':
+                    return '|'.join(str(S) for S in Selected)
+                return str(Selected[0]) if Selected else ''
+            elif Command == 'GETSELECTEDCOUNT':
+                return str(len(Control.Selected))
+            elif Command == 'ISSELECTED':
+                return '1' if Index(Extra1) in Control.Selected else '0'
+            elif Command == 'SELECT':
+                Control.Selected.update(Range())
+                return ''
+            elif Command == 'DESELECT':
+                Control.Selected.difference_update(Range())
+                return ''
+            elif Command == 'SELECTALL':
+                Control.Selected = set(range(len(Rows)))
+                return ''
+            elif Command == 'SELECTCLEAR':
+                Control.Selected = set()
+                return ''
+            elif Command == 'SELECTINVERT':
+                Control.Selected = set(range(len(Rows))) - Control.Selected
+                return ''
+            elif Command == 'FINDITEM':
+                Column = int(Extra2 or 0)
+                return str(next((I for I, Row in enumerate(Rows) if len(Row) > Column and Row[Column] == Extra1),
+                                -1))
+            elif Command == 'VIEWCHANGE':
+                return ''
+        except (ValueError, IndexError):
+            pass
+        return self.__Fail__()
+
+    #-------------------------------------------------------------------------------
+
+    def __TreeItem__(self, Control, Path):
+        """
+            Элемент дерева по пути вида "#0|#3|#1" или "Текст|Текст", пустой путь - корень.
+        """
+        Item = Control.Tree
+        if Path == '':
+            return Item
+        for Part in Path.split('|'):
+            if Part.startswith('#') and Part[1:].isdigit():
+                Number = int(Part[1:])
+                if Number >= len(Item.Children):
+                    return None
+                Item = Item.Children[Number]
+            else:
+                Item = next((C for C in Item.Children if C.Text == Part), None)
+                if Item is None:
+                    return None
+        return Item
+
+    def __TreeViewCommand__(self, Control, Command, Extra1, Extra2):
+        Item = self.__TreeItem__(Control, Extra1)
+        if Command == 'EXISTS':
+            return '1' if Item is not None and Item is not Control.Tree else '0'
+        if Item is None:
+            return self.__Fail__()
+        if Command == 'GETITEMCOUNT':
+            return str(len(Item.Children))
+        elif Command == 'GETTEXT':
+            return Item.Text
+        elif Command == 'ISCHECKED':
+            return '1' if Item.Checked else '0'
+        elif Command in ('CHECK', 'UNCHECK'):
+            Item.Checked = Command == 'CHECK'
+            return ''
+        elif Command in ('EXPAND', 'COLLAPSE'):
+            Item.Expanded = Command == 'EXPAND'
+            return ''
+        elif Command == 'SELECT':
+            Control.Selected = {Extra1}
+            return ''
+        elif Command == 'GETSELECTED':
+            return next(iter(Control.Selected), '')
+        return self.__Fail__()
@@ -0,0 +1,211 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Разбор и приведение к каноническому виду строк описания окон и контролов в формате AutoIt
+("[CLASS:Edit; INSTANCE:1]").
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import namedtuple
+from functools import lru_cache
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Допустимые ключи в описании контрола, в порядке канонического вида.
+ControlSpecKeys = ('CLASS', 'REGEXPCLASS', 'CLASSNN', 'INSTANCE', 'NAME', 'ID', 'TEXT', 'HANDLE', 'X', 'Y', 'W', 'H')
+#: Допустимые ключи в описании окна, в порядке канонического вида.
+WinSpecKeys = ('HANDLE', 'TITLE', 'REGEXPTITLE', 'CLASS', 'REGEXPCLASS', 'INSTANCE', 'ACTIVE', 'LAST',
+               'X', 'Y', 'W', 'H')
+#: Ключи с целочисленными значениями.
+_IntKeys = frozenset(('INSTANCE', 'ID', 'X', 'Y', 'W', 'H'))
+#: Ключи без значений ("[ACTIVE]").
+_FlagKeys = frozenset(('ACTIVE', 'LAST'))
+#: Размер кэшей разбора.
+SpecCacheSize = 4096
+
+
+#-------------------------------------------------------------------------------
+
+class SpecError(ValueError):
+    """
+        Ошибка в строке описания окна или контрола.
+    """
+
+
+#-------------------------------------------------------------------------------
+
+class ParsedSpec(namedtuple('ParsedSpec', 'Kind, Fields, Canonical')):
+    """
+        Разобранное описание окна или контрола, неизменяемое.
+
+        * Kind - 'CONTROL' или 'WINDOW'.
+        * Fields - кортеж пар (КЛЮЧ, значение) в каноническом порядке, INSTANCE, ID, X, Y, W, H - числа.
+        * Canonical - канонический вид строки, например "[CLASS:Edit; INSTANCE:1]".
+
+        Одинаковые по смыслу описания, записанные по-разному (регистр ключей, пробелы, порядок, "INSTANCE:01"),
+        дают один и тот же объект.
+    """
+    __slots__ = ()
+
+    def Get(self, Key, Default=None):
+        """
+            Значение ключа Key (в любом регистре) или Default, если его нет.
+        """
+        Key = Key.upper()
+        for Name, Value in self.Fields:
+            if Name == Key:
+                return Value
+        return Default
+
+    def AsDict(self):
+        """
+            Поля в виде словаря {КЛЮЧ: значение}.
+        """
+        return dict(self.Fields)
+
+    def __str__(self):
+        return self.Canonical
+
+
+#-------------------------------------------------------------------------------
+
+def _SplitRecords(Body):
+    """
+        Разбить содержимое квадратных скобок на записи по ";", ";;" означает символ ";" внутри значения.
+    """
+    Records = []
+    Current = []
+    i, Length = 0, len(Body)
+    while i < Length:
+        Char = Body[i]
+        if Char == ';':
+            if i + 1 < Length and Body[i + 1] == ';':
+                Current.append(';')
+                i += 2
+                continue
+            Records.append(''.join(Current))
+            Current = []
+        else:
+            Current.append(Char)
+        i += 1
+    Records.append(''.join(Current))
+    return Records
+
+
+@lru_cache(maxsize=SpecCacheSize)
+def _Intern(Kind, Fields):
+    """
+        Внутренняя функция: один объект ParsedSpec на каждый канонический набор полей.
+    """
+    Records = []
+    for Key, Value in Fields:
+        Records.append(Key if Key in _FlagKeys else '{}:{}'.format(Key, str(Value).replace(';', ';;')))
+    return ParsedSpec(Kind, Fields, '[{}]'.format('; '.join(Records)))
+
+
+def _Parse(Spec, Kind, Keys):
+    """
+        Внутренняя функция: разбор строки описания с проверкой ошибок.
+    """
+    if not isinstance(Spec, str):
+        raise SpecError('Описание должно быть строкой, получено: {!r}'.format(Spec))
+    Stripped = Spec.strip()
+    if not (Stripped.startswith('[') and Stripped.endswith(']')):
+        raise SpecError('Описание должно быть заключено в квадратные скобки: {!r}'.format(Spec))
+    Found = dict()
+    for Record in _SplitRecords(Stripped[1:-1]):
+        Record = Record.strip()
+        if not Record:
+            continue
+        Key, Colon, Value = Record.partition(':')
+        Key, Value = Key.strip().upper(), Value.strip()
+        if Key not in Keys:
+            raise SpecError('Неизвестный ключ "{}" в описании {!r}, допустимы: {}'.format(
+                Key, Spec, ', '.join(Keys)))
+        if Key in Found:
+            raise SpecError('Ключ "{}" повторяется в описании {!r}'.format(Key, Spec))
+        if Key in _FlagKeys:
+            Value = True
+        elif not Colon:
+            raise SpecError('Нет значения у ключа "{}" в описании {!r}, нужно "{}:значение"'.format(Key, Spec, Key))
+        elif Key in _IntKeys:
+            try:
+                Value = int(Value)
+            except ValueError:
+                raise SpecError('Значение ключа "{}" должно быть целым числом, получено {!r} в описании {!r}'.format(
+                    Key, Value, Spec)) from None
+        Found[Key] = Value
+    return _Intern(Kind, tuple((Key, Found[Key]) for Key in Keys if Key in Found))
+
+
+#-------------------------------------------------------------------------------
+
+@lru_cache(maxsize=SpecCacheSize)
+def ParseControlSpec(Spec):
+    """
+        Разобрать описание контрола вида "[CLASS:Edit; INSTANCE:1]". Результат кэшируется.
+
+        Возвращает ParsedSpec, при ошибке в описании вызывает SpecError (наследник ValueError) с объяснением.
+    """
+    return _Parse(Spec, 'CONTROL', ControlSpecKeys)
+
+
+@lru_cache(maxsize=SpecCacheSize)
+def ParseWinSpec(Spec):
+    """
+        Разобрать описание окна вида "[TITLE:Без имени; CLASS:Notepad]". Результат кэшируется.
+
+        Возвращает ParsedSpec, при ошибке в описании вызывает SpecError (наследник ValueError) с объяснением.
+    """
+    return _Parse(Spec, 'WINDOW', WinSpecKeys)
+
+
+#-------------------------------------------------------------------------------
+
+def CanonicalControlSpec(Spec):
+    """
+        Канонический вид описания контрола. Строки не в квадратных скобках (ClassNN, текст, ID) возвращаются
+        без изменений, ошибочные описания вызывают SpecError.
+    """
+    if isinstance(Spec, str) and not Spec.startswith('['):
+        return Spec
+    return ParseControlSpec(Spec).Canonical
+
+
+def CanonicalWinSpec(Title):
+    """
+        Канонический вид заголовка окна. Строки не в квадратных скобках (начало заголовка) возвращаются
+        без изменений, ошибочные описания вызывают SpecError.
+    """
+    if isinstance(Title, str) and not Title.startswith('['):
+        return Title
+    return ParseWinSpec(Title).Canonical
+
+
+#-------------------------------------------------------------------------------
+
+def SpecHandle(Title, Text=''):
+    """
+        Handle окна из заголовка, в котором задан только Handle ("[HANDLE:0x10010]"), без вызова DLL.
+        Возвращает строку Handle как она записана или None, если заголовок другой (или задан текст окна).
+    """
+    if Text or not isinstance(Title, str) or not Title.startswith('[HANDLE'):
+        return None
+    try:
+        Fields = ParseWinSpec(Title).Fields
+    except SpecError:
+        return None
+    return Fields[0][1] if len(Fields) == 1 and Fields[0][0] == 'HANDLE' else None
+
+
+def HandleNumber(Handle):
+    """
+        Handle окна (строка "0x10010", как ее возвращает AutoItX.WinGetHandle) в виде числа, чтобы разные записи
+        одного Handle ("0x10010" и "0x0000000000010010") совпадали. Если строку не разобрать - она сама.
+    """
+    try:
+        return int(Handle, 16)
+    except (TypeError, ValueError):
+        return Handle
@@ -0,0 +1,218 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Таблица состояний многих окон: хранение в одном массиве и запросы по битовым маскам.
+"""
+
+# -------------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import compress
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ._AutomationMod import WinState
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Маска всех признаков состояния окна.
+StateTableMask = sum(WinState.__StatesDict__.values())
+
+
+#-------------------------------------------------------------------------------
+
+@lru_cache(maxsize=256)
+def _MatchTable(Set, Clear):
+    """
+        Таблица перекодировки для bytes.translate: 1 для состояний, у которых установлены все биты Set и сброшены
+        все биты Clear, иначе 0.
+    """
+    return bytes(1 if Value & Set == Set and not Value & Clear else 0 for Value in range(256))
+
+
+@lru_cache(maxsize=256)
+def _AnyTable(Bits):
+    """
+        Таблица перекодировки для bytes.translate: 1 для байтов, в которых установлен хоть один из битов Bits.
+    """
+    return bytes(1 if Value & Bits else 0 for Value in range(256))
+
+
+#-------------------------------------------------------------------------------
+
+class WinStateTable:
+    """
+        Состояния многих окон в одном массиве: числовые значения WinGetState хранятся по байту на окно
+        (bytearray), а запросы "какие окна VISIBLE, но не ENABLED" и "какие окна поменяли состояние" выполняются
+        над всем массивом сразу (bytes.translate, операции над целыми числами, itertools.compress), без создания
+        WinState на каждое окно. Объекты WinState создаются только по запросу (Table[i]).
+
+        Параметры конструктора:
+
+        * Titles - список заголовков окон в формате AutoIt (или строк "[HANDLE:...]").
+        * Automat=None - объект AutoItX, нужен для Refresh.
+        * States=None - начальные состояния (последовательность чисел той же длины), по умолчанию все 0.
+
+        Свойства:
+
+        * Titles - список заголовков.
+        * States - bytearray с состояниями.
+        * Previous - состояния до последнего Refresh (bytes) или None.
+
+        Признаки в запросах задаются числом, строкой вида "VISIBLE, ENABLED", объектом WinState или списком имен.
+    """
+
+    def __init__(self, Titles, Automat=None, States=None):
+        self.Titles = list(Titles)
+        self.Automat = Automat
+        if States is None:
+            self.States = bytearray(len(self.Titles))
+        else:
+            self.States = bytearray(State & 0xFF for State in States)
+            if len(self.States) != len(self.Titles):
+                raise ValueError('Число состояний ({}) не совпадает с числом окон ({})'.format(
+                    len(self.States), len(self.Titles)))
+        self.Previous = None
+
+    #-------------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.States)
+
+    def __getitem__(self, Index):
+        """
+            Состояние окна с номером Index в виде WinState.
+        """
+        return WinState(self.States[Index])
+
+    #-------------------------------------------------------------------------------
+
+    @staticmethod
+    def Mask(Flags):
+        """
+            Преобразовать набор признаков (число, строку, WinState или список имен) в битовую маску.
+        """
+        if isinstance(Flags, WinState):
+            return Flags.StateNum
+        if isinstance(Flags, int):
+            return Flags
+        if isinstance(Flags, str):
+            return WinState.__StringToState__(Flags)
+        return WinState.__StringToState__(','.join(Flags))
+
+    #-------------------------------------------------------------------------------
+
+    def Refresh(self, Text='', Workers=0):
+        """
+            Опросить состояния всех окон (по одному вызову AU3_WinGetState на окно). Прежние состояния сохраняются
+            в Previous, чтобы можно было узнать, что изменилось (Changed, Diff).
+
+            * Text='' - Текст, содержащийся в окнах.
+            * Workers=0 - число потоков для опроса, 0 - опрашивать последовательно.
+
+            Возвращает self.
+        """
+        GetState = self.Automat.__AutoItDLL__.AU3_WinGetState
+        self.Previous = bytes(self.States)
+        if Workers > 0:
+            with ThreadPoolExecutor(Workers) as Pool:
+                New = list(Pool.map(lambda Title: GetState(Title, Text), self.Titles))
+        else:
+            New = list(GetState(Title, Text) for Title in self.Titles)
+        self.States[:] = bytes(State & 0xFF for State in New)
+        return self
+
+    #-------------------------------------------------------------------------------
+
+    def Snapshot(self):
+        """
+            Копия таблицы с текущими состояниями (для сравнения с будущими через Changed/Diff).
+        """
+        return WinStateTable(self.Titles, self.Automat, self.States)
+
+    #-------------------------------------------------------------------------------
+
+    def Match(self, Set=0, Clear=0):
+        """
+            Проверить все окна сразу: у окна должны быть установлены все признаки Set и сброшены все признаки Clear.
+            Возвращает bytearray, по байту на окно: 1 - подходит, 0 - нет.
+        """
+        Set, Clear = self.Mask(Set), self.Mask(Clear)
+        return self.States.translate(_MatchTable(Set, Clear))
+
+    def Where(self, Set=0, Clear=0):
+        """
+            Номера окон, у которых установлены все признаки Set и сброшены все признаки Clear, например:
+            Table.Where('VISIBLE', 'ENABLED') - видимые, но отключенные окна.
+        """
+        return list(compress(range(len(self.States)), self.Match(Set, Clear)))
+
+    def Select(self, Set=0, Clear=0):
+        """
+            То же, что Where, но возвращает заголовки окон.
+        """
+        return list(compress(self.Titles, self.Match(Set, Clear)))
+
+    def Count(self, Set=0, Clear=0):
+        """
+            Число окон, у которых установлены все признаки Set и сброшены все признаки Clear.
+        """
+        return self.Match(Set, Clear).count(1)
+
+    def Decode(self):
+        """
+            Разложить состояния на признаки: словарь {имя признака: bytearray с 0/1 по окнам}.
+        """
+        return dict((Name, self.States.translate(_AnyTable(Bit)))
+                    for Name, Bit in WinState.__StatesDict__.items())
+
+    #-------------------------------------------------------------------------------
+
+    def __ChangedBits__(self, Other):
+        """
+            Внутренний метод: bytes с побитовым XOR состояний self и Other (по умолчанию Previous).
+        """
+        if Other is None:
+            Other = self.Previous
+            if Other is None:
+                raise ValueError('Нет предыдущих состояний: вызовите Refresh или передайте таблицу для сравнения')
+        elif isinstance(Other, WinStateTable):
+            Other = Other.States
+        if len(Other) != len(self.States):
+            raise ValueError('Таблицы разной длины: {} и {}'.format(len(Other), len(self.States)))
+        Length = len(self.States)
+        return (int.from_bytes(self.States, 'little') ^ int.from_bytes(Other, 'little')).to_bytes(Length, 'little')
+
+    def Changed(self, Other=None, Flags=StateTableMask):
+        """
+            Номера окон, у которых изменился хотя бы один из признаков Flags по сравнению с Other.
+
+            * Other=None - таблица WinStateTable или последовательность байт состояний, по умолчанию Previous.
+            * Flags=StateTableMask - какие признаки учитывать (по умолчанию все).
+        """
+        Bits = self.__ChangedBits__(Other).translate(_AnyTable(self.Mask(Flags)))
+        return list(compress(range(len(self.States)), Bits))
+
+    def Diff(self, Other=None, Flags=StateTableMask):
+        """
+            Изменения по сравнению с Other (по умолчанию Previous): список кортежей
+            (номер окна, заголовок, прежнее состояние, новое состояние), состояния - числа.
+        """
+        Old = self.Previous if Other is None else (Other.States if isinstance(Other, WinStateTable) else Other)
+        return list((Index, self.Titles[Index], Old[Index], self.States[Index])
+                    for Index in self.Changed(Other, Flags))
+
+    #-------------------------------------------------------------------------------
+
+    def AsArray(self):
+        """
+            Состояния в виде массива numpy (uint8), без копирования. Требует numpy.
+        """
+        if numpy is None:
+            raise ImportError('Для AsArray нужен пакет numpy')
+        return numpy.frombuffer(self.States, dtype=numpy.uint8)
@@ -0,0 +1,188 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Чтение новых строк многострочного Edit (журналы, логи) без перечитывания всего текста.
+"""
+
+# -------------------------------------------------------------------------------
+
+from threading import Event
+from time import perf_counter
+
+from ._AutomationMod import WinHandle
+
+
+#-------------------------------------------------------------------------------
+
+class ControlTextFollower:
+    """
+        Слежение за концом текста многострочного Edit, как "tail -f".
+
+        ControlGetText обрезает текст до 4095 символов и при каждом опросе копирует его целиком. Здесь же опрос -
+        это ControlCommand "GetLineCount", проверка последней прочитанной строки ("GetLine") и чтение только
+        появившихся строк, так что копируется O(новый текст), а не O(весь текст). Строки читаются с буфером на
+        65535 символов, а не на 255, как у AutoItX.ControlCommand.
+
+        Последняя строка контрола может быть еще не дописана, поэтому она выдается, только когда после нее
+        появится следующая (или при Poll(Last=True)). Если строк стало меньше, чем прочитано, или последняя
+        прочитанная строка изменилась, считается, что контрол очищен или текст заменен: чтение начинается
+        с первой строки, счетчик Resets увеличивается.
+
+        Интервал опроса, как в WinWaiter: после опроса с новыми строками - MinInterval, после опроса без них
+        растет в Factor раз до MaxInterval. Если бэкенд сообщает об изменениях (Subscribe/Unsubscribe, как
+        SimulatedBackend), ожидание прерывается сразу по событию.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Title - Заголовок окна в формате AutoIt.
+        * Control - Идентификатор контрола в формате AutoIt.
+        * Text='' - Текст, содержащийся в окне.
+        * FromStart=False - выдать и строки, которые уже есть в контроле (иначе - только новые).
+        * MinInterval=0.01, MaxInterval=1.0 - границы интервала опроса в секундах.
+        * Factor=2.0 - во сколько раз увеличивается интервал после опроса без новых строк.
+        * Events=True - прерывать ожидание по событиям бэкенда, если он их поддерживает.
+
+        Свойства:
+
+        * Position - число прочитанных строк.
+        * Interval - текущий интервал опроса.
+        * Resets - сколько раз контрол был очищен (или текст заменен).
+        * Chars - сколько символов прочитано за все время.
+    """
+
+    def __init__(self, Automat, Title, Control, Text='', FromStart=False, MinInterval=0.01, MaxInterval=1.0,
+                 Factor=2.0, Events=True):
+        self.Automat = Automat
+        self.Title = Title
+        self.Control = Control
+        self.Text = Text
+        self.MinInterval = min(MinInterval, MaxInterval)
+        self.MaxInterval = MaxInterval
+        self.Factor = Factor
+        self.Interval = self.MinInterval
+        self.Position = 0
+        self.Resets = 0
+        self.Chars = 0
+        self.__Target__ = None
+        #Последняя прочитанная строка - для обнаружения замены текста.
+        self.__LastLine__ = None
+        #Последняя прочитанная строка выдана недописанной (Poll(Last=True)).
+        self.__Partial__ = False
+        Backend = Automat.__AutoItDLL__
+        self.Notifier = Backend if Events and hasattr(Backend, 'Subscribe') else None
+        if not FromStart:
+            Count = self.LineCount()
+            if Count > 1:
+                self.Position = Count - 1
+                self.__LastLine__ = self.__Line__(self.Position)
+
+    #-------------------------------------------------------------------------------
+
+    def Resolve(self):
+        """
+            Найти окно и контрол заново (например, после пересоздания окна). Возвращает True, если контрол найден.
+        """
+        Win = self.Automat.WinGetHandle(self.Title, self.Text)
+        Ctrl = self.Automat.ControlGetHandle(WinHandle(Win), self.Control) if Win else None
+        self.__Target__ = (WinHandle(Win), WinHandle(Ctrl)) if Ctrl else None
+        return self.__Target__ is not None
+
+    def __Command__(self, Command, Extra='', Check=False):
+        """
+            Внутренний метод: команда AU3_ControlCommand по найденным Handle, строка результата.
+            Check=True - проверить признак ошибки (лишний вызов DLL) и при ошибке вернуть None.
+        """
+        if self.__Target__ is None and not self.Resolve():
+            return None
+        Win, Ctrl = self.__Target__
+        Res = self.Automat.__ReadString__(self.Automat.__AutoItDLL__.AU3_ControlCommand, 65535, Win, '', Ctrl,
+                                          Command, Extra).value
+        return None if Check and self.Automat.Error() else Res
+
+    def __Line__(self, Number):
+        """
+            Внутренний метод: строка с номером Number (с 1).
+        """
+        Res = self.__Command__('GetLine', str(Number)) or ''
+        self.Chars += len(Res)
+        return Res
+
+    def LineCount(self):
+        """
+            Число строк в контроле, 0 - если контрол не найден.
+        """
+        Res = self.__Command__('GetLineCount', '', True)
+        if Res is None and self.Resolve():
+            Res = self.__Command__('GetLineCount', '', True)
+        return int(Res or 0)
+
+    #-------------------------------------------------------------------------------
+
+    def Poll(self, Last=False):
+        """
+            Прочитать новые строки.
+
+            * Last=False - выдать и последнюю строку контрола, даже если она, возможно, еще дописывается.
+            Выданная так строка больше не выдается, даже если потом изменится.
+
+            Возвращает список новых строк (пустой, если их нет) и обновляет Interval.
+        """
+        Count = self.LineCount()
+        if self.Position > Count:
+            self.__Reset__()
+        elif self.Position:
+            Line = self.__Line__(self.Position)
+            if Line != self.__LastLine__:
+                #Выданная недописанной строка могла только дописаться - это не замена текста.
+                if self.__Partial__ and Line.startswith(self.__LastLine__):
+                    self.__LastLine__ = Line
+                else:
+                    self.__Reset__()
+        Stop = Count if Last else Count - 1
+        Lines = list(self.__Line__(Number) for Number in range(self.Position + 1, Stop + 1))
+        if Lines:
+            self.Position += len(Lines)
+            self.__LastLine__ = Lines[-1]
+            self.__Partial__ = Last
+            self.Interval = self.MinInterval
+        else:
+            self.Interval = min(self.Interval * self.Factor, self.MaxInterval)
+        return Lines
+
+    def __Reset__(self):
+        """
+            Внутренний метод: контрол очищен или текст заменен - читать с первой строки.
+        """
+        self.Position = 0
+        self.__LastLine__ = None
+        self.__Partial__ = False
+        self.Resets += 1
+
+    def Follow(self, Timeout=None):
+        """
+            Следить за контролом и выдавать новые строки по мере появления.
+
+            * Timeout=None - сколько секунд следить, None - без ограничения.
+
+            Генератор, выдает строки по одной.
+        """
+        Wake = Event()
+        OnChange = Wake.set
+        if self.Notifier:
+            self.Notifier.Subscribe(OnChange)
+        try:
+            End = perf_counter() + Timeout if Timeout is not None else None
+            while True:
+                Wake.clear()
+                yield from self.Poll()
+                Now = perf_counter()
+                if End is not None and Now >= End:
+                    return
+                Wake.wait(self.Interval if End is None else min(self.Interval, End - Now))
+        finally:
+            if self.Notifier:
+                self.Notifier.Unsubscribe(OnChange)
+
+    __iter__ = Follow
@@ -0,0 +1,310 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Ленивая модель дерева SysTreeView32 поверх ControlTreeView с кэшированием узлов.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import deque
+
+from ._AutomationMod import WinHandle
+
+
+#-------------------------------------------------------------------------------
+
+class TreeViewNode:
+    """
+        Узел модели TreeViewModel. Дочерние узлы запрашиваются у контрола только при первом обращении к ним
+        (Expand, Children, перебор узла), дальше берутся из кэша.
+
+        Свойства:
+
+        * Model - модель, которой принадлежит узел.
+        * Parent - родительский узел, None у корня.
+        * Index - номер узла среди детей родителя.
+        * Path - путь вида "#0|#3|#1", у корня - пустая строка.
+        * Text - текст узла (читается при первом обращении).
+        * TextPath - путь из текстов вида "Папка|Файл".
+        * Loaded - загружены ли дочерние узлы.
+    """
+    __slots__ = ('Model', 'Parent', 'Index', 'Path', '__Text__', '__Children__')
+
+    def __init__(self, Model, Parent, Index):
+        self.Model = Model
+        self.Parent = Parent
+        self.Index = Index
+        if Parent is None:
+            self.Path = ''
+        else:
+            self.Path = '#{}'.format(Index) if not Parent.Path else '{}|#{}'.format(Parent.Path, Index)
+        self.__Text__ = None
+        self.__Children__ = None
+
+    #-------------------------------------------------------------------------------
+
+    @property
+    def Text(self):
+        if self.__Text__ is None:
+            self.__Text__ = self.Model.__Command__('GetText', self.Path) or ''
+        return self.__Text__
+
+    @property
+    def TextPath(self):
+        if self.Parent is None:
+            return ''
+        return self.Text if self.Parent.Parent is None else '{}|{}'.format(self.Parent.TextPath, self.Text)
+
+    @property
+    def Loaded(self):
+        return self.__Children__ is not None
+
+    @property
+    def Children(self):
+        return self.Expand()
+
+    def Expand(self):
+        """
+            Загрузить дочерние узлы (если еще не загружены) и добавить их в индекс текстовых путей модели (см.
+            TreeViewModel.__Discovered__). Возвращает список дочерних узлов.
+        """
+        if self.__Children__ is None:
+            Count = int(self.Model.__Command__('GetItemCount', self.Path) or 0)
+            self.__Children__ = list(self.Model.__Node__(self, Index) for Index in range(Count))
+            self.Model.__Discovered__(self)
+        return self.__Children__
+
+    def Child(self, Index):
+        """
+            Дочерний узел с номером Index, None - если его нет. Если дети еще не загружены, остальные дети не
+            запрашиваются.
+        """
+        if self.__Children__ is not None:
+            return self.__Children__[Index] if 0 <= Index < len(self.__Children__) else None
+        return self.Model.__Node__(self, Index, True)
+
+    def Invalidate(self):
+        """
+            Забыть текст узла и загруженное поддерево (после изменений в контроле).
+        """
+        self.Model.__Forget__(self)
+
+    #-------------------------------------------------------------------------------
+
+    def __iter__(self):
+        return iter(self.Expand())
+
+    def __len__(self):
+        return len(self.Expand())
+
+    def __bool__(self):
+        #Иначе bool(Node) вызывал бы __len__, загружая детей, а узел без детей был бы ложным.
+        return True
+
+    def Walk(self, BreadthFirst=False, MaxDepth=None):
+        """
+            Обойти поддерево узла (без самого узла), загружая его по мере обхода.
+
+            * BreadthFirst=False - обход в глубину (в порядке отображения дерева), True - в ширину.
+            * MaxDepth=None - наибольшая глубина относительно узла (1 - только дети), None - без ограничения.
+
+            Генератор, выдает узлы.
+        """
+        Queue = deque((Child, 1) for Child in self.Expand())
+        while Queue:
+            Node, Depth = Queue.popleft()
+            yield Node
+            if MaxDepth is None or Depth < MaxDepth:
+                Children = list((Child, Depth + 1) for Child in Node.Expand())
+                if BreadthFirst:
+                    Queue.extend(Children)
+                else:
+                    Queue.extendleft(reversed(Children))
+
+    def __repr__(self):
+        return 'TreeViewNode({!r}, {!r})'.format(self.Path, self.__Text__)
+
+
+#-------------------------------------------------------------------------------
+
+class TreeViewModel:
+    """
+        Ленивая модель дерева SysTreeView32.
+
+        Каждый узел запрашивает детей у контрола (GetItemCount и GetText через AU3_ControlTreeView) только при
+        первом обращении, после чего поддерево берется из кэша, а повторные обходы не стоят ни одного вызова DLL.
+        Узлы по путям "#0|#3|#1" запоминаются, текстовые пути ("Папка|Файл") попадают в индекс по мере загрузки
+        узлов, поэтому поиск по уже виденному пути - одно обращение к словарю. Окно и контрол находятся один раз,
+        команды идут по Handle.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * Title - Заголовок окна в формате AutoIt.
+        * Control - Идентификатор контрола в формате AutoIt.
+        * Text='' - Текст, содержащийся в окне.
+        * PrefetchDepth=0 - сразу загрузить в ширину столько уровней дерева (см. Prefetch), None - все.
+
+        Свойства:
+
+        * Root - корень дерева (невидимый узел с путем "", его дети - узлы верхнего уровня).
+        * Calls - число вызовов AU3_ControlTreeView за все время.
+
+        Изменения в контроле модель сама не замечает, после них нужно вызвать Invalidate для измененного узла или
+        всей модели.
+    """
+
+    def __init__(self, Automat, Title, Control, Text='', PrefetchDepth=0):
+        self.Automat = Automat
+        self.Title = Title
+        self.Control = Control
+        self.Text = Text
+        self.Calls = 0
+        self.__Target__ = None
+        self.Root = TreeViewNode(self, None, 0)
+        #: {путь "#0|#3": узел}
+        self.__Nodes__ = {'': self.Root}
+        #: {текстовый путь: узел}
+        self.__TextIndex__ = dict()
+        if PrefetchDepth != 0:
+            self.Prefetch(MaxDepth=PrefetchDepth)
+
+    #-------------------------------------------------------------------------------
+
+    def Resolve(self):
+        """
+            Найти окно и контрол заново (например, после пересоздания окна). Возвращает True, если контрол найден.
+        """
+        Win = self.Automat.WinGetHandle(self.Title, self.Text)
+        Ctrl = self.Automat.ControlGetHandle(WinHandle(Win), self.Control) if Win else None
+        self.__Target__ = (WinHandle(Win), WinHandle(Ctrl)) if Ctrl else None
+        return self.__Target__ is not None
+
+    def __Command__(self, Command, Path, Extra2=''):
+        """
+            Внутренний метод: команда AU3_ControlTreeView по найденным Handle, строка результата или None.
+        """
+        if self.__Target__ is None and not self.Resolve():
+            return None
+        Win, Ctrl = self.__Target__
+        self.Calls += 1
+        Res = self.Automat.__ReadString__(self.Automat.__AutoItDLL__.AU3_ControlTreeView, 65535, Win, '', Ctrl,
+                                          Command, Path, Extra2).value
+        return Res if Res != '' else None
+
+    def __Node__(self, Parent, Index, Check=False):
+        """
+            Внутренний метод: узел-потомок Parent с номером Index, один объект на каждый путь.
+            Check=True - проверить (командой Exists) существование еще не виденного узла, None - если его нет.
+        """
+        Path = '#{}'.format(Index) if not Parent.Path else '{}|#{}'.format(Parent.Path, Index)
+        Node = self.__Nodes__.get(Path)
+        if Node is None:
+            if Check and self.__Command__('Exists', Path) != '1':
+                return None
+            Node = self.__Nodes__[Path] = TreeViewNode(self, Parent, Index)
+        return Node
+
+    def __First__(self, Node):
+        """
+            Внутренний метод: является ли узел первым в порядке дерева узлом со своим текстовым путем, т.е. тем,
+            который найдет AutoIt. Это так, если он первый среди братьев со своим текстом и то же верно для всех
+            его предков. Если братья какого-либо уровня еще не загружены - ответ False.
+        """
+        while Node.Parent is not None:
+            Siblings = Node.Parent.__Children__
+            if Siblings is None or next(Other for Other in Siblings if Other.Text == Node.Text) is not Node:
+                return False
+            Node = Node.Parent
+        return True
+
+    def __Discovered__(self, Parent):
+        """
+            Внутренний метод: добавить в индекс текстовых путей только что загруженных детей Parent. Как в AutoIt,
+            текстовый путь ведет к первому в порядке дерева узлу, поэтому дети индексируются, только если Parent -
+            первый узел со своим текстовым путем, и из детей с одинаковым текстом в индекс попадает первый.
+        """
+        if not self.__First__(Parent):
+            return
+        if Parent.Parent is not None:
+            #Запись самого Parent могла быть удалена Invalidate.
+            self.__TextIndex__.setdefault(Parent.TextPath, Parent)
+        for Child in Parent.__Children__:
+            self.__TextIndex__.setdefault(Child.TextPath, Child)
+
+    def __Forget__(self, Node):
+        """
+            Внутренний метод: забыть текст узла и его поддерево.
+        """
+        Prefix = Node.Path + '|' if Node.Path else ''
+
+        def Inside(Path):
+            return Path != Node.Path and Path.startswith(Prefix)
+
+        for Path in list(Path for Path in self.__Nodes__ if Inside(Path)):
+            del self.__Nodes__[Path]
+        #Текстовые пути могли измениться у всего поддерева, включая сам узел.
+        for Key in list(Key for Key, Other in self.__TextIndex__.items() if Other is Node or Inside(Other.Path)):
+            del self.__TextIndex__[Key]
+        Node.__Children__ = None
+        if Node.Parent is not None:
+            Node.__Text__ = None
+
+    #-------------------------------------------------------------------------------
+
+    def Node(self, Path):
+        """
+            Узел по пути вида "#0|#3|#1" или "Папка|Файл" (части можно смешивать). Запрашиваются только узлы на
+            пути: для номера - сам узел, для текста - дети предыдущего узла. Возвращает None, если узла нет.
+        """
+        Node = self.__Nodes__.get(Path)
+        if Node is None:
+            Node = self.__TextIndex__.get(Path)
+        if Node is not None:
+            return Node
+        Node = self.Root
+        for Part in Path.split('|'):
+            if Part.startswith('#') and Part[1:].isdigit():
+                Index = int(Part[1:])
+                if Node.Loaded:
+                    Node = Node.Children[Index] if Index < len(Node.Children) else None
+                else:
+                    Node = self.__Node__(Node, Index, True)
+            else:
+                Node = next((Child for Child in Node.Expand() if Child.Text == Part), None)
+            if Node is None:
+                return None
+        return Node
+
+    def Find(self, TextPath):
+        """
+            Узел по текстовому пути "Папка|Файл", см. Node.
+        """
+        return self.Node(TextPath)
+
+    def Prefetch(self, Node=None, MaxDepth=None, MaxNodes=None):
+        """
+            Загрузить поддерево в ширину: сначала все узлы первого уровня, затем второго и т.д.
+
+            * Node=None - откуда начинать, None - от корня.
+            * MaxDepth=None - сколько уровней загрузить, None - все.
+            * MaxNodes=None - остановиться, загрузив столько узлов, None - без ограничения.
+
+            Возвращает число узлов в загруженной части поддерева.
+        """
+        Node = self.Root if Node is None else Node
+        Count = 0
+        for Count, Child in enumerate(Node.Walk(True, MaxDepth), 1):
+            if MaxNodes is not None and Count >= MaxNodes:
+                break
+        return Count
+
+    def Invalidate(self, Node=None):
+        """
+            Забыть узел Node с поддеревом (None - всю модель), они будут заново запрошены у контрола.
+        """
+        self.__Forget__(self.Root if Node is None else Node)
+
+    def __iter__(self):
+        return iter(self.Root)
@@ -0,0 +1,126 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Ожидание состояний окон с адаптивным интервалом опроса и мгновенным пробуждением по событиям бэкенда.
+"""
+
+# -------------------------------------------------------------------------------
+
+from collections import namedtuple
+from threading import Event
+from time import perf_counter
+
+from ._AutomationMod import WinState
+
+# -------------------------------------------------------------------------------
+#Определения
+#: Результат ожидания WinWaiter.Wait:
+#: Status - 1 дождались, 0 время вышло, -1 окна нет (или оно пропало);
+#: Elapsed - сколько секунд прошло с начала ожидания;
+#: Latency - задержка обнаружения в секундах до опроса, который обнаружил нужное состояние: если после
+#: предыдущего опроса пришло событие бэкенда - время от первого такого события (момента изменения), иначе -
+#: время от предыдущего опроса, т.е. только верхняя граница задержки;
+#: State - последнее полученное состояние окна в числовом виде;
+#: Polls - сколько раз опрашивалось состояние окна.
+WaitResult = namedtuple('WaitResult', 'Status, Elapsed, Latency, State, Polls')
+#: Маска всех признаков состояния окна.
+AllStatesMask = sum(WinState.__StatesDict__.values())
+
+
+#-------------------------------------------------------------------------------
+
+class WinWaiter:
+    """
+        Ожидание перехода окна в заданное состояние.
+
+        Состояние опрашивается одним вызовом AU3_WinGetState на такт (он же говорит, существует ли окно),
+        интервал между опросами начинается с MinInterval и растет в Factor раз до MaxInterval, пока состояние не
+        меняется, а при любом изменении состояния снова сбрасывается до MinInterval.
+        Если источник событий (Notifier) умеет сообщать об изменениях, то ожидание прерывается сразу по событию.
+
+        Параметры конструктора:
+
+        * Automat - объект AutoItX.
+        * MinInterval=0.005 - минимальный интервал опроса в секундах.
+        * MaxInterval=0.25 - максимальный интервал опроса в секундах.
+        * Factor=2.0 - во сколько раз увеличивается интервал после каждого опроса без изменений.
+        * Notifier=None - источник событий об изменениях: объект с методами Subscribe(Callback) и
+        Unsubscribe(Callback), Callback вызывается без параметров при любом изменении окон. Если не задан, то
+        используется бэкенд AutoItX, при условии, что у него есть такие методы (как у SimulatedBackend).
+        * Events=True - использовать ли события вообще. Если False - только опрос.
+    """
+
+    def __init__(self, Automat, MinInterval=0.005, MaxInterval=0.25, Factor=2.0, Notifier=None, Events=True):
+        self.Automat = Automat
+        self.MinInterval = min(MinInterval, MaxInterval)
+        self.MaxInterval = MaxInterval
+        self.Factor = Factor
+        if Notifier is None:
+            Notifier = Automat.__AutoItDLL__
+        self.Notifier = Notifier if Events and hasattr(Notifier, 'Subscribe') else None
+
+    #-------------------------------------------------------------------------------
+
+    def Wait(self, Title, State, Timeout=None, Text='', Mask=AllStatesMask):
+        """
+            Дождаться состояния окна.
+
+            * Title - Заголовок окна в формате AutoIt.
+            * State - Состояние окна, которого необходимо дождаться: число (как у WinGetState), строка с
+            перечислением признаков, например "ENABLED, VISIBLE, ACTIVE", или объект WinState.
+            * Timeout=None - Время ожидания в секундах, None - без ограничения.
+            * Text='' - Текст, содержащийся в окне.
+            * Mask=AllStatesMask - какие признаки сравнивать, например, WinState('VISIBLE, ENABLED').StateNum,
+            чтобы не обращать внимания на ACTIVE и прочие. По умолчанию состояние должно совпасть полностью.
+
+            Возвращает WaitResult.
+        """
+        Target = (State if isinstance(State, WinState) else WinState(State)).StateNum & Mask
+        Backend = self.Automat.__AutoItDLL__
+        Exists = WinState.__StatesDict__['EXISTS']
+        Wake = Event()
+        #Время первого события после последнего опроса, None - событий не было.
+        FirstEvent = [None]
+
+        def OnChange():
+            if FirstEvent[0] is None:
+                FirstEvent[0] = perf_counter()
+            Wake.set()
+
+        if self.Notifier:
+            self.Notifier.Subscribe(OnChange)
+        try:
+            Start = perf_counter()
+            Deadline = Start + Timeout if Timeout is not None else None
+            Interval = self.MinInterval
+            PrevPoll = Start
+            PrevState = None
+            Polls = 0
+            while True:
+                Wake.clear()
+                Changed, FirstEvent[0] = FirstEvent[0], None
+                #Функция берется у бэкенда на каждом опросе: профилировщик может подменить ее на ходу.
+                CurState = Backend.AU3_WinGetState(Title, Text)
+                Now = perf_counter()
+                Polls += 1
+                if not CurState & Exists:
+                    return WaitResult(-1, Now - Start, 0.0, CurState, Polls)
+                if CurState & Mask == Target:
+                    if Polls == 1:
+                        Latency = 0.0
+                    else:
+                        Latency = Now - (Changed if Changed is not None else PrevPoll)
+                    return WaitResult(1, Now - Start, Latency, CurState, Polls)
+                if Deadline is not None and Now >= Deadline:
+                    return WaitResult(0, Now - Start, 0.0, CurState, Polls)
+                if PrevState is not None and CurState != PrevState:
+                    Interval = self.MinInterval
+                else:
+                    Interval = min(Interval * self.Factor, self.MaxInterval) if Polls > 1 else Interval
+                PrevState = CurState
+                PrevPoll = Now
+                Wake.wait(Interval if Deadline is None else min(Interval, Deadline - Now))
+        finally:
+            if self.Notifier:
+                self.Notifier.Unsubscribe(OnChange)
@@ -6,4 +6,21 @@
 
 Версия: 0.9.5 beta
 """
-from ._AutomationMod import *
\ No newline at end of file
+from ._AutomationMod import *
+from ._SimulationMod import *
+from ._WaitMod import *
+from ._AsyncMod import *
+from ._HandleCacheMod import *
+from ._SendMod import *
+from ._ProfileMod import *
+from ._StateTableMod import *
+from ._SpecMod import *
+from ._LayoutMod import *
+from ._PixelMod import *
+from ._ImageMod import *
+from ._RegionWatchMod import *
+from ._ControlTreeMod import *
+from ._ListViewMod import *
+from ._TreeViewMod import *
+from ._TextFollowMod import *
+from ._ActionQueueMod import *
@@ -0,0 +1,1167 @@
+#coding=utf-8
+"""
+Создан: 18.10.2026
+
+Замеры скорости PyAutoItPy на имитационном бэкенде (SimulatedBackend), работают без Windows.
+
+Запуск всех замеров:
+    python benchmark.py
+Запуск отдельных замеров по именам:
+    python benchmark.py HotPaths
+"""
+import sys
+import tracemalloc
+import asyncio
+from ctypes import CDLL, util, c_long, c_void_p, create_unicode_buffer
+from functools import wraps
+from collections import OrderedDict
+from threading import Timer, Thread
+from time import perf_counter, sleep
+from PyAutoItPy import AutoItX, SimulatedBackend, CustomWinDLL, AutoItCall, AutoItCallModes, WinWaiter, SW, \
+    AsyncAutoItX, WinHandleCache, Profiler, WinState, WinStateTable, WinParams, ControlParams, WinRect, \
+    ParseControlSpec, CanonicalControlSpec, LayoutCache, FindColors, ImageFromBytes, ImageTemplate, FindTemplate, \
+    RegionWatcher, ListViewReader, ListViewWatcher, TreeViewModel, \
+    ControlTextFollower, ActionQueue
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#-------------------------------------------------------------------------------
+#Общие инструменты замеров
+
+
+def Measure(Name, Func, Repeat=10000):
+    """
+        Выполнить Func() Repeat раз и напечатать время одного вызова и число вызовов в секунду.
+        Возвращает время одного вызова в секундах.
+    """
+    Start = perf_counter()
+    for i in range(Repeat):
+        Func()
+    PerCall = (perf_counter() - Start) / Repeat
+    print('{:<48} {:>10.2f} мкс/вызов {:>12.0f} вызовов/с'.format(Name, PerCall * 1e6, 1 / PerCall if PerCall else 0))
+    return PerCall
+
+
+def MakeDesktop(Windows=1, Controls=5, CallDelay=0.0):
+    """
+        Создать имитационный бэкенд с несколькими окнами "Form N" и контролами в каждом из них.
+        Возвращает пару (AutoItX, SimulatedBackend).
+    """
+    Backend = SimulatedBackend(CallDelay=CallDelay)
+    for N in range(Windows):
+        Window = Backend.AddWindow('Form {}'.format(N), 'SimForm', X=10 + N, Y=10 + N, Width=400, Height=300)
+        for C in range(Controls):
+            Window.AddControl('Edit', 'Text {} {}'.format(N, C), X=5, Y=5 + C * 25, Width=200, Height=20)
+    return AutoItX(Backend=Backend), Backend
+
+
+#-------------------------------------------------------------------------------
+#Замеры
+
+
+def HotPaths():
+    """
+        Самые частые вызовы AutoItX.
+    """
+    Automat, Backend = MakeDesktop()
+    Measure('WinExists', lambda: Automat.WinExists('Form 0'))
+    Measure('WinGetState', lambda: Automat.WinGetState('Form 0'))
+    Measure('WinGetPos', lambda: Automat.WinGetPos('Form 0'))
+    Measure('WinGetTitle', lambda: Automat.WinGetTitle('Form 0'))
+    Measure('WinGetText', lambda: Automat.WinGetText('Form 0'))
+    Measure('ControlGetText', lambda: Automat.ControlGetText('Form 0', '[CLASS:Edit; INSTANCE:2]'))
+    Measure('ControlMouseClick', lambda: Automat.ControlMouseClick('Form 0', 'Edit1', 1, 1))
+
+
+def Startup():
+    """
+        Стоимость создания CustomWinDLL: старая привязка через exec на каждый экземпляр против разобранного один раз
+        словаря и ленивой привязки функций. Вместо AutoItX3.dll используется стандартная библиотека C, чтобы замер
+        работал на любой ОС. Под Windows дополнительно замеряется создание AutoItX().
+    """
+    LibC = util.find_library('c') or util.find_library('msvcrt')
+    Names = ('strlen', 'strcmp', 'strncmp', 'strchr', 'strrchr', 'strstr', 'memcmp', 'memchr', 'abs', 'labs',
+             'atoi', 'atol', 'toupper', 'tolower', 'isalpha', 'isdigit', 'isspace', 'rand', 'srand', 'qsort')
+    #Старый формат - строки, которые вычислялись через exec для каждого экземпляра.
+    StrProtos = dict((Name, {'ReturnType': 'c_long', 'ArgTypes': '(c_void_p, c_void_p)'}) for Name in Names)
+
+    class ExecWinDLL(CDLL):
+        def __init__(self, ProtoDict, name):
+            super().__init__(name)
+            for Proto in ProtoDict:
+                exec('self.{}.restype = {}'.format(Proto, ProtoDict[Proto]['ReturnType']))
+                exec('self.{}.argtypes = {}'.format(Proto, ProtoDict[Proto]['ArgTypes']))
+
+    TypedProtos = dict((Name, {'ReturnType': c_long, 'ArgTypes': (c_void_p, c_void_p)}) for Name in Names)
+    Before = Measure('exec-привязка ({} функций)'.format(len(Names)), lambda: ExecWinDLL(StrProtos, LibC), 1000)
+    After = Measure('CustomWinDLL ({} функций)'.format(len(Names)), lambda: CustomWinDLL(TypedProtos, LibC), 1000)
+    Measure('CustomWinDLL + вызов strlen', lambda: CustomWinDLL(TypedProtos, LibC).strlen(b'abc', None), 1000)
+    print('Ускорение создания: {:.1f}x'.format(Before / After))
+    if sys.platform == 'win32':
+        Measure('AutoItX()', AutoItX, 1000)
+
+
+def LegacyAutoItCall(Mode):
+    """
+        Старый вариант декоратора AutoItCall (до специализации по режимам) - для сравнения.
+    """
+    def MainDecorator(AutoFunc):
+
+        @wraps(AutoFunc)
+        def wrapper(*arg, **kwarg):
+            ModeString = Mode.upper()
+            if not None in arg and not None in kwarg.values():
+                Res = AutoFunc(*arg, **kwarg)
+                if ModeString == 'VALUE':
+                    return Res.value
+                elif ModeString == 'TRUE-FALSE':
+                    return True if Res > 0 else False
+                elif ModeString == 'STRING-BUF':
+                    return Res.value if Res.value != '' else None
+                elif ModeString == 'RAW':
+                    return Res
+
+        return wrapper
+
+    return MainDecorator
+
+
+def Dispatch():
+    """
+        Накладные расходы AutoItCall на один вызов в каждом режиме: заглушка вместо DLL, сравнение старого
+        декоратора, нового с проверкой аргументов на None и нового без нее.
+    """
+    Buffer = create_unicode_buffer('text')
+    Results = {'VALUE': c_long(1), 'TRUE-FALSE': 1, 'STRING-BUF': Buffer, 'RAW': 1}
+    for Mode in AutoItCallModes:
+        Result = Results[Mode]
+
+        def Stub(self, Title, Text=''):
+            return Result
+
+        Plain = Stub.__get__(object())
+        Legacy = LegacyAutoItCall(Mode)(Stub).__get__(object())
+        Checked = AutoItCall(Mode)(Stub).__get__(object())
+        Unchecked = AutoItCall(Mode, CheckNone=False)(Stub).__get__(object())
+        Base = Measure('{:<10} без декоратора'.format(Mode), lambda: Plain('Title'), 200000)
+        Old = Measure('{:<10} старый AutoItCall'.format(Mode), lambda: Legacy('Title'), 200000)
+        New = Measure('{:<10} AutoItCall'.format(Mode), lambda: Checked('Title'), 200000)
+        Fast = Measure('{:<10} AutoItCall(CheckNone=False)'.format(Mode), lambda: Unchecked('Title'), 200000)
+        print('{:<10} накладные расходы: было {:.3f} мкс, стало {:.3f} мкс, без проверки {:.3f} мкс'.format(
+            Mode, (Old - Base) * 1e6, (New - Base) * 1e6, (Fast - Base) * 1e6))
+
+
+def Buffers():
+    """
+        Чтение строк: новый буфер на каждый вызов (как было) против пула OutputBuffers и режима GrowBuffers.
+    """
+    Automat, Backend = MakeDesktop()
+
+    def Fresh():
+        Res = create_unicode_buffer(65535)
+        Backend.AU3_WinGetText('Form 0', '', Res, 65535)
+        return Res.value or None
+
+    Measure('WinGetText, новый буфер на вызов', Fresh)
+    Measure('WinGetText, пул буферов', lambda: Automat.WinGetText('Form 0'))
+    Automat.GrowBuffers = True
+    Measure('WinGetText, пул + GrowBuffers', lambda: Automat.WinGetText('Form 0'))
+    Measure('ControlGetText, пул + GrowBuffers', lambda: Automat.ControlGetText('Form 0', 'Edit1'))
+
+
+def QueryMany():
+    """
+        Опрос многих окон: по отдельному вызову на каждый параметр против WinQueryMany (последовательно и в пуле
+        потоков). Замер повторяется без задержки и с CallDelay, имитирующим стоимость вызова DLL.
+    """
+    for CallDelay in (0.0, 0.0001):
+        Automat, Backend = MakeDesktop(Windows=200, Controls=0, CallDelay=CallDelay)
+        Titles = list('Form {}'.format(N) for N in range(200))
+
+        def Naive():
+            for Title in Titles:
+                Automat.WinGetState(Title)
+                Automat.WinGetPos(Title)
+                Automat.WinGetClientRect(Title)
+                Automat.WinGetTitle(Title)
+                Automat.WinGetProcess(Title)
+
+        Repeat = 20 if not CallDelay else 1
+        print('CallDelay = {} с'.format(CallDelay))
+        for Name, Func in (('по отдельности', Naive),
+                           ('WinQueryMany', lambda: Automat.WinQueryMany(Titles)),
+                           ('WinQueryMany, 8 потоков', lambda: Automat.WinQueryMany(Titles, Workers=8))):
+            PerCall = Measure(Name, Func, Repeat)
+            print('{:<48} {:>10.0f} окон/с'.format('', len(Titles) / PerCall))
+        #StringID с Handle и заголовком, полученный от WinQueryMany, должен находить то же окно.
+        Found = sum(1 for Window in Automat.WinQueryMany(Titles) if Automat.WinExists(Window.StringID))
+        print('{:<48} {:>10} из {} окон'.format('WinExists(StringID) после WinQueryMany', Found, len(Titles)))
+
+
+def WaitState():
+    """
+        Задержка обнаружения смены состояния окна: окно разворачивается через 0.1-0.3 с после начала ожидания.
+        Сравниваются старый опрос с постоянным интервалом 0.25 с, адаптивный опрос WinWaiter без событий и
+        WinWaiter с событиями бэкенда.
+    """
+    Automat, Backend = MakeDesktop()
+    Target = 'EXISTS, VISIBLE, ENABLED, ACTIVE, MAXIMIZED'
+
+    def Fixed(Delay):
+        Start = perf_counter()
+        Timer(Delay, Automat.WinSetState, ('Form 0', SW.MAXIMIZE)).start()
+        Polls = 0
+        while Automat.WinGetState('Form 0') != 47:
+            Polls += 1
+            #Старый WinWaitState: sleep(Interval) и по два вызова на такт.
+            Automat.WinExists('Form 0')
+            sleep(0.25)
+        return perf_counter() - Start - Delay, Polls * 2
+
+    def Waiter(Delay, Events):
+        Timer(Delay, Automat.WinSetState, ('Form 0', SW.MAXIMIZE)).start()
+        Res = WinWaiter(Automat, Events=Events).Wait('Form 0', Target, 5)
+        return Res.Elapsed - Delay, Res.Polls
+
+    for Name, Func in (('постоянный интервал 0.25 с', Fixed),
+                       ('WinWaiter, только опрос', lambda Delay: Waiter(Delay, False)),
+                       ('WinWaiter, события бэкенда', lambda Delay: Waiter(Delay, True))):
+        Latencies = []
+        Calls = 0
+        for Delay in (0.1, 0.17, 0.23, 0.3):
+            Automat.WinSetState('Form 0', SW.RESTORE)
+            Latency, Polls = Func(Delay)
+            Latencies.append(Latency)
+            Calls += Polls
+        print('{:<36} задержка в среднем {:>8.2f} мс, макс. {:>8.2f} мс, вызовов DLL {:>4}'.format(
+            Name, sum(Latencies) / len(Latencies) * 1000, max(Latencies) * 1000, Calls))
+
+
+def AsyncWaits():
+    """
+        Сотни одновременных ожиданий: 300 окон появляются в случайном порядке в течение 0.5 с, каждое ожидается
+        отдельно. Сравниваются поток на каждое блокирующее AutoItX.WinWait и один цикл событий с AsyncAutoItX.
+    """
+    Count = 300
+
+    def Spawn(Backend):
+        for N in range(Count):
+            Timer(0.5 * ((N * 7919) % Count) / Count, Backend.AddWindow, ('Late {}'.format(N),),
+                  {'Activate': False}).start()
+
+    Automat, Backend = MakeDesktop(Windows=0)
+    Found = []
+    Start = perf_counter()
+    Spawn(Backend)
+    Threads = list(Thread(target=lambda N=N: Found.append(Automat.WinWait('Late {}'.format(N), 5)))
+                   for N in range(Count))
+    for T in Threads:
+        T.start()
+    for T in Threads:
+        T.join()
+    print('{:<36} {:>8.3f} с, дождались {}/{}, потоков {}'.format(
+        'поток на ожидание', perf_counter() - Start, Found.count(True), Count, Count))
+
+    async def Main():
+        Automat, Backend = MakeDesktop(Windows=0)
+        async with AsyncAutoItX(Automat, MaxWorkers=4) as Async:
+            Start = perf_counter()
+            Spawn(Backend)
+            Res = await asyncio.gather(*(Async.WinWait('Late {}'.format(N), 5) for N in range(Count)))
+            print('{:<36} {:>8.3f} с, дождались {}/{}, потоков {}'.format(
+                'AsyncAutoItX, один цикл событий', perf_counter() - Start, Res.count(True), Count, 4))
+
+    asyncio.run(Main())
+
+
+def HandleCache():
+    """
+        Повторная передача одного и того же заголовка "[CLASS:...; TITLE:...]" среди 200 окон: поиск окна при каждом
+        вызове против WinHandleCache (с проверкой WinExists и без нее).
+    """
+    Automat, Backend = MakeDesktop(Windows=200, Controls=1)
+    Spec = '[CLASS:SimForm; TITLE:Form 150]'
+    Measure('WinGetText по заголовку', lambda: Automat.WinGetText(Spec))
+    Cache = WinHandleCache(Automat)
+    Measure('WinGetText через WinHandleCache', lambda: Automat.WinGetText(Cache(Spec)))
+    Cache.Validate = False
+    Measure('WinGetText через WinHandleCache без проверки', lambda: Automat.WinGetText(Cache(Spec)))
+    print('Попаданий {}, промахов {}'.format(Cache.Hits, Cache.Misses))
+
+
+def SendKeys():
+    """
+        Send с повторами и SendMany: число вызовов AU3_Send и время при CallDelay, имитирующем стоимость вызова DLL.
+    """
+    Automat, Backend = MakeDesktop(CallDelay=0.0001)
+    Lines = list('Строка {}{{ENTER}}'.format(N) for N in range(500))
+
+    def Loop():
+        for Line in Lines:
+            Automat.Send(Line)
+
+    for Name, Func, Repeat in (('Send("{BACKSPACE}", 7), по вызову на повтор',
+                                lambda: [Automat.__AutoItDLL__.AU3_Send('{BACKSPACE}', 0) for i in range(7)], 200),
+                               ('Send("{BACKSPACE}", 7)', lambda: Automat.Send('{BACKSPACE}', 7), 200),
+                               ('500 строк, Send на каждую', Loop, 5),
+                               ('500 строк, SendMany', lambda: Automat.SendMany(Lines), 5)):
+        Before = Backend.Calls['AU3_Send']
+        Measure(Name, Func, Repeat)
+        print('{:<48} {:>10.1f} вызовов AU3_Send'.format('', (Backend.Calls['AU3_Send'] - Before) / Repeat))
+
+
+def Profiling():
+    """
+        Накладные расходы профилировщика: до первого включения, после включения и выключения (должны совпасть) и
+        во включенном состоянии. Затем печатается собранный отчет.
+    """
+    Automat, Backend = MakeDesktop()
+
+    def Calls():
+        Automat.WinExists('Form 0')
+        Automat.WinGetTitle('Form 0')
+        Automat.ControlGetText('Form 0', 'Edit1')
+
+    Before = Measure('3 вызова, профилировщик не включался', Calls)
+    Profiler.Enable()
+    Profiler.Disable()
+    Profiler.Reset()
+    After = Measure('3 вызова, профилировщик выключен', Calls)
+    Profiler.Enable()
+    On = Measure('3 вызова, профилировщик включен', Calls)
+    Profiler.Disable()
+    print('Выключенный профилировщик: {:+.1%}, включенный: {:+.1%}'.format(After / Before - 1, On / Before - 1))
+    print(Profiler.Report())
+    Profiler.Reset()
+
+
+#-------------------------------------------------------------------------------
+#Старый вариант WinState (до перевода на битовую маску) - для сравнения, без print в __eq__.
+
+class LegacyWinState:
+    StateNum = None
+    StateString = None
+    EXISTS = False
+    VISIBLE = False
+    ENABLED = False
+    ACTIVE = False
+    MINIMIZED = False
+    MAXIMIZED = False
+    __StatesDict__ = OrderedDict((
+        ('EXISTS', 1),
+        ('VISIBLE', 2),
+        ('ENABLED', 4),
+        ('ACTIVE', 8),
+        ('MINIMIZED', 16),
+        ('MAXIMIZED', 32),
+    ))
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, State):
+        self.SetState(State)
+
+    #-------------------------------------------------------------------------------
+
+    def __setattr__(self, Name, Value):
+        """
+            Внутренний метод, автоматизирующий обновление значений StateNum и StateString
+            при изменении логических признаков.
+        """
+        super().__setattr__(Name, Value)
+        if self.__StatesDict__ and Name in self.__StatesDict__:
+            self.__UpdateFromBoolean__()
+
+    #-------------------------------------------------------------------------------
+    #Далее идут методы для операторов "==", "!=", ">=", "<=", ">", "<".
+
+    #"<"
+    def __lt__(self, SecondState):
+        x = 0
+        y = 0
+        z = 0
+        for Param in self.__StatesDict__:
+
+            if self.__dict__[Param]:
+                x += 1
+            if SecondState.__dict__[Param]:
+                y += 1
+            if self.__dict__[Param] and SecondState.__dict__[Param]:
+                z += 1
+        if y > z and y > x:
+            return True
+        else:
+            return False
+
+    #"<="
+    def __le__(self, SecondState):
+        x = 0
+        y = 0
+        z = 0
+
+        for Param in self.__StatesDict__:
+            if self.__dict__[Param]:
+                x += 1
+            if SecondState.__dict__[Param]:
+                y += 1
+            if self.__dict__[Param] and SecondState.__dict__[Param]:
+                z += 1
+        if z == y == x or (y > z and y > x):
+            return True
+        else:
+            return False
+
+    #"=="
+    def __eq__(self, SecondState):
+        Res = True
+        for Param in self.__StatesDict__:
+            '''
+            if Param=='ACTIVE':
+                continue
+            '''
+            if self.__dict__[Param] != SecondState.__dict__[Param]:
+                Res = False
+        return Res
+
+    #"!="
+    def __ne__(self, SecondState):
+        Res = False
+        for Param in self.__StatesDict__:
+            '''
+            if Param=='ACTIVE':
+                continue
+            '''
+            if self.__dict__[Param] != SecondState.__dict__[Param]:
+                Res = True
+        return Res
+
+    #">="
+    def __ge__(self, SecondState):
+        x = 0
+        y = 0
+        z = 0
+        for Param in self.__StatesDict__:
+            if self.__dict__[Param]:
+                x += 1
+            if SecondState.__dict__[Param]:
+                y += 1
+            if self.__dict__[Param] and SecondState.__dict__[Param]:
+                z += 1
+        if z > 0 and z == y <= x:
+            return True
+        else:
+            return False
+
+    #">"
+    def __gt__(self, SecondState):
+        x = 0
+        y = 0
+        z = 0
+        for Param in self.__StatesDict__:
+            if self.__dict__[Param]:
+                x += 1
+            if SecondState.__dict__[Param]:
+                y += 1
+            if self.__dict__[Param] and SecondState.__dict__[Param]:
+                z += 1
+        if z > 0 and z <= y < x:
+            return True
+        else:
+            return False
+
+    #Конец определений методов для операторов "==", "!=", ">=", "<=", ">", "<".
+    #-------------------------------------------------------------------------------
+
+    def SetState(self, State):
+        """
+            Метод задания значения состояния окна, принимает число, возвращаемое WinGetState,
+            или строку , содержащую список активных признаков, например:
+            'EXISTS, VISIBLE, ENABLED, ACTIVE'
+        """
+        if isinstance(State, str):
+            self.StateString = State
+            self.StateNum = self.__StringToState__(State)
+        elif isinstance(State, int):
+            self.StateString = self.__StateToString__(State)
+            self.StateNum = State
+        else:
+            raise TypeError('Состояние окна должно иметь тип "str" или "int", сейчас это "{}"'.format(type(State)))
+
+    #-------------------------------------------------------------------------------
+
+    def __StateToString__(self, StateNum):
+        StateList = []
+        for State in self.__StatesDict__.items():
+            if StateNum & State[1] == State[1]:
+                StateList.append(State[0])
+                self.__dict__[State[0]] = True
+            else:
+                self.__dict__[State[0]] = False
+        Res = ','.join(StateList) if len(StateList) > 0 else None
+
+        return Res
+
+    #-------------------------------------------------------------------------------
+
+    def __StringToState__(self, StrState):
+        Res = 0
+        StateList = list(S.strip().upper() for S in str(StrState).split(','))
+        for ST in self.__StatesDict__:
+            if ST in StateList:
+                Res |= self.__StatesDict__[ST]
+                self.__dict__[ST] = True
+            else:
+                self.__dict__[ST] = False
+        return Res
+
+    #-------------------------------------------------------------------------------
+
+    def __UpdateFromBoolean__(self):
+        ResNum = 0
+        ResStrList = []
+        for ParName, ParNum in self.__StatesDict__.items():
+            if self.__dict__[ParName]:
+                if ParName == 'MINIMIZED':
+                    if self.__dict__['MAXIMIZED']:
+                        self.__dict__['MAXIMIZED'] = False
+                elif ParName == 'MAXIMIZED':
+                    if self.__dict__['MINIMIZED']:
+                        self.__dict__['MINIMIZED'] = False
+                ResNum |= ParNum
+                ResStrList.append(ParName)
+
+        self.StateNum = ResNum
+        self.StateString = ','.join(ResStrList)
+
+
+def WinStates():
+    """
+        WinState: создание, сравнения и чтение признаков, старый класс против нового (и общих экземпляров).
+        Заодно проверяется, что все сравнения для всех пар состояний дают те же результаты, что и раньше.
+    """
+    import operator
+    Ops = (operator.lt, operator.le, operator.eq, operator.ne, operator.ge, operator.gt)
+    Mismatches = sum(1 for A in range(64) for B in range(64) for Op in Ops
+                     if Op(LegacyWinState(A), LegacyWinState(B)) != Op(WinState(A), WinState(B)))
+    print('Расхождений в сравнениях со старым WinState: {}'.format(Mismatches))
+    Nums = list(range(64)) * 16
+    for Name, Class in (('старый WinState', LegacyWinState), ('WinState', WinState),
+                        ('WinState.Shared', WinState.Shared)):
+        States = list(Class(N) for N in Nums)
+        Target = Class(15)
+        Measure('{}: создание x{}'.format(Name, len(Nums)), lambda: list(Class(N) for N in Nums), 100)
+        Measure('{}: == и >= x{}'.format(Name, len(Nums)),
+                          lambda: sum(1 for S in States if S == Target or S >= Target), 100)
+        Measure('{}: чтение ACTIVE x{}'.format(Name, len(Nums)),
+                        lambda: sum(1 for S in States if S.ACTIVE), 100)
+
+
+def StateTable():
+    """
+        Запросы по состояниям 1000 окон: WinState на каждое окно против WinStateTable.
+        "Видимые, но отключенные" и "изменившиеся со времени прошлого опроса".
+    """
+    from random import Random
+    Rand = Random(1)
+    Old = list(Rand.choice((0, 3, 7, 15, 23, 39)) for N in range(1000))
+    New = list(State if Rand.random() < 0.9 else Rand.choice((3, 7, 15)) for State in Old)
+    Titles = list('Form {}'.format(N) for N in range(1000))
+    Visible, Enabled = WinState('VISIBLE'), WinState('ENABLED')
+
+    def Objects():
+        OldStates = list(WinState(State) for State in Old)
+        NewStates = list(WinState(State) for State in New)
+        Disabled = list(Title for Title, State in zip(Titles, NewStates) if State.VISIBLE and not State.ENABLED)
+        Changed = list(N for N, (A, B) in enumerate(zip(OldStates, NewStates)) if A != B)
+        return Disabled, Changed
+
+    def Table():
+        OldTable = WinStateTable(Titles, States=Old)
+        NewTable = WinStateTable(Titles, States=New)
+        return NewTable.Select(Visible, Enabled), NewTable.Changed(OldTable)
+
+    assert Objects() == Table()
+    Before = Measure('WinState на каждое окно', Objects, 200)
+    After = Measure('WinStateTable', Table, 200)
+    print('Ускорение: {:.1f}x'.format(Before / After))
+
+
+#-------------------------------------------------------------------------------
+#Старые варианты WinParams и ControlParams (до __slots__) - для сравнения.
+
+class LegacyWinParams:
+
+    Header = None
+    Class = None
+    Handle = None
+    Rectangle = None
+    ClientRectangle = None
+    State = None
+    PID = None
+    StringID = None
+    Text = ''
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, Header, Class=None, Handle=None, REtitle=False, REclass=False, Text=''):
+        #self.SetParams(Header, Class, Handle)
+        self.__HeaderPrefix__ = 'REGEXPTITLE' if REtitle else 'TITLE'
+        self.__ClassPrefix__ = 'REGEXPCLASS' if REclass else 'CLASS'
+        self.Header = Header
+        self.Class = Class
+        self.Handle = Handle
+        self.Rectangle = WinRect(0, 0, 0, 0)
+        self.ClientRectangle = WinRect(0, 0, 0, 0)
+        self.State = LegacyWinState(0)
+        self.StringID = self.__FormStringID__(Header, Class, Handle)
+        self.Text = Text
+
+    #-------------------------------------------------------------------------------
+
+    def __setattr__(self, Name, Value):
+        if Name == 'StringID':
+            super().__setattr__(Name, self.__FormStringID__(self.Header, self.Class, self.Handle))
+        elif Name == 'Class' or Name == 'Header' or Name == 'Handle':
+            super().__setattr__(Name, Value)
+            super().__setattr__('StringID', self.__FormStringID__(self.Header, self.Class, self.Handle))
+        else:
+            super().__setattr__(Name, Value)
+
+    #-------------------------------------------------------------------------------
+    def SetParams(self, Header, Class, Handle):
+        self.Header = Header
+        self.Class = Class
+        self.Handle = Handle
+        self.Rectangle = WinRect(0, 0, 0, 0)
+        self.ClientRectangle = WinRect(0, 0, 0, 0)
+        self.State = LegacyWinState(0)
+        self.StringID = self.__FormStringID__(Header, Class, Handle)
+
+    #-------------------------------------------------------------------------------
+
+    def __FormStringID__(self, Header, Class, Handle):
+        Res = '['
+        if Handle and Handle != '':
+            Res += 'HANDLE:{};'.format(Handle)
+        if Header and Header != '':
+            Res += '{}:{};'.format(self.__HeaderPrefix__, Header)
+        if Class and Class != '':
+            Res += '{}:{};'.format(self.__ClassPrefix__, Class)
+        Res += ']'
+        return Res
+
+
+class LegacyControlParams:
+
+    Class = None
+    Instance = None
+    Name = None
+    ID = None
+    Text = ''
+    Handle = None
+    Rectangle = None
+    StringID = None
+    __Complementary__ = {
+        'CLASS': 'Class',
+        'INSTANCE': 'Instance',
+        'NAME': 'Name',
+        'ID': 'ID',
+        'TEXT': 'Text',
+        'HANDLE': 'Handle'
+    }
+
+    #-------------------------------------------------------------------------------
+
+    def __init__(self, Class, Instance=1, Name=None, ID=None, Text='', Handle=None, Rectangle=None):
+        if isinstance(Class, str):
+            if Class.find('[') == 0 and Class.find(']') == len(Class) - 1:
+                self.SetParamsFromString(Class, Rectangle)
+            else:
+                self.SetParams(Class, Instance, Name, ID, Text, Handle, Rectangle)
+        else:
+            raise ValueError('Неверный параметр класса: "{}"'.format(Class))
+
+    #-------------------------------------------------------------------------------
+
+    def SetParams(self, Class, Instance, Name, ID, Text, Handle, Rectangle):
+        self.Class = Class
+        self.Instance = Instance
+        self.Name = Name
+        self.ID = ID
+        self.Text = Text
+        self.Handle = Handle
+        self.StringID = self.__FormStringID__(Class, Instance, Name, ID, Text, Handle)
+        self.Rectangle = Rectangle
+
+    #-------------------------------------------------------------------------------
+
+    def SetParamsFromString(self, ControlString, Rectangle):
+        self.StringID = ControlString  # str(ControlString).upper()
+        InDict = self.__TakeFromString__(self.StringID)
+        for Param, Value in InDict.items():
+            self.__dict__[self.__Complementary__[Param]] = Value
+        self.Rectangle = Rectangle
+
+    #-------------------------------------------------------------------------------
+
+    def __FormStringID__(self, Class, Instance, Name, ID, Text, Handle):
+        Res = '['
+        Res += 'CLASS:{};INSTANCE:{};'.format(Class, Instance)
+        if Name:
+            Res += 'NAME:{};'.format(Name)
+        if ID:
+            Res += 'ID:{};'.format(ID)
+        if Text:
+            Res += 'TEXT:{};'.format(Text)
+        if Handle:
+            Res += 'HANDLE:{};'.format(Handle)
+        Res += ']'
+        return Res
+
+    #-------------------------------------------------------------------------------
+
+    def __TakeFromString__(self, ControlString):
+        Res = None
+        tmpStr = ControlString.strip('[]')
+        ParList = list(T.strip() for T in tmpStr.split(';'))
+        if len(ParList) > 0:
+            Res = dict()
+            for Record in ParList:
+                RecSplit = list(R.strip() for R in Record.split(':'))
+                ParName = RecSplit[0].upper()
+                Res[ParName] = int(RecSplit[1]) if ParName == 'INSTANCE' else RecSplit[1]
+        return Res
+
+
+def Params():
+    """
+        WinParams и ControlParams: память на объект, время создания и чтения StringID, старые классы против новых.
+    """
+    def MemoryPerObject(Make, Count=10000):
+        tracemalloc.start()
+        Before = tracemalloc.get_traced_memory()[0]
+        Objects = list(Make(N) for N in range(Count))
+        After = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return (After - Before) / len(Objects)
+
+    for Name, Make in (('старый WinParams', lambda N: LegacyWinParams('Form {}'.format(N), 'SimForm')),
+                       ('WinParams', lambda N: WinParams('Form {}'.format(N), 'SimForm')),
+                       ('старый ControlParams', lambda N: LegacyControlParams('Edit', N, 'Name')),
+                       ('ControlParams', lambda N: ControlParams('Edit', N, 'Name'))):
+        Measure('{}: создание'.format(Name), lambda: Make(1), 100000)
+        Measure('{}: создание + StringID'.format(Name), lambda: Make(1).StringID, 100000)
+        print('{:<48} {:>10.0f} байт/объект'.format('{}: память'.format(Name), MemoryPerObject(Make)))
+    Window = WinParams('Form 1', 'SimForm')
+    Measure('WinParams: изменение Handle + StringID', lambda: (setattr(Window, 'Handle', 1), Window.StringID), 100000)
+    Cache = dict((WinParams('Form {}'.format(N), 'SimForm'), N) for N in range(1000))
+    Measure('WinParams как ключ словаря', lambda: Cache[WinParams('Form 500', 'SimForm')], 100000)
+
+
+def Specs():
+    """
+        Разбор строк описания контролов: старый ControlParams (разбор при каждом создании) против кэшированного
+        ParseControlSpec, а также приведение к каноническому виду.
+    """
+    Spec = '[CLASS:Edit; INSTANCE:2]'
+    Measure('старый ControlParams из строки', lambda: LegacyControlParams(Spec))
+    Measure('ControlParams из строки', lambda: ControlParams(Spec))
+    Measure('ParseControlSpec', lambda: ParseControlSpec(Spec))
+    ParseControlSpec.cache_clear()
+    Measure('ParseControlSpec без кэша', lambda: (ParseControlSpec(Spec), ParseControlSpec.cache_clear()))
+    Measure('CanonicalControlSpec', lambda: CanonicalControlSpec('[instance:2 ;class:Edit]'))
+    Automat, Backend = MakeDesktop()
+    Measure('ControlGetParams', lambda: Automat.ControlGetParams('Form 0', Spec))
+
+
+def Clicks():
+    """
+        ControlMouseClick по одному и тому же контролу: без кэша геометрии и с LayoutCache.
+        Печатается число вызовов бэкенда на одно нажатие, замер повторяется с CallDelay.
+    """
+    for CallDelay in (0.0, 0.0001):
+        Automat, Backend = MakeDesktop(CallDelay=CallDelay)
+        print('CallDelay = {} с'.format(CallDelay))
+        for Name in ('без кэша', 'LayoutCache'):
+            if Name == 'LayoutCache':
+                LayoutCache(Automat)
+            Automat.ControlMouseClick('Form 0', 'Edit2', 5, 5)
+            Before = sum(Backend.Calls.values())
+            Repeat = 2000 if not CallDelay else 200
+            Measure('ControlMouseClick, {}'.format(Name), lambda: Automat.ControlMouseClick('Form 0', 'Edit2', 5, 5),
+                    Repeat)
+            print('{:<48} {:>10.1f} вызовов бэкенда'.format('', (sum(Backend.Calls.values()) - Before) / Repeat))
+
+
+def Pixels():
+    """
+        Поиск индикаторов трех цветов в области 200x100: попиксельный PixelGetColor против одного CaptureRegion и
+        векторного FindColors. Требует numpy.
+    """
+    if numpy is None:
+        print('Пропущено: нет numpy')
+        return
+    Automat, Backend = MakeDesktop()
+    Colors = (0xFF0000, 0x00FF00, 0x0000FF)
+    for N, Color in enumerate(Colors):
+        Backend.FillRect(100 + N * 40, 120, 8, 8, Color)
+    Left, Top, Right, Bottom = 50, 100, 249, 199
+
+    def PerPixel():
+        Found = dict((Color, []) for Color in Colors)
+        for Y in range(Top, Bottom + 1):
+            for X in range(Left, Right + 1):
+                Color = Automat.PixelGetColor(X, Y)
+                if Color in Found:
+                    Found[Color].append((X, Y))
+        return Found
+
+    Measure('PixelGetColor по всем пикселам', PerPixel, 5)
+    Measure('CaptureRegion', lambda: Automat.CaptureRegion(Left, Top, Right, Bottom), 1000)
+    Measure('CaptureRegion + FindColors',
+            lambda: FindColors(Automat.CaptureRegion(Left, Top, Right, Bottom), Colors, 0, Left, Top), 1000)
+    Measure('PixelSearchColors', lambda: Automat.PixelSearchColors(Left, Top, Right, Bottom, Colors), 1000)
+
+
+def Images():
+    """
+        Поиск изображений на экране 1024x768 с прямоугольниками случайных цветов: шаблон 64x48 без пирамиды и с
+        пирамидой, шаблон массивом (через кэш) и готовым ImageTemplate, пять шаблонов по отдельности и по одному
+        снимку (ImageSearchMany). Требует numpy.
+    """
+    if numpy is None:
+        print('Пропущено: нет numpy')
+        return
+    Automat, Backend = MakeDesktop()
+    Screen = ImageFromBytes(Backend.ScreenWidth, Backend.ScreenHeight, Backend.Screen)
+    Random = numpy.random.default_rng(1)
+    Screen[:] = 240
+    for N in range(300):
+        X, Y = Random.integers(0, 1000), Random.integers(0, 740)
+        Screen[Y:Y + Random.integers(3, 60), X:X + Random.integers(3, 60)] = Random.integers(0, 256, 3)
+    Templates = list(Screen[Y:Y + 48, X:X + 64].copy() for X, Y in ((101, 77), (333, 201), (640, 480), (17, 600),
+                                                                   (900, 50)))
+    Region = WinRect(0, 0, Backend.ScreenWidth, Backend.ScreenHeight)
+    Image = Automat.CaptureRegion(0, 0, Backend.ScreenWidth - 1, Backend.ScreenHeight - 1)
+    Flat, Pyramid = ImageTemplate(Templates[0], MaxLevels=1), ImageTemplate(Templates[0])
+    Measure('FindTemplate без пирамиды', lambda: FindTemplate(Image, Flat), 20)
+    Measure('FindTemplate с пирамидой', lambda: FindTemplate(Image, Pyramid), 20)
+    Measure('ImageSearch, шаблон массивом', lambda: Automat.ImageSearch(Templates[0], Region), 20)
+    Measure('ImageSearch, ImageTemplate', lambda: Automat.ImageSearch(Pyramid, Region), 20)
+    Measure('5 x ImageSearch', lambda: list(Automat.ImageSearch(T, Region) for T in Templates), 10)
+    Measure('ImageSearchMany, 5 шаблонов', lambda: Automat.ImageSearchMany(Templates, Region), 10)
+
+
+def Tiles():
+    """
+        Поиск изменившихся мест экрана 1024x768 плитками 64x64 (192 плитки), когда между обновлениями меняется
+        одна небольшая область: все плитки подряд, все плитки в 8 потоков и иерархически. Печатается число вызовов
+        PixelChecksum на обновление, замер повторяется с CallDelay.
+    """
+    for CallDelay in (0.0, 0.0001):
+        Automat, Backend = MakeDesktop(CallDelay=CallDelay)
+        print('CallDelay = {} с'.format(CallDelay))
+        Colors = iter(range(1, 1 << 24))
+        for Name, Options in (('все плитки', dict()), ('все плитки, 8 потоков', dict(Workers=8)),
+                              ('иерархически', dict(Hierarchical=True)),
+                              ('иерархически, 8 потоков', dict(Hierarchical=True, Workers=8))):
+            with RegionWatcher(Automat, (0, 0, Backend.ScreenWidth, Backend.ScreenHeight), **Options) as Watcher:
+                Watcher.Refresh()
+                Before = Watcher.Calls
+                Repeat = 20 if CallDelay else 5
+                Measure('RegionWatcher, {}'.format(Name),
+                        lambda: (Backend.FillRect(300, 200, 10, 10, next(Colors)), list(Watcher.DirtyRects())), Repeat)
+                print('{:<48} {:>10.1f} вызовов PixelChecksum'.format('', (Watcher.Calls - Before) / Repeat))
+
+
+def PixelBatch():
+    """
+        PixelGetColors для разного числа точек, разбросанных по прямоугольнику 400x300: по вызову на точку
+        ('POINTS'), одним снимком ('CAPTURE') и с автоматическим выбором после CalibratePixels. Печатается, с
+        какого числа точек снимок выгоднее. Замер повторяется с CallDelay. Требует numpy.
+    """
+    if numpy is None:
+        print('Пропущено: нет numpy')
+        return
+    Random = numpy.random.default_rng(1)
+    for CallDelay in (0.0, 0.00002):
+        Automat, Backend = MakeDesktop(CallDelay=CallDelay)
+        print('CallDelay = {} с, оценки стоимости: {}'.format(
+            CallDelay, ', '.join('{:.3g}'.format(Cost) for Cost in Automat.CalibratePixels(100, 100))))
+        Crossover = None
+        for Count in (5, 10, 20, 50, 100, 200, 500):
+            Points = numpy.column_stack((Random.integers(100, 500, Count), Random.integers(100, 400, Count)))
+            Times = dict((Method, Measure('PixelGetColors, {} точек, {}'.format(Count, Method or 'авто'),
+                                          lambda: Automat.PixelGetColors(Points, Method=Method), 20))
+                         for Method in ('POINTS', 'CAPTURE', None))
+            if Crossover is None and Times['CAPTURE'] < Times['POINTS']:
+                Crossover = Count
+        print('{:<48} {:>10}'.format('Снимок выгоднее, начиная с точек:', Crossover or 'больше 500'))
+
+
+def ControlTree():
+    """
+        Снимок 100 контролов окна: разбор WinGetClassList вручную с ControlGetHandle и ControlGetPos на каждый
+        контрол, SnapshotControls, и обновление снимка без изменений и после пересоздания одного контрола.
+        Печатается число вызовов бэкенда, замер повторяется с CallDelay.
+    """
+    for CallDelay in (0.0, 0.0001):
+        Automat, Backend = MakeDesktop(Controls=100, CallDelay=CallDelay)
+        Window = next(iter(Backend.Windows.values()))
+        print('CallDelay = {} с'.format(CallDelay))
+
+        def ByHand():
+            Counts = dict()
+            Res = dict()
+            for Class in Automat.WinGetClassList('Form 0').split('\n'):
+                if Class:
+                    Counts[Class] = Counts.get(Class, 0) + 1
+                    Spec = '[CLASS:{}; INSTANCE:{}]'.format(Class, Counts[Class])
+                    Res[Spec] = (Automat.ControlGetHandle('Form 0', Spec), Automat.ControlGetPos('Form 0', Spec))
+            return Res
+
+        def Recreate():
+            Window.RemoveControl(Window.Controls[-1])
+            Window.AddControl('Edit', 'Text', X=5, Y=5, Width=200, Height=20)
+            Snapshot.Refresh()
+
+        Snapshot = Automat.SnapshotControls('Form 0')
+        Repeat = 20 if CallDelay else 100
+        for Name, Func in (('WinGetClassList вручную', ByHand),
+                           ('SnapshotControls', lambda: Automat.SnapshotControls('Form 0')),
+                           ('Refresh без изменений', Snapshot.Refresh),
+                           ('Refresh, пересоздан один контрол', Recreate)):
+            Before = sum(Backend.Calls.values())
+            Measure(Name, Func, Repeat)
+            print('{:<48} {:>10.1f} вызовов бэкенда'.format('', (sum(Backend.Calls.values()) - Before) / Repeat))
+
+
+def ListViewRows():
+    """
+        Чтение двух столбцов из ListView на 5000 строк: циклом ControlListView "GetText", через ListViewReader и
+        ListViewReader с фоновым чтением следующей страницы, когда обработка страницы занимает столько же времени,
+        сколько ее чтение. Печатается число строк в секунду, замер повторяется с CallDelay.
+    """
+    for CallDelay in (0.0, 0.00002):
+        Automat, Backend = MakeDesktop(CallDelay=CallDelay)
+        Window = next(iter(Backend.Windows.values()))
+        Window.AddControl('SysListView32').Items = list(list('{} {}'.format(Row, Column) for Column in range(5))
+                                                        for Row in range(5000))
+        print('CallDelay = {} с'.format(CallDelay))
+        Count = 1000 if CallDelay else 5000
+        #Время чтения одной страницы (256 строк) - столько же уходит на ее "обработку".
+        Work = Measure('чтение страницы (256 строк)', lambda: ListViewReader(
+            Automat, 'Form 0', 'SysListView321', Columns=(0, 3)).ReadRows(range(256)), 3)
+
+        def Loop():
+            Rows = list(tuple(Automat.ControlListView('Form 0', 'SysListView321', 'GetText', str(Row), str(Column))
+                              for Column in (0, 3)) for Row in range(Count))
+            for Start in range(0, Count, 256):
+                sleep(Work * len(Rows[Start:Start + 256]) / 256)
+
+        def Reader(Prefetch):
+            Reader = ListViewReader(Automat, 'Form 0', 'SysListView321', Columns=(0, 3), Prefetch=Prefetch)
+            for Page in Reader.Pages(0, Count - 1):
+                sleep(Work * len(Page) / 256)
+
+        for Name, Func in (('цикл ControlListView', Loop), ('ListViewReader', lambda: Reader(False)),
+                           ('ListViewReader, Prefetch', lambda: Reader(True))):
+            Time = Measure(Name, Func, 3)
+            print('{:<48} {:>10.0f} строк/с'.format('', Count / Time))
+
+
+def ListViewDiff():
+    """
+        Поиск изменений в ListView на 100 тысяч строк по 3 столбца: полное перечитывание через ListViewReader
+        против опроса ListViewWatcher (пробный столбец 0, по 1024 строки за опрос), когда между опросами ничего
+        не меняется, добавляется 10 строк в конец и вставляется строка в середину. Печатается число прочитанных
+        ячеек на опрос и через сколько опросов замечено изменение одной строки.
+    """
+    Automat, Backend = MakeDesktop()
+    Window = next(iter(Backend.Windows.values()))
+    ListView = Window.AddControl('SysListView32')
+    Numbers = iter(range(10 ** 9))
+
+    def NewRow():
+        Number = next(Numbers)
+        return ['id {}'.format(Number), 'value {}'.format(Number % 97), 'note']
+
+    ListView.Items = list(NewRow() for Row in range(100000))
+    Reader = ListViewReader(Automat, 'Form 0', 'SysListView321')
+    Measure('полное чтение', lambda: sum(1 for Row in Reader.Rows()), 1)
+    print('{:<48} {:>10.0f} ячеек за чтение'.format('', Reader.Calls))
+    Watcher = ListViewWatcher(Automat, 'Form 0', 'SysListView321')
+    Measure('ListViewWatcher, первый опрос', Watcher.Poll, 1)
+
+    def Append():
+        ListView.Items.extend(NewRow() for Row in range(10))
+        return Watcher.Poll()
+
+    def Insert():
+        ListView.Items.insert(len(ListView.Items) // 2, NewRow())
+        return Watcher.Poll()
+
+    for Name, Func in (('без изменений', Watcher.Poll), ('10 строк в конец', Append),
+                       ('строка в середину', Insert)):
+        Before = Watcher.Calls
+        Repeat = 20
+        Measure('ListViewWatcher, {}'.format(Name), Func, Repeat)
+        print('{:<48} {:>10.0f} ячеек за опрос'.format('', (Watcher.Calls - Before) / Repeat))
+    ListView.Items[50000][0] = 'changed'
+    Polls = 1
+    while not Watcher.Poll():
+        Polls += 1
+    print('{:<48} {:>10} опросов'.format('Изменение строки 50000 замечено за', Polls))
+
+
+def TreeWalk():
+    """
+        Дерево SysTreeView32 из 1554 узлов (4 уровня по 6 детей): два полных обхода и поиск 200 текстовых путей
+        вызовами ControlTreeView узел за узлом против TreeViewModel. Печатается число вызовов бэкенда.
+    """
+    Automat, Backend = MakeDesktop()
+    Window = next(iter(Backend.Windows.values()))
+    Tree = Window.AddControl('SysTreeView32').Tree
+
+    def Build(Item, Depth, Prefix):
+        for Number in range(6 if Depth else 0):
+            Build(Item.Add('{}{}'.format(Prefix, Number)), Depth - 1, '{}{}.'.format(Prefix, Number))
+
+    Build(Tree, 4, 'n')
+    Paths = list('|'.join('n' + '.'.join(str((Seed * 7 + Level * 3) % 6) for Level in range(Depth + 1))
+                          for Depth in range(4)) for Seed in range(200))
+
+    def Command(Command, Path):
+        return Automat.ControlTreeView('Form 0', 'SysTreeView321', Command, Path)
+
+    def WalkByHand(Path=''):
+        for Number in range(int(Command('GetItemCount', Path) or 0)):
+            Child = '#{}'.format(Number) if not Path else '{}|#{}'.format(Path, Number)
+            yield Child, Command('GetText', Child)
+            yield from WalkByHand(Child)
+
+    def FindByHand(TextPath):
+        Path = ''
+        for Part in TextPath.split('|'):
+            for Number in range(int(Command('GetItemCount', Path) or 0)):
+                Child = '#{}'.format(Number) if not Path else '{}|#{}'.format(Path, Number)
+                if Command('GetText', Child) == Part:
+                    Path = Child
+                    break
+            else:
+                return None
+        return Path
+
+    Model = TreeViewModel(Automat, 'Form 0', 'SysTreeView321')
+    for Name, Func in (('обход вручную, 2 раза', lambda: [sum(1 for Node in WalkByHand()) for Twice in range(2)]),
+                       ('TreeViewModel, обход 2 раза', lambda: [sum(1 for Node in Model.Root.Walk())
+                                                                for Twice in range(2)]),
+                       ('поиск путей вручную', lambda: list(FindByHand(Path) for Path in Paths)),
+                       ('TreeViewModel, поиск путей', lambda: list(Model.Find(Path).Path for Path in Paths))):
+        Before = sum(Backend.Calls.values())
+        Measure(Name, Func, 1)
+        print('{:<48} {:>10} вызовов бэкенда'.format('', sum(Backend.Calls.values()) - Before))
+    Model.Invalidate()
+    Before = sum(Backend.Calls.values())
+    Measure('TreeViewModel, поиск путей без обхода', lambda: list(Model.Find(Path).Path for Path in Paths), 1)
+    print('{:<48} {:>10} вызовов бэкенда'.format('', sum(Backend.Calls.values()) - Before))
+
+
+def TextFollow():
+    """
+        Чтение журнала в Edit из 2000 строк, к которому между опросами добавляется 5 строк: ControlGetText
+        (копирует весь текст, но не больше 4095 символов, так что новых строк в конце не видит вовсе) против
+        ControlTextFollower. Печатается число скопированных символов на опрос, замер повторяется с CallDelay.
+        Время ControlTextFollower на имитаторе включает разбиение всего текста на строки после каждого дописывания.
+    """
+    for CallDelay in (0.0, 0.0001):
+        Automat, Backend = MakeDesktop(CallDelay=CallDelay)
+        Window = next(iter(Backend.Windows.values()))
+        Edit = Window.AddControl('Edit', ''.join('{:06} сообщение журнала\n'.format(Line) for Line in range(2000)))
+        Lines = iter(range(2000, 10 ** 9))
+        print('CallDelay = {} с'.format(CallDelay))
+
+        def Append():
+            Edit.Text += ''.join('{:06} сообщение журнала\n'.format(next(Lines)) for Line in range(5))
+
+        Copied = [0]
+
+        def GetText():
+            Append()
+            Copied[0] += len(Automat.ControlGetText('Form 0', 'Edit6') or '')
+
+        Follower = ControlTextFollower(Automat, 'Form 0', 'Edit6')
+
+        def Follow():
+            Append()
+            return Follower.Poll()
+
+        Repeat = 200 if CallDelay else 2000
+        Measure('ControlGetText', GetText, Repeat)
+        print('{:<48} {:>10.0f} символов за опрос'.format('', Copied[0] / Repeat))
+        Before = Follower.Chars
+        Measure('ControlTextFollower', Follow, Repeat)
+        print('{:<48} {:>10.0f} символов за опрос'.format('', (Follower.Chars - Before) / Repeat))
+
+
+def ActionQueues():
+    """
+        Перетаскивание мышью (MouseDown, 300 MouseMove, MouseUp) и ввод 100 строк: прямые вызовы AutoItX против
+        ActionQueue. Печатается время поставщика (сколько он занят вводом), полное время до выполнения всех
+        действий и число вызовов DLL. CallDelay имитирует стоимость вызова DLL.
+    """
+    Automat, Backend = MakeDesktop(CallDelay=0.0001)
+    Path = list((100 + Step, 100 + Step // 2) for Step in range(300))
+    Lines = list('Строка {}{{ENTER}}'.format(N) for N in range(100))
+
+    def Direct():
+        Automat.MouseDown()
+        for X, Y in Path:
+            Automat.MouseMove(X, Y, 0)
+        Automat.MouseUp()
+        for Line in Lines:
+            Automat.Send(Line)
+
+    def Queued(Queue):
+        Queue.MouseDown()
+        for X, Y in Path:
+            Queue.MouseMove(X, Y, 0)
+        Queue.MouseUp()
+        return list(Queue.Send(Line) for Line in Lines)
+
+    def Calls():
+        return sum(Count for Name, Count in Backend.Calls.items() if Name.startswith(('AU3_Mouse', 'AU3_Send')))
+
+    Before, Start = Calls(), perf_counter()
+    Direct()
+    print('{:<48} {:>10.2f} мс'.format('Прямые вызовы', (perf_counter() - Start) * 1e3))
+    print('{:<48} {:>10} вызовов DLL'.format('', Calls() - Before))
+    with ActionQueue(Automat) as Queue:
+        Before, Start = Calls(), perf_counter()
+        Futures = Queued(Queue)
+        Produced = perf_counter() - Start
+        Queue.Flush()
+        Total = perf_counter() - Start
+    assert sum(Future.result() for Future in Futures) == len(Lines)
+    assert Backend.MousePos == list(Path[-1])
+    print('{:<48} {:>10.2f} мс'.format('ActionQueue: поставщик', Produced * 1e3))
+    print('{:<48} {:>10.2f} мс'.format('ActionQueue: до выполнения всех действий', Total * 1e3))
+    print('{:<48} {:>10} вызовов DLL ({} действий)'.format('', Calls() - Before, Queue.Executed))
+
+
+#-------------------------------------------------------------------------------
+
+Benchmarks = [HotPaths, Startup, Dispatch, Buffers, QueryMany, WaitState, AsyncWaits, HandleCache, SendKeys,
+              Profiling, WinStates, StateTable, Params, Specs, Clicks, Pixels,
+              Images, Tiles, PixelBatch, ControlTree, ListViewRows,
+              ListViewDiff, TreeWalk, TextFollow, ActionQueues]
+
+if __name__ == '__main__':
+    Names = sys.argv[1:]
+    for Bench in Benchmarks:
+        if not Names or Bench.__name__ in Names:
+            print('--- {} ---'.format(Bench.__name__))
+            Bench()